@@ -0,0 +1,233 @@
+import numpy as np
+
+from bitboard import board_masks, board_to_bits
+
+def popcount(masks):
+    '''
+    Count the set bits of every mask.
+
+    :param masks: uint64 array.
+    :return: int array of the same shape.
+    '''
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks).astype(np.int64)
+    masks = masks - ((masks >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    masks = (masks & np.uint64(0x3333333333333333)) + ((masks >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    masks = (masks + (masks >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((masks * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
+
+class BatchGO:
+    def __init__(self, batch_size, n=5):
+        """
+        Many independent Go games stepped together with NumPy.
+
+        Every game is stored as two uint64 bitboards (bit i * n + j, as in
+        bitboard.BitboardGO), so placement, captures, suicide, the simple KO rule and
+        scoring are resolved for the whole batch with a few array-wide shift/AND/OR
+        operations. Captures use iterated neighbour propagation of "alive" stones
+        instead of per-group flood fills.
+
+        :param batch_size: number of games N.
+        :param n: size of the board n*n, at most 8.
+        """
+        self.batch_size = batch_size
+        self.size = n
+        self.max_move = n * n - 1 # The max movement of a Go game
+        self.komi = n/2 # Komi rule
+        full, not_first_col, not_last_col, _ = board_masks(n)
+        self.full = np.uint64(full)
+        self.not_first_col = np.uint64(not_first_col)
+        self.not_last_col = np.uint64(not_last_col)
+        self.init_board()
+
+    def init_board(self):
+        '''
+        Reset every game to an empty board with 'X' to move.
+
+        :return: None.
+        '''
+        N = self.batch_size
+        self.black = np.zeros(N, dtype=np.uint64)
+        self.white = np.zeros(N, dtype=np.uint64)
+        self.previous_black = np.zeros(N, dtype=np.uint64)
+        self.previous_white = np.zeros(N, dtype=np.uint64)
+        self.piece_type = np.ones(N, dtype=np.int8) # Side to move of every game
+        self.died = np.zeros(N, dtype=bool) # Whether the last move captured stones
+        self.n_move = np.zeros(N, dtype=np.int32)
+        self.passes = np.zeros(N, dtype=np.int8) # Consecutive passes
+        self.done = np.zeros(N, dtype=bool)
+
+    def set_board(self, k, piece_type, previous_board, board, n_move=0):
+        '''
+        Load one game from the (piece_type, previous_board, board) triple of read.readInput.
+
+        :param k: index of the game in the batch.
+        :param piece_type: 1('X') or 2('O') to move.
+        :param previous_board: previous board state.
+        :param board: current board state.
+        :param n_move: number of moves already played.
+        :return: None.
+        '''
+        self.black[k], self.white[k] = board_to_bits(board)
+        self.previous_black[k], self.previous_white[k] = board_to_bits(previous_board)
+        own, previous_own = (self.black[k], self.previous_black[k]) if piece_type == 1 \
+            else (self.white[k], self.previous_white[k])
+        self.piece_type[k] = piece_type
+        self.died[k] = bool(previous_own & ~own)
+        self.n_move[k] = n_move
+        self.passes[k] = 0
+        self.done[k] = n_move >= self.max_move
+
+    def get_board(self, k):
+        '''
+        Get one board as a list of lists, as used by host.GO.
+
+        :param k: index of the game in the batch.
+        :return: n*n board.
+        '''
+        n = self.size
+        black, white = int(self.black[k]), int(self.white[k])
+        return [[1 if black >> (i * n + j) & 1 else 2 if white >> (i * n + j) & 1 else 0
+                 for j in range(n)] for i in range(n)]
+
+    def expand(self, masks):
+        '''
+        Get the points orthogonally adjacent to any point of the masks, plus the masks themselves.
+
+        :param masks: uint64 array of bitboards.
+        :return: dilated bitboards.
+        '''
+        one, n = np.uint64(1), np.uint64(self.size)
+        return (masks
+                | ((masks << one) & self.not_first_col)
+                | ((masks >> one) & self.not_last_col)
+                | ((masks << n) & self.full)
+                | (masks >> n))
+
+    def dead_mask(self, stones, empty):
+        '''
+        Find the stones whose group has no liberty, by propagating "alive" from the
+        stones touching an empty point through connected stones.
+
+        :param stones: uint64 bitboards of the stones of one colour.
+        :param empty: uint64 bitboards of the empty points.
+        :return: bitboards of the dead stones.
+        '''
+        alive = self.expand(empty) & stones
+        while True:
+            grown = self.expand(alive) & stones
+            if np.array_equal(grown, alive):
+                return stones & ~alive
+            alive = grown
+
+    def resolve(self, black, white, previous_black, previous_white, piece_type, died, moves):
+        '''
+        Play one placement per game without modifying the batch.
+
+        :param black: (M,) 'X' bitboards.
+        :param white: (M,) 'O' bitboards.
+        :param previous_black: (M,) previous 'X' bitboards for the KO rule.
+        :param previous_white: (M,) previous 'O' bitboards for the KO rule.
+        :param piece_type: (M,) side to move.
+        :param died: (M,) whether the last move of every game captured stones.
+        :param moves: (M,) point index i * n + j of every placement.
+        :return: (legal, black, white, captured) where captured counts the removed stones.
+        '''
+        is_black = piece_type == 1
+        bit = np.uint64(1) << moves.astype(np.uint64)
+        legal = ((black | white) & bit) == 0
+        own = np.where(is_black, black, white) | np.where(legal, bit, np.uint64(0))
+        opponent = np.where(is_black, white, black)
+
+        # Remove the died pieces of opponent
+        dead = self.dead_mask(opponent, self.full & ~(own | opponent))
+        opponent &= ~dead
+
+        # Check the placement still has liberty (no suicide)
+        legal &= self.dead_mask(own, self.full & ~(own | opponent)) == 0
+
+        # Check special case: repeat placement causing the repeat board state (KO rule)
+        new_black = np.where(is_black, own, opponent)
+        new_white = np.where(is_black, opponent, own)
+        legal &= ~(died & (new_black == previous_black) & (new_white == previous_white))
+        return legal, new_black, new_white, popcount(dead)
+
+    def legal_moves(self):
+        '''
+        Find the valid placements of every game in one vectorized call.
+
+        :return: (legal, captured) arrays of shape (N, n*n); captured counts the stones
+                 each placement removes.
+        '''
+        N, P = self.batch_size, self.size * self.size
+        repeat = lambda a: np.repeat(a, P)
+        moves = np.tile(np.arange(P), N)
+        legal, _, _, captured = self.resolve(repeat(self.black), repeat(self.white),
+                                             repeat(self.previous_black), repeat(self.previous_white),
+                                             repeat(self.piece_type), repeat(self.died), moves)
+        legal = legal.reshape(N, P) & ~self.done[:, None]
+        return legal, np.where(legal, captured.reshape(N, P), 0)
+
+    def play(self, moves):
+        '''
+        Play one move in every game that is not over. Invalid placements are not
+        applied and are reported in the returned mask.
+
+        :param moves: (N,) point index i * n + j of every move, -1 to pass.
+        :return: (N,) boolean array of the games where the move was applied.
+        '''
+        moves = np.asarray(moves)
+        active = ~self.done
+        passing = active & (moves < 0)
+        placing = active & (moves >= 0)
+
+        legal, black, white, captured = self.resolve(self.black, self.white,
+                                                     self.previous_black, self.previous_white,
+                                                     self.piece_type, self.died, np.where(placing, moves, 0))
+        placed = placing & legal
+        applied = placed | passing
+
+        self.previous_black[applied] = self.black[applied]
+        self.previous_white[applied] = self.white[applied]
+        self.black[placed] = black[placed]
+        self.white[placed] = white[placed]
+        self.died[applied] = placed[applied] & (captured[applied] > 0)
+        self.passes[placed] = 0
+        self.passes[passing] += 1
+        self.n_move[applied] += 1
+        self.piece_type[applied] = 3 - self.piece_type[applied]
+        self.done |= (self.n_move >= self.max_move) | (self.passes >= 2)
+        return applied
+
+    def score(self):
+        '''
+        Get score of both players of every game by counting the number of stones.
+
+        :return: (N, 2) array of the stone counts of 'X' and 'O'.
+        '''
+        return np.stack([popcount(self.black), popcount(self.white)], axis=1)
+
+    def judge_winner(self):
+        '''
+        Judge the winner of every game by number of pieces for each player.
+
+        :return: (N,) piece type of winner of the game (0 if it's a tie).
+        '''
+        score = self.score()
+        black, white = score[:, 0], score[:, 1] + self.komi
+        return np.where(black > white, 1, np.where(black < white, 2, 0)).astype(np.int8)
+
+    def random_playout(self, rng=None):
+        '''
+        Play uniformly random valid moves in every game until all games are over,
+        passing when no placement is valid.
+
+        :param rng: numpy.random.Generator, default a new unseeded one.
+        :return: (N,) piece type of winner of every game (0 if it's a tie).
+        '''
+        rng = rng if rng is not None else np.random.default_rng()
+        while not self.done.all():
+            legal, _ = self.legal_moves()
+            choice = np.argmax(rng.random(legal.shape) * legal, axis=1)
+            self.play(np.where(legal.any(axis=1), choice, -1))
+        return self.judge_winner()
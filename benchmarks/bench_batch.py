@@ -0,0 +1,58 @@
+import sys
+import os
+import time
+import random
+import argparse
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from host import GO
+from batch import BatchGO
+
+def play_random_game(rng):
+    """
+    Play one random game with host.GO, passing when no placement is valid.
+
+    :param rng: random.Random instance.
+    :return: piece type of winner of the game (0 if it's a tie).
+    """
+    go = GO(5)
+    go.init_board(5)
+    piece_type = 1
+    passes = 0
+    while go.n_move < go.max_move and passes < 2:
+        moves = go.moves_from_mask(go.legal_moves(piece_type))
+        move = rng.choice(moves) if moves else "PASS"
+        passes = passes + 1 if move == "PASS" else 0
+        go.make_move(move, piece_type)
+        piece_type = 3 - piece_type
+    return go.judge_winner()
+
+def bench_loop(games, seed):
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(games):
+        play_random_game(rng)
+    return games / (time.perf_counter() - start)
+
+def bench_batch(games, seed):
+    batch = BatchGO(games)
+    start = time.perf_counter()
+    batch.random_playout(np.random.default_rng(seed))
+    return games / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description='Random-playout throughput of BatchGO against looping over host.GO')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 100, 10000], help='Batch sizes N (default: 1 100 10000)')
+    parser.add_argument('--loop-games', type=int, default=200, help='Games played with the host.GO loop (default: 200)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    loop_rate = bench_loop(args.loop_games, args.seed)
+    print(f"{'engine':<14}{'N':>8}{'games/s':>12}{'speedup':>10}")
+    print(f"{'host.GO loop':<14}{1:>8}{loop_rate:>12.1f}{1.0:>10.2f}")
+    for size in args.sizes:
+        rate = bench_batch(size, args.seed)
+        print(f"{'BatchGO':<14}{size:>8}{rate:>12.1f}{rate / loop_rate:>10.2f}")
+
+if __name__ == "__main__":
+    main()
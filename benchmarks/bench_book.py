@@ -0,0 +1,32 @@
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from book import OpeningBook
+from positions import logged_positions, random_positions
+
+BOOK_PATH = os.path.join(os.path.dirname(__file__), '..', 'book.bin')
+
+def main():
+    parser = argparse.ArgumentParser(description='Open and lookup time of the opening book')
+    parser.add_argument('--book', default=BOOK_PATH, help='Book file (default: book.bin)')
+    parser.add_argument('--random', type=int, default=2000, help='Random positions added to game_log.txt (default: 2000)')
+    args = parser.parse_args()
+
+    positions = logged_positions() + random_positions(args.random)
+    start = time.perf_counter()
+    book = OpeningBook(args.book)
+    opened = time.perf_counter() - start
+
+    hits = 0
+    start = time.perf_counter()
+    for piece_type, _, board in positions:
+        hits += book.lookup(board, piece_type) is not None
+    seconds = time.perf_counter() - start
+    book.close()
+    print(f"{len(book)} positions in {os.path.getsize(args.book)} bytes, opened in {opened * 1e6:.0f} us")
+    print(f"{len(positions)} lookups, {hits} hits, {seconds / len(positions) * 1e6:.1f} us per lookup")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'players')))
+import my_player
+from positions import logged_positions, random_positions
+
+def legacy_remove_captured_pieces(board, opponentNumber):
+    """
+    The fixed-point capture routine my_player.py used before the flood fill, kept as the baseline.
+
+    :param board: board with the stone just played.
+    :param opponentNumber: colour whose dead stones are removed.
+    :return: new board without the captured stones.
+    """
+    new_board = [row[:] for row in board]
+    to_check = set()
+    for i in range(len(board)):
+        for j in range(len(board[0])):
+            if board[i][j] == opponentNumber:
+                deltas = ([0, 1], [1, 0], [0, -1], [-1, 0])
+                for dx, dy in deltas:
+                    if 0 <= i+dx < len(board) and 0 <= j+dy < len(board[0]) and board[i+dx][j+dy] == 0:
+                        new_board[i][j] = "r"
+                        to_check.add((i, j))
+                        break
+                else:
+                    new_board[i][j] = "g"
+                    to_check.add((i, j))
+
+    while to_check:
+        tempBoard = [row[:] for row in new_board]
+        to_check_next = set()
+        for i, j in to_check:
+            if new_board[i][j] == "g":
+                deltas = ([0, 1], [1, 0], [0, -1], [-1, 0])
+                for dx, dy in deltas:
+                    if 0 <= i+dx < len(board) and 0 <= j+dy < len(board[0]) and new_board[i+dx][j+dy] == "r":
+                        new_board[i][j] = "r"
+                        to_check_next.add((i, j))
+                        break
+                else:
+                    to_check_next.add((i, j))
+        if tempBoard == new_board:
+            break
+        to_check = to_check_next
+
+    for i in range(len(board)):
+        for j in range(len(board[0])):
+            if new_board[i][j] == "g":
+                new_board[i][j] = 0
+            elif new_board[i][j] == "r":
+                new_board[i][j] = opponentNumber
+
+    return new_board
+
+def placements(positions):
+    """
+    Place the side to move on every empty point of every position.
+
+    :return: list of (board, move, opponent) with the stone already placed.
+    """
+    cases = []
+    for piece_type, _, board in positions:
+        for i in range(len(board)):
+            for j in range(len(board)):
+                if board[i][j] == 0:
+                    placed = [row[:] for row in board]
+                    placed[i][j] = piece_type
+                    cases.append((placed, (i, j), 3 - piece_type))
+    return cases
+
+def main():
+    parser = argparse.ArgumentParser(description='Microbenchmark of the capture routine of my_player.py')
+    parser.add_argument('--random', type=int, default=2000, help='Random positions added to game_log.txt (default: 2000)')
+    parser.add_argument('--repeat', type=int, default=5, help='Passes over the corpus (default: 5)')
+    args = parser.parse_args()
+
+    cases = placements(logged_positions() + random_positions(args.random))
+    captures = 0
+    for board, move, opponent in cases:
+        after = [row[:] for row in board]
+        captured = my_player.removeCapturedPieces(after, move, opponent)
+        assert after == legacy_remove_captured_pieces(board, opponent)
+        captures += bool(captured)
+    print(f"{len(cases)} placements, {captures} of them capture")
+
+    print(f"{'routine':<14}{'seconds':>10}{'calls/s':>12}")
+    routines = (('fixed point', lambda board, move, opponent: legacy_remove_captured_pieces(board, opponent)),
+                ('flood fill', lambda board, move, opponent: my_player.removeCapturedPieces([row[:] for row in board], move, opponent)))
+    for label, routine in routines:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for board, move, opponent in cases:
+                routine(board, move, opponent)
+        seconds = time.perf_counter() - start
+        print(f"{label:<14}{seconds:>10.2f}{len(cases) * args.repeat / seconds:>12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import sys
+import os
+import time
+import random
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'players')))
+import mcts_player
+from position import Position
+from positions import logged_positions
+
+def run(positions, seconds, reuse):
+    """
+    Search every position of a game in order for a fixed time, with or without
+    the tree of the previous move.
+
+    :return: (playouts, seconds searched, playouts already in the reused trees).
+    """
+    mcts_player._root = None
+    playouts = reused = 0
+    elapsed = 0.0
+    rng = random.Random(0)
+    for piece_type, previous_board, board in positions:
+        position = Position.from_input(piece_type, previous_board, board)
+        mcts_player.find_mcts_move(position, time.time() + seconds, reuse=reuse, rng=rng)
+        playouts += mcts_player.last_stats['playouts']
+        reused += mcts_player.last_stats['reused']
+        elapsed += mcts_player.last_stats['seconds']
+    return playouts, elapsed, reused
+
+def main():
+    parser = argparse.ArgumentParser(description='Playouts per second of mcts_player.py over the positions of game_log.txt')
+    parser.add_argument('--seconds', type=float, default=1.0, help='Search time per position (default: 1)')
+    args = parser.parse_args()
+
+    positions = logged_positions()
+    print(f"{len(positions)} positions from game_log.txt, {args.seconds:g} s each")
+    print(f"{'tree':<12}{'playouts':>10}{'per second':>12}{'reused':>10}")
+    for label, reuse in (('new', False), ('reused', True)):
+        playouts, elapsed, reused = run(positions, args.seconds, reuse)
+        print(f"{label:<12}{playouts:>10}{playouts / elapsed:>12.0f}{reused:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'players')))
+import my_player
+from transposition import TranspositionTable
+from positions import logged_positions
+
+def run(positions, tt_mb, plies, symmetry=True):
+    """
+    Search every position to a fixed number of plies with a fresh transposition table of the given size.
+
+    :return: (nodes, seconds, hit rate, best moves).
+    """
+    my_player._tt = TranspositionTable(tt_mb)
+    my_player._useSymmetry = symmetry
+    nodes = 0
+    moves = []
+    start = time.perf_counter()
+    for piece_type, previous_board, board in positions:
+        _, move = my_player.searchBestMove(board, previous_board, piece_type, maxPlies=plies)
+        nodes += my_player._nodes
+        moves.append(move)
+    return nodes, time.perf_counter() - start, my_player._tt.hit_rate(), moves
+
+def main():
+    parser = argparse.ArgumentParser(description='Search statistics of my_player.py on the positions of game_log.txt')
+    parser.add_argument('--plies', type=int, default=4, help='Plies searched per position (default: 4)')
+    parser.add_argument('--tt-mb', type=float, default=16, help='Transposition table size in MB (default: 16)')
+    args = parser.parse_args()
+
+    positions = logged_positions()
+    print(f"{len(positions)} positions from game_log.txt")
+    print(f"{'table':<14}{'nodes':>10}{'seconds':>10}{'nodes/s':>10}{'hit rate':>10}")
+    for label, tt_mb, symmetry in (('off', 0, False), (f'{args.tt_mb:g} MB', args.tt_mb, False),
+                                   (f'{args.tt_mb:g} MB sym', args.tt_mb, True)):
+        nodes, seconds, hit_rate, moves = run(positions, tt_mb, args.plies, symmetry)
+        print(f"{label:<14}{nodes:>10}{seconds:>10.2f}{nodes / seconds:>10.0f}{hit_rate:>10.1%}")
+
+if __name__ == "__main__":
+    main()
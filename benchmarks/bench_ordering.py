@@ -0,0 +1,81 @@
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'players')))
+import my_player
+import alphabeta_player
+from host import GO
+from move_ordering import MoveOrdering
+from transposition import TranspositionTable
+from positions import logged_positions
+
+# Heuristics enabled on top of the previous one, from scan order (with the hash move) to the full ordering
+CONFIGS = (
+    ('scan', dict(killers=0, history=False, tactical=False)),
+    ('+tactical', dict(killers=0, history=False, tactical=True)),
+    ('+killers', dict(killers=2, history=False, tactical=True)),
+    ('+history', dict(killers=2, history=True, tactical=True)),
+)
+
+def run_my_player(positions, config, plies, tt_mb):
+    """
+    Search every position with my_player.py to a fixed number of plies.
+
+    :return: (nodes, seconds, MoveOrdering with the statistics of all searches).
+    """
+    my_player._tt = TranspositionTable(tt_mb)
+    my_player._ordering = MoveOrdering(5, **config)
+    total = MoveOrdering(5)
+    nodes = 0
+    start = time.perf_counter()
+    for piece_type, previous_board, board in positions:
+        my_player.searchBestMove(board, previous_board, piece_type, maxPlies=plies)
+        nodes += my_player._nodes
+        merge(total, my_player._ordering)
+    return nodes, time.perf_counter() - start, total
+
+def run_alphabeta(positions, config):
+    """
+    Search every position with alphabeta_player.py.
+
+    :return: (nodes, seconds, MoveOrdering with the statistics of all searches).
+    """
+    alphabeta_player.ordering = MoveOrdering(5, **config)
+    start = time.perf_counter()
+    for piece_type, previous_board, board in positions:
+        go = GO(5)
+        go.set_board(piece_type, previous_board, board)
+        alphabeta_player.find_minimax_move(go, piece_type)
+    ordering = alphabeta_player.ordering
+    return sum(ordering.nodes), time.perf_counter() - start, ordering
+
+def merge(total, ordering):
+    for ply, count in enumerate(ordering.nodes):
+        total.count_node(ply)
+        total.nodes[ply] += count - 1
+    total.interior += ordering.interior
+    total.cutoffs += ordering.cutoffs
+    total.first_cutoffs += ordering.first_cutoffs
+    total.moves_searched += ordering.moves_searched
+
+def main():
+    parser = argparse.ArgumentParser(description='Effect of the move ordering heuristics on the alpha-beta players')
+    parser.add_argument('--plies', type=int, default=4, help='Plies searched per position by my_player.py (default: 4)')
+    parser.add_argument('--tt-mb', type=float, default=16, help='Transposition table size of my_player.py in MB (default: 16)')
+    args = parser.parse_args()
+
+    positions = logged_positions()
+    print(f"{len(positions)} positions from game_log.txt")
+    for player, run in (('my_player.py', lambda config: run_my_player(positions, config, args.plies, args.tt_mb)),
+                        ('alphabeta_player.py', lambda config: run_alphabeta(positions, config))):
+        print(player)
+        print(f"{'ordering':<12}{'nodes':>9}{'seconds':>9}{'1st cut':>9}{'ebf':>7}  nodes per ply")
+        for label, config in CONFIGS:
+            nodes, seconds, stats = run(config)
+            print(f"{label:<12}{nodes:>9}{seconds:>9.2f}{stats.first_cutoff_rate():>9.1%}"
+                  f"{stats.branching_factor():>7.2f}  {stats.nodes}")
+
+if __name__ == "__main__":
+    main()
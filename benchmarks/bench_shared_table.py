@@ -0,0 +1,48 @@
+import sys
+import os
+import time
+import argparse
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'players')))
+import my_player
+from transposition import TranspositionTable
+from shared_table import SharedTranspositionTable
+from positions import logged_positions
+
+def run(positions, plies, make_table):
+    """
+    Search every position with the table make_table() returns, a new one per position
+    as a player started once per move gets.
+
+    :return: (nodes, seconds, hit rate).
+    """
+    nodes = probes = hits = 0
+    start = time.perf_counter()
+    for piece_type, previous_board, board in positions:
+        my_player._tt = make_table()
+        my_player.searchBestMove(board, previous_board, piece_type, maxPlies=plies)
+        nodes += my_player._nodes
+        probes += my_player._tt.probes
+        hits += my_player._tt.hits
+    return nodes, time.perf_counter() - start, hits / probes if probes else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description='my_player.py searches with a cold table per move against the shared memory-mapped table')
+    parser.add_argument('--plies', type=int, default=4, help='Plies searched per position (default: 4)')
+    parser.add_argument('--tt-mb', type=float, default=16, help='Table size in MB (default: 16)')
+    args = parser.parse_args()
+
+    positions = logged_positions()
+    print(f"{len(positions)} positions from game_log.txt, {args.plies} plies")
+    print(f"{'table':<16}{'nodes':>10}{'seconds':>10}{'hit rate':>10}")
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, 'shared.tt')
+        for label, make_table in (('cold per move', lambda: TranspositionTable(args.tt_mb)),
+                                  ('shared, 1st run', lambda: SharedTranspositionTable(path, args.tt_mb)),
+                                  ('shared, 2nd run', lambda: SharedTranspositionTable(path, args.tt_mb))):
+            nodes, seconds, hit_rate = run(positions, args.plies, make_table)
+            print(f"{label:<16}{nodes:>10}{seconds:>10.2f}{hit_rate:>10.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import sys
+import os
+import time
+import argparse
+import tempfile
+from multiprocessing import shared_memory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from read import readInput, readOutput
+from write import writeNextInput, writeOutput
+from positions import logged_positions, random_positions
+
+def round_trip(positions, input_transport, output_transport, input_source=None, output_source=None):
+    '''
+    Time one move exchange per position: write the input, read it back, write a move and read it back.
+
+    :return: seconds per exchange.
+    '''
+    input_source = input_source if input_source is not None else input_transport
+    output_source = output_source if output_source is not None else output_transport
+    start = time.perf_counter()
+    for piece_type, previous_board, board in positions:
+        writeNextInput(piece_type, previous_board, board, input_transport)
+        readInput(5, input_source)
+        writeOutput((2, 2), output_transport)
+        readOutput(output_source)
+    return (time.perf_counter() - start) / len(positions)
+
+def main():
+    parser = argparse.ArgumentParser(description='Cost of one move exchange through each read.py/write.py transport')
+    parser.add_argument('--random', type=int, default=2000, help='Random positions added to game_log.txt (default: 2000)')
+    args = parser.parse_args()
+
+    positions = logged_positions() + random_positions(args.random)
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        results.append(("file", round_trip(positions, os.path.join(scratch, "input.txt"), os.path.join(scratch, "output.txt"))))
+
+    r, w = os.pipe()
+    with os.fdopen(r) as reader, os.fdopen(w, 'w') as writer:
+        results.append(("pipe", round_trip(positions, writer, writer, reader, reader)))
+
+    inputs, outputs = [], []
+    results.append(("callable", round_trip(positions, inputs.append, outputs.append, lambda: inputs[-1], lambda: outputs[-1])))
+
+    shm = shared_memory.SharedMemory(create=True, size=64)
+    try:
+        results.append(("shared memory", round_trip(positions, shm, shm)))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    print(f"{len(positions)} positions")
+    print(f"{'transport':<14} {'us/move':>8}")
+    for name, seconds in results:
+        print(f"{name:<14} {seconds * 1e6:>8.1f}")
+
+if __name__ == "__main__":
+    main()
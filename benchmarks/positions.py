@@ -0,0 +1,56 @@
+import sys
+import os
+import random
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from host import GO
+
+LOG_PATH = os.path.join(os.path.dirname(__file__), '..', 'game_log.txt')
+
+def logged_positions(path=LOG_PATH):
+    """
+    Replay a GUI game log and collect the position before every move.
+
+    :param path: game log exported by main.py.
+    :return: list of (piece_type, previous_board, board) tuples as returned by read.readInput.
+    """
+    go = GO(5)
+    go.init_board(5)
+    piece_type = 1
+    positions = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if ' played: ' not in line and not line.endswith(' passed'):
+                continue
+            positions.append((piece_type, [row[:] for row in go.previous_board], [row[:] for row in go.board]))
+            if ' played: ' in line:
+                x, y = line.split(' played: ')[1].split(',')
+                if not go.make_move((int(x), int(y)), piece_type):
+                    break
+            else:
+                go.make_move("PASS", piece_type)
+            piece_type = 3 - piece_type
+    return positions
+
+def random_positions(count, seed=0):
+    """
+    Collect positions from random games.
+
+    :param count: number of positions.
+    :param seed: random seed.
+    :return: list of (piece_type, previous_board, board) tuples as returned by read.readInput.
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        go = GO(5)
+        go.init_board(5)
+        piece_type = 1
+        while go.n_move < go.max_move and len(positions) < count:
+            moves = go.moves_from_mask(go.legal_moves(piece_type))
+            if not moves:
+                break
+            go.make_move(rng.choice(moves), piece_type)
+            piece_type = 3 - piece_type
+            positions.append((piece_type, [row[:] for row in go.previous_board], [row[:] for row in go.board]))
+    return positions
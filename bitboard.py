@@ -0,0 +1,449 @@
+# Bit p = i * n + j of a colour mask holds the stone at row i, column j.
+
+_masks = {}
+
+def board_masks(n):
+    '''
+    Precompute the bit masks used by the bitboard engine for a board size.
+
+    :param n: size of the board n*n.
+    :return: (full, not_first_col, not_last_col, neighbors) where neighbors[p] is the
+             mask of the points orthogonally adjacent to point p.
+    '''
+    if n not in _masks:
+        full = (1 << (n * n)) - 1
+        first_col = 0
+        last_col = 0
+        for i in range(n):
+            first_col |= 1 << (i * n)
+            last_col |= 1 << (i * n + n - 1)
+        neighbors = []
+        for i in range(n):
+            for j in range(n):
+                mask = 0
+                if i > 0: mask |= 1 << ((i - 1) * n + j)
+                if i < n - 1: mask |= 1 << ((i + 1) * n + j)
+                if j > 0: mask |= 1 << (i * n + j - 1)
+                if j < n - 1: mask |= 1 << (i * n + j + 1)
+                neighbors.append(mask)
+        _masks[n] = (full, full & ~first_col, full & ~last_col, tuple(neighbors))
+    return _masks[n]
+
+def board_to_bits(board):
+    '''
+    Pack a list-of-lists board into one mask per colour.
+
+    :param board: n*n board with 0 (empty), 1('X') and 2('O').
+    :return: (black, white) masks.
+    '''
+    n = len(board)
+    black = white = 0
+    for i in range(n):
+        row = board[i]
+        for j in range(n):
+            if row[j] == 1:
+                black |= 1 << (i * n + j)
+            elif row[j] == 2:
+                white |= 1 << (i * n + j)
+    return black, white
+
+def bits_to_board(black, white, n):
+    '''
+    Unpack colour masks into a list-of-lists board.
+
+    :param black: mask of 'X' stones.
+    :param white: mask of 'O' stones.
+    :param n: size of the board n*n.
+    :return: n*n board with 0 (empty), 1('X') and 2('O').
+    '''
+    board = [[0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            bit = 1 << (i * n + j)
+            if black & bit:
+                board[i][j] = 1
+            elif white & bit:
+                board[i][j] = 2
+    return board
+
+class BitboardGO:
+    def __init__(self, n):
+        """
+        Go game backed by one n*n-bit integer per colour.
+
+        Drop-in alternative to host.GO: flood fill, liberty detection and captures
+        are computed with shifts and masks instead of walking the board cell by cell.
+        `board` and `previous_board` are rebuilt from the masks on every access:
+        assigning them (`go.board = board`) sets the masks, but a change to the
+        returned lists (`go.board[i][j] = 1`) is not written back.
+
+        :param n: size of the board n*n
+        """
+        self.size = n
+        self.X_move = True # X chess plays first
+        self.died_pieces = [] # Intialize died pieces to be empty
+        self.n_move = 0 # Trace the number of moves
+        self.max_move = n * n - 1 # The max movement of a Go game
+        self.komi = n/2 # Komi rule
+        self.verbose = False # Verbose only when there is a manual player
+        self.full, self.not_first_col, self.not_last_col, self.neighbors = board_masks(n)
+        self.black = self.white = 0
+        self.previous_black = self.previous_white = 0
+
+    @property
+    def board(self):
+        return bits_to_board(self.black, self.white, self.size)
+
+    @board.setter
+    def board(self, board):
+        self.black, self.white = board_to_bits(board)
+
+    @property
+    def previous_board(self):
+        return bits_to_board(self.previous_black, self.previous_white, self.size)
+
+    @previous_board.setter
+    def previous_board(self, board):
+        self.previous_black, self.previous_white = board_to_bits(board)
+
+    def init_board(self, n):
+        '''
+        Initialize an empty board with size n*n.
+
+        :param n: width and height of the board.
+        :return: None.
+        '''
+        self.black = self.white = 0
+        self.previous_black = self.previous_white = 0
+
+    def set_board(self, piece_type, previous_board, board):
+        '''
+        Initialize board status.
+
+        :param piece_type: 1('X') or 2('O').
+        :param previous_board: previous board state.
+        :param board: current board state.
+        :return: None.
+        '''
+        self.previous_black, self.previous_white = board_to_bits(previous_board)
+        self.black, self.white = board_to_bits(board)
+        previous = self.previous_black if piece_type == 1 else self.previous_white
+        died = previous & ~self.stones(piece_type)
+        self.died_pieces = self.mask_to_points(died)
+
+    def compare_board(self, board1, board2):
+        return board_to_bits(board1) == board_to_bits(board2)
+
+    def copy_board(self):
+        '''
+        Copy the current board for potential testing.
+
+        :param: None.
+        :return: the copied board instance.
+        '''
+        new = object.__new__(BitboardGO)
+        new.__dict__.update(self.__dict__)
+        new.died_pieces = list(self.died_pieces)
+        return new
+
+    def stones(self, piece_type):
+        '''
+        Get the mask of stones of a given colour.
+
+        :param piece_type: 1('X') or 2('O').
+        :return: colour mask.
+        '''
+        return self.black if piece_type == 1 else self.white
+
+    def empty(self):
+        return self.full & ~(self.black | self.white)
+
+    def mask_to_points(self, mask):
+        '''
+        Convert a mask into a list of (row, column) points in row-major order.
+
+        :param mask: set of points as a bit mask.
+        :return: a list containing the points row and column (row, column).
+        '''
+        n = self.size
+        points = []
+        while mask:
+            low = mask & -mask
+            p = low.bit_length() - 1
+            points.append((p // n, p % n))
+            mask ^= low
+        return points
+
+    def expand(self, mask):
+        '''
+        Get the points orthogonally adjacent to any point of the mask, plus the mask itself.
+
+        :param mask: set of points as a bit mask.
+        :return: dilated mask.
+        '''
+        n = self.size
+        return (mask
+                | ((mask << 1) & self.not_first_col)
+                | ((mask >> 1) & self.not_last_col)
+                | ((mask << n) & self.full)
+                | (mask >> n))
+
+    def group_mask(self, p, stones):
+        '''
+        Flood-fill the group containing point p.
+
+        :param p: point index i * n + j.
+        :param stones: mask of the stones of the group's colour.
+        :return: mask of the group.
+        '''
+        group = 1 << p
+        while True:
+            grown = self.expand(group) & stones
+            if grown == group:
+                return group
+            group = grown
+
+    def dead_mask(self, stones, empty):
+        '''
+        Find all stones of one colour whose group has no liberty.
+
+        :param stones: mask of the stones of one colour.
+        :param empty: mask of the empty points.
+        :return: mask of the dead stones.
+        '''
+        alive = self.expand(empty) & stones
+        while True:
+            grown = self.expand(alive) & stones
+            if grown == alive:
+                return stones & ~alive
+            alive = grown
+
+    def detect_neighbor(self, i, j):
+        '''
+        Detect all the neighbors of a given stone.
+
+        :param i: row number of the board.
+        :param j: column number of the board.
+        :return: a list containing the neighbors row and column (row, column) of position (i, j).
+        '''
+        return self.mask_to_points(self.neighbors[i * self.size + j])
+
+    def detect_neighbor_ally(self, i, j):
+        '''
+        Detect the neighbor allies of a given stone.
+
+        :param i: row number of the board.
+        :param j: column number of the board.
+        :return: a list containing the neighbored allies row and column (row, column) of position (i, j).
+        '''
+        p = i * self.size + j
+        stones = self.black if self.black >> p & 1 else self.white
+        return self.mask_to_points(self.neighbors[p] & stones)
+
+    def ally_dfs(self, i, j):
+        '''
+        Find all allies of a given stone.
+
+        :param i: row number of the board.
+        :param j: column number of the board.
+        :return: a list containing the all allies row and column (row, column) of position (i, j).
+        '''
+        p = i * self.size + j
+        stones = self.black if self.black >> p & 1 else self.white
+        return self.mask_to_points(self.group_mask(p, stones))
+
+    def find_liberty(self, i, j):
+        '''
+        Find liberty of a given stone. If a group of allied stones has no liberty, they all die.
+
+        :param i: row number of the board.
+        :param j: column number of the board.
+        :return: boolean indicating whether the given stone still has liberty.
+        '''
+        p = i * self.size + j
+        stones = self.black if self.black >> p & 1 else self.white
+        return bool(self.expand(self.group_mask(p, stones)) & self.empty())
+
+    def find_died_pieces(self, piece_type):
+        '''
+        Find the died stones that has no liberty in the board for a given piece type.
+
+        :param piece_type: 1('X') or 2('O').
+        :return: a list containing the dead pieces row and column(row, column).
+        '''
+        return self.mask_to_points(self.dead_mask(self.stones(piece_type), self.empty()))
+
+    def remove_died_pieces(self, piece_type):
+        '''
+        Remove the dead stones in the board.
+
+        :param piece_type: 1('X') or 2('O').
+        :return: locations of dead pieces.
+        '''
+        dead = self.dead_mask(self.stones(piece_type), self.empty())
+        if not dead: return []
+        if piece_type == 1:
+            self.black &= ~dead
+        else:
+            self.white &= ~dead
+        return self.mask_to_points(dead)
+
+    def remove_certain_pieces(self, positions):
+        '''
+        Remove the stones of certain locations.
+
+        :param positions: a list containing the pieces to be removed row and column(row, column)
+        :return: None.
+        '''
+        mask = 0
+        for piece in positions:
+            mask |= 1 << (piece[0] * self.size + piece[1])
+        self.black &= ~mask
+        self.white &= ~mask
+
+    def place_chess(self, i, j, piece_type):
+        '''
+        Place a chess stone in the board.
+
+        :param i: row number of the board.
+        :param j: column number of the board.
+        :param piece_type: 1('X') or 2('O').
+        :return: boolean indicating whether the placement is valid.
+        '''
+        if not self.valid_place_check(i, j, piece_type):
+            return False
+        self.previous_black, self.previous_white = self.black, self.white
+        if piece_type == 1:
+            self.black |= 1 << (i * self.size + j)
+        else:
+            self.white |= 1 << (i * self.size + j)
+        return True
+
+    def valid_place_check(self, i, j, piece_type, test_check=False):
+        '''
+        Check whether a placement is valid.
+
+        :param i: row number of the board.
+        :param j: column number of the board.
+        :param piece_type: 1(white piece) or 2(black piece).
+        :param test_check: boolean if it's a test check.
+        :return: boolean indicating whether the placement is valid.
+        '''
+        n = self.size
+        verbose = self.verbose
+        if test_check:
+            verbose = False
+
+        # Check if the place is in the board range
+        if not (i >= 0 and i < n):
+            if verbose:
+                print(('Invalid placement. row should be in the range 1 to {}.').format(n - 1))
+            return False
+        if not (j >= 0 and j < n):
+            if verbose:
+                print(('Invalid placement. column should be in the range 1 to {}.').format(n - 1))
+            return False
+
+        # Check if the place already has a piece
+        p = i * n + j
+        bit = 1 << p
+        if (self.black | self.white) & bit:
+            if verbose:
+                print('Invalid placement. There is already a chess in this position.')
+            return False
+
+        # Check if the place has liberty
+        own = self.stones(piece_type) | bit
+        opponent = self.stones(3 - piece_type)
+        empty = self.full & ~(own | opponent)
+        group = self.group_mask(p, own)
+        if self.expand(group) & empty:
+            return True
+
+        # If not, remove the died pieces of opponent and check again
+        captured = self.dead_mask(opponent, empty)
+        if not captured:
+            if verbose:
+                print('Invalid placement. No liberty found in this position.')
+            return False
+
+        # Check special case: repeat placement causing the repeat board state (KO rule)
+        opponent &= ~captured
+        if piece_type == 1:
+            repeat = (own, opponent) == (self.previous_black, self.previous_white)
+        else:
+            repeat = (opponent, own) == (self.previous_black, self.previous_white)
+        if self.died_pieces and repeat:
+            if verbose:
+                print('Invalid placement. A repeat move not permitted by the KO rule.')
+            return False
+        return True
+
+    def update_board(self, new_board):
+        '''
+        Update the board with new_board
+
+        :param new_board: new board.
+        :return: None.
+        '''
+        self.black, self.white = board_to_bits(new_board)
+
+    def visualize_board(self):
+        '''
+        Visualize the board.
+
+        :return: None
+        '''
+        board = self.board
+
+        print('-' * len(board) * 2)
+        for i in range(len(board)):
+            for j in range(len(board)):
+                if board[i][j] == 0:
+                    print(' ', end=' ')
+                elif board[i][j] == 1:
+                    print('X', end=' ')
+                else:
+                    print('O', end=' ')
+            print()
+        print('-' * len(board) * 2)
+
+    def game_end(self, piece_type, action="MOVE"):
+        '''
+        Check if the game should end.
+
+        :param piece_type: 1('X') or 2('O').
+        :param action: "MOVE" or "PASS".
+        :return: boolean indicating whether the game should end.
+        '''
+
+        # Case 1: max move reached
+        if self.n_move >= self.max_move:
+            return True
+        # Case 2: two players all pass the move.
+        unchanged = (self.previous_black, self.previous_white) == (self.black, self.white)
+        if unchanged and action == "PASS":
+            return True
+        return False
+
+    def score(self, piece_type):
+        '''
+        Get score of a player by counting the number of stones.
+
+        :param piece_type: 1('X') or 2('O').
+        :return: number of stones of the player.
+        '''
+        return self.stones(piece_type).bit_count()
+
+    def judge_winner(self):
+        '''
+        Judge the winner of the game by number of pieces for each player.
+
+        :param: None.
+        :return: piece type of winner of the game (0 if it's a tie).
+        '''
+        cnt_1 = self.score(1)
+        cnt_2 = self.score(2)
+        if cnt_1 > cnt_2 + self.komi: return 1
+        elif cnt_1 < cnt_2 + self.komi: return 2
+        else: return 0
@@ -0,0 +1,122 @@
+import mmap
+import os
+import struct
+
+from symmetry import canonical_hash, inverse_symmetry, transform_move
+
+MAGIC = b'GOBK'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI') # magic, version, board size, number of records
+RECORD = struct.Struct('<QBBxxf') # canonical hash, move, depth, padding, score
+PASS_MOVE = 255 # Stored move of a pass
+SOLVED = 255 # Stored depth of a position whose score is exact
+
+def encode_move(move, n):
+    return PASS_MOVE if move == "PASS" else move[0] * n + move[1]
+
+def decode_move(code, n):
+    return "PASS" if code == PASS_MOVE else (code // n, code % n)
+
+def write_book(path, entries, n=5):
+    '''
+    Write a book file: a header followed by fixed-size records sorted by hash, so
+    that a lookup is a binary search over the file with no parsing at load time.
+
+    :param path: output file.
+    :param entries: dict of canonical hash to (move, depth, score), the move in the
+                    frame of the transform t of symmetry.canonical_hash(board, piece_type)
+                    (transform_move(move, t, n)) and the score for the side to move.
+    :param n: size of the board n*n.
+    :return: None.
+    '''
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, n, len(entries)))
+        for key in sorted(entries):
+            move, depth, score = entries[key]
+            f.write(RECORD.pack(key, encode_move(move, n), min(depth, SOLVED), score))
+    os.replace(tmp_path, path)
+
+def read_book(path):
+    '''
+    Read every record of a book file.
+
+    :param path: book file.
+    :return: dict of canonical hash to (move, depth, score), as taken by write_book.
+    '''
+    with OpeningBook(path) as book:
+        return {key: (decode_move(code, book.size), depth, score) for key, code, depth, score in book}
+
+class OpeningBook:
+    def __init__(self, path):
+        """
+        Read-only view of a book file written by write_book.
+
+        The file is memory-mapped, so opening it costs one system call whatever its
+        size and only the pages touched by the binary search are read. Positions
+        are keyed by symmetry.canonical_hash, so one record answers all 8
+        symmetric copies of a position.
+
+        :param path: book file.
+        """
+        self.path = path
+        self.file = open(path, 'rb')
+        if os.fstat(self.file.fileno()).st_size < HEADER.size:
+            self.file.close()
+            raise ValueError(f'{path} is not a book file')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION or len(self.data) != HEADER.size + self.count * RECORD.size:
+            self.close()
+            raise ValueError(f'{path} is not a book file')
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield RECORD.unpack_from(self.data, HEADER.size + index * RECORD.size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def probe(self, key):
+        '''
+        Binary search a canonical hash.
+
+        :param key: canonical hash.
+        :return: (move code, depth, score) or None.
+        '''
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record = RECORD.unpack_from(self.data, HEADER.size + middle * RECORD.size)
+            if record[0] < key:
+                low = middle + 1
+            elif record[0] > key:
+                high = middle
+            else:
+                return record[1:]
+        return None
+
+    def lookup(self, board, piece_type):
+        '''
+        Find the book move of a position.
+
+        :param board: n*n board.
+        :param piece_type: 1('X') or 2('O') to move.
+        :return: (move, depth, score) with the move in the frame of board, or None.
+        '''
+        key, t = canonical_hash(board, piece_type)
+        record = self.probe(key)
+        if record is None:
+            return None
+        code, depth, score = record
+        return transform_move(decode_move(code, self.size), inverse_symmetry(t), self.size), depth, score
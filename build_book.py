@@ -0,0 +1,127 @@
+# build_book.py
+import os
+import sys
+import time
+import argparse
+from multiprocessing import Pool
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'players'))
+import my_player
+from host import GO
+from book import write_book, read_book, SOLVED
+from symmetry import canonical_hash, inverse_symmetry, transform_move
+from transposition import TranspositionTable
+
+BOARD_SIZE = 5
+DEFAULT_BOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'book.bin')
+
+def play(position, move):
+    '''
+    Play a move on a (piece_type, previous_board, board) position.
+
+    :return: the next position.
+    '''
+    piece_type, previous_board, board = position
+    go = GO(BOARD_SIZE)
+    go.set_board(piece_type, previous_board, [row[:] for row in board])
+    go.make_move(move, piece_type)
+    return 3 - piece_type, board, go.board
+
+def legal_moves(position):
+    piece_type, previous_board, board = position
+    go = GO(BOARD_SIZE)
+    go.set_board(piece_type, previous_board, board)
+    return go.moves_from_mask(go.legal_moves(piece_type))
+
+def search(job):
+    '''
+    Search one position with my_player.py, run in a worker process.
+
+    :param job: (position, max plies, seconds, transposition table MB).
+    :return: (move, completed plies, score for the side to move); the move is None
+             when the search found none, and the player then searches live.
+    '''
+    (piece_type, previous_board, board), plies, seconds, tt_mb = job
+    my_player._tt = TranspositionTable(tt_mb)
+    score, move = my_player.searchBestMove(board, previous_board, piece_type, time.time() + seconds, plies)
+    return move, my_player._completedPlies, score
+
+def build(plies, depth, seconds, jobs, tt_mb, entries, path=None):
+    '''
+    Grow the book level by level. The book side plays its searched move and the
+    other side plays every legal move, once with each colour as the book side, so
+    the book answers every reply to its own moves for the first plies moves.
+    Positions are merged by canonical hash, so symmetric lines are searched once.
+
+    :param plies: moves already played in the deepest book positions.
+    :param entries: dict of canonical hash to (move, depth, score), updated in place;
+                    positions already in it are not searched again.
+    :param path: book file written after every ply, so that --extend resumes a build.
+    :return: entries.
+    '''
+    empty = [[0] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+    frontier = {(book_side, canonical_hash(empty)[0]): (book_side, (1, empty, empty)) for book_side in (1, 2)}
+    with Pool(jobs) as pool:
+        for ply in range(plies + 1):
+            to_search = {}
+            for book_side, position in frontier.values():
+                key, _ = canonical_hash(position[2], position[0])
+                # my_player.py plays the first move of each colour without searching
+                if position[0] == book_side and key not in entries \
+                        and my_player.getOpeningMove(position[2], position[0]) is None:
+                    to_search[key] = position
+            start = time.time()
+            keys = list(to_search)
+            results = pool.map(search, [(to_search[key], depth, seconds, tt_mb) for key in keys])
+            for key, (move, completed, score) in zip(keys, results):
+                if move is None:
+                    continue
+                _, t = canonical_hash(to_search[key][2], to_search[key][0])
+                entries[key] = (transform_move(move, t, BOARD_SIZE), min(completed, SOLVED), score)
+            print(f"ply {ply}: {len(frontier)} positions, {len(keys)} searched in {time.time() - start:.1f}s, "
+                  f"{len(entries)} in book", file=sys.stderr)
+            if path is not None:
+                write_book(path, entries, BOARD_SIZE)
+            if ply == plies:
+                break
+
+            children = {}
+            for book_side, position in frontier.values():
+                if position[0] == book_side:
+                    move = my_player.getOpeningMove(position[2], position[0]) or lookup(entries, position)
+                    moves = [move] if move is not None else []
+                else:
+                    moves = legal_moves(position)
+                for move in moves:
+                    if move == "PASS":
+                        continue
+                    child = play(position, move)
+                    children[(book_side, canonical_hash(child[2], child[0])[0])] = (book_side, child)
+            frontier = children
+    return entries
+
+def lookup(entries, position):
+    '''
+    Get the book move of a position from the entries being built, in the frame of the position.
+    '''
+    key, t = canonical_hash(position[2], position[0])
+    if key not in entries:
+        return None
+    return transform_move(entries[key][0], inverse_symmetry(t), BOARD_SIZE)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the opening book of my_player.py offline')
+    parser.add_argument('--plies', type=int, default=4, help='Moves already played in the deepest book positions (default: 4)')
+    parser.add_argument('--depth', type=int, default=7, help='Plies searched per position (default: 7)')
+    parser.add_argument('--time', type=float, default=10, help='Seconds of search per position (default: 10)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help='Worker processes (default: all CPUs)')
+    parser.add_argument('--tt-mb', type=float, default=64, help='Transposition table size per worker in MB (default: 64)')
+    parser.add_argument('-o', '--output', default=DEFAULT_BOOK, help='Book file (default: book.bin)')
+    parser.add_argument('--extend', action='store_true', help='Keep the positions of an existing book instead of searching them again')
+    args = parser.parse_args()
+
+    entries = read_book(args.output) if args.extend and os.path.exists(args.output) else {}
+    build(args.plies, args.depth, args.time, args.jobs, args.tt_mb, entries, args.output)
+    print(f"Wrote {len(entries)} positions to {args.output}")
+
+if __name__ == "__main__":
+    main()
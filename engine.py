@@ -0,0 +1,273 @@
+# engine.py
+import os
+import sys
+import time
+import runpy
+import shutil
+import select
+import tempfile
+import subprocess
+from read import readOutput
+from write import writeNextInput
+from transport import redirect
+from position import Position
+from player_api import defines_function
+
+BOARD_SIZE = 5
+PROTOCOL_VERSION = 1
+SAFETY = 0.5 # Seconds of the move time kept for the protocol and process scheduling, so a player using its whole budget is not killed
+
+class EngineError(Exception):
+    pass
+
+class EngineTimeout(EngineError):
+    pass
+
+def format_board(board):
+    return "".join(str(x) for row in board for x in row)
+
+def parse_board(text, n=BOARD_SIZE):
+    if len(text) != n * n or any(c not in "012" for c in text):
+        raise ValueError(f"bad board {text!r}")
+    return [[int(text[i * n + j]) for j in range(n)] for i in range(n)]
+
+def format_move(move):
+    return "PASS" if move == "PASS" else f"{move[0]},{move[1]}"
+
+def parse_move(text):
+    '''
+    Parse a move in the format of output.txt.
+
+    :param text: "PASS" or "row,column".
+    :return: ("PASS", -1, -1) or ("MOVE", row, column), as read.readOutput.
+    '''
+    if text == "PASS":
+        return "PASS", -1, -1
+    x, y = text.split(',')
+    return "MOVE", int(x), int(y)
+
+def serve(select_move, new_game=None, name="player", stdin=None, stdout=None):
+    '''
+    Run the engine side of the protocol until "quit" or end of input.
+
+    The protocol is line oriented like GTP. Every command is one line and every
+    answer is "= <result>" or "? <error>" followed by an empty line:
+
+        name                                  -> = <player name>
+        protocol_version                      -> = 1
+        boardsize <n>                         -> =          (only 5 is supported)
+        clear_board                           -> =          (a new game starts)
+        position <piece_type> <prev> <board>  -> =          (boards as 25 digits, row by row)
+        genmove [seconds]                     -> = <row>,<column> | = PASS
+        quit                                  -> =
+
+    :param select_move: function (piece_type, previous_board, board, deadline) returning
+                        (row, column) or "PASS"; deadline is a time.time() value or None.
+    :param new_game: function called on clear_board, or None.
+    :param name: name answered to the name command.
+    :param stdin: input stream, default sys.stdin.
+    :param stdout: output stream, default sys.stdout.
+    :return: None.
+    '''
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    position = None
+    for line in stdin:
+        args = line.split()
+        if not args:
+            continue
+        command, args = args[0], args[1:]
+        try:
+            result = ""
+            if command == "name":
+                result = name
+            elif command == "protocol_version":
+                result = str(PROTOCOL_VERSION)
+            elif command == "boardsize":
+                if int(args[0]) != BOARD_SIZE:
+                    raise ValueError(f"unsupported board size {args[0]}")
+            elif command == "clear_board":
+                position = None
+                if new_game is not None:
+                    new_game()
+            elif command == "position":
+                position = (int(args[0]), parse_board(args[1]), parse_board(args[2]))
+            elif command == "genmove":
+                if position is None:
+                    raise ValueError("no position")
+                deadline = time.time() + float(args[0]) if args else None
+                result = format_move(select_move(*position, deadline))
+            elif command == "quit":
+                stdout.write("=\n\n")
+                stdout.flush()
+                return
+            else:
+                raise ValueError(f"unknown command {command}")
+            stdout.write(f"= {result}\n\n" if result else "=\n\n")
+        except Exception as e:
+            stdout.write(f"? {e}\n\n")
+        stdout.flush()
+
+def shim(player_path):
+    '''
+    Serve a file-based player through the protocol: every genmove runs the player
+    with read.py and write.py redirected to in-memory transports, so no input.txt
+    or output.txt touches the disk. EngineClient still starts the shim in a
+    private scratch directory for any other file the player writes.
+
+    Players that define select_move(position, deadline) (player_api) are imported
+    once and called directly, and their new_game() (or reset()), if any, is called
+    on clear_board. Players that define main() are imported once and
+    main() is called for every move, so their imports and module-level state (caches, tables) survive between
+    moves. Script-only players are re-executed with runpy, which still saves the
+    interpreter startup and the imports of their modules.
+
+    :param player_path: path of the player script.
+    :return: None.
+    '''
+    player_path = os.path.abspath(player_path)
+    sys.argv = [player_path]
+    if defines_function(player_path, 'select_move'):
+        player = runpy.run_path(player_path, run_name='__engine__')
+        player_select_move = player['select_move']
+
+        def select_move(piece_type, previous_board, board, deadline):
+            stdout, sys.stdout = sys.stdout, sys.stderr # Keep prints of the player off the protocol
+            try:
+                return player_select_move(Position.from_input(piece_type, previous_board, board), deadline)
+            finally:
+                sys.stdout = stdout
+
+        serve(select_move, new_game=player.get('new_game') or player.get('reset'), name=os.path.basename(player_path))
+        return
+    has_main = defines_function(player_path, 'main')
+    player_main = runpy.run_path(player_path, run_name='__engine__')['main'] if has_main else None
+
+    def select_move(piece_type, previous_board, board, deadline):
+        inputs, outputs = [], []
+        writeNextInput(piece_type, previous_board, board, inputs.append)
+        sys.argv = [player_path]
+        stdout, sys.stdout = sys.stdout, sys.stderr # Keep prints of the player off the protocol
+        try:
+            with redirect(lambda: inputs[0], outputs.append):
+                if player_main is not None:
+                    player_main()
+                else:
+                    runpy.run_path(player_path, run_name='__main__')
+        finally:
+            sys.stdout = stdout
+        if not outputs:
+            raise ValueError("no move written")
+        move_type, x, y = readOutput(lambda: outputs[-1])
+        return "PASS" if move_type == "PASS" else (x, y)
+
+    serve(select_move, name=os.path.basename(player_path))
+
+class EngineClient:
+    def __init__(self, player_path, timeout=9):
+        """
+        Controller side of the protocol: one long-lived player process that is
+        started once and asked for a move per turn, instead of a new Python process
+        per move.
+
+        :param player_path: path of the player script, served by the engine.py shim.
+        :param timeout: seconds allowed per move.
+        """
+        self.player_path = os.path.abspath(player_path)
+        self.timeout = timeout
+        self.process = None
+        self.scratch = None
+        self.buffer = b""
+
+    def start(self):
+        '''
+        Start the player process if it is not running.
+
+        :return: None.
+        '''
+        if self.process is not None and self.process.poll() is None:
+            return
+        self.kill()
+        engine = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'engine.py')
+        self.scratch = tempfile.mkdtemp(prefix='go_engine_')
+        self.process = subprocess.Popen([sys.executable, engine, self.player_path], cwd=self.scratch,
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.buffer = b""
+
+    def send(self, command, timeout=None):
+        '''
+        Send one command and wait for its answer.
+
+        :param command: command line without the newline.
+        :param timeout: seconds to wait, None waits forever.
+        :return: result text of the answer.
+        '''
+        self.start()
+        try:
+            self.process.stdin.write(command.encode() + b"\n")
+            self.process.stdin.flush()
+        except OSError:
+            self.kill()
+            raise EngineError(f"{self.player_path} exited")
+        deadline = time.time() + timeout if timeout is not None else None
+        fd = self.process.stdout.fileno()
+        while b"\n\n" not in self.buffer:
+            remaining = deadline - time.time() if deadline is not None else None
+            if remaining is not None and remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                self.kill()
+                raise EngineTimeout(f"{self.player_path} timed out")
+            data = os.read(fd, 4096)
+            if not data:
+                self.kill()
+                raise EngineError(f"{self.player_path} exited")
+            self.buffer += data
+        answer, self.buffer = self.buffer.split(b"\n\n", 1)
+        answer = answer.decode().strip()
+        if answer.startswith("?"):
+            raise EngineError(answer[1:].strip())
+        return answer[1:].strip()
+
+    def new_game(self):
+        self.send("clear_board", self.timeout)
+
+    def genmove(self, piece_type, previous_board, board):
+        '''
+        Ask for the move of a position. The player is given the timeout less SAFETY,
+        and is only killed when the full timeout has passed.
+
+        :param piece_type: 1('X') or 2('O') to move.
+        :param previous_board: previous board state.
+        :param board: current board state.
+        :return: ("PASS", -1, -1) or ("MOVE", row, column), as read.readOutput.
+        '''
+        self.send(f"position {piece_type} {format_board(previous_board)} {format_board(board)}", self.timeout)
+        return parse_move(self.send(f"genmove {max(self.timeout - SAFETY, 0)}", self.timeout))
+
+    def kill(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+        if self.scratch is not None:
+            shutil.rmtree(self.scratch, ignore_errors=True)
+            self.scratch = None
+
+    def close(self):
+        '''
+        Stop the player process.
+
+        :return: None.
+        '''
+        if self.process is None:
+            return
+        try:
+            self.send("quit", 1)
+        except EngineError:
+            pass
+        self.kill()
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("usage: python engine.py players/<player>.py", file=sys.stderr)
+        sys.exit(1)
+    shim(sys.argv[1])
@@ -9,12 +9,88 @@ from copy import deepcopy
 from read import *
 from write import writeNextInput
 
+_neighbor_tables = {}
+
+def neighbor_table(n):
+    '''
+    Precompute the neighbors of every point of a board.
+
+    :param n: size of the board n*n.
+    :return: n*n table of tuples of neighbors row and column (row, column).
+    '''
+    if n not in _neighbor_tables:
+        table = []
+        for i in range(n):
+            row = []
+            for j in range(n):
+                neighbors = []
+                if i > 0: neighbors.append((i-1, j))
+                if i < n - 1: neighbors.append((i+1, j))
+                if j > 0: neighbors.append((i, j-1))
+                if j < n - 1: neighbors.append((i, j+1))
+                row.append(tuple(neighbors))
+            table.append(row)
+        _neighbor_tables[n] = table
+    return _neighbor_tables[n]
+
+_zobrist_tables = {}
+
+def zobrist_table(n):
+    '''
+    Random 64-bit Zobrist keys for a board size. The generator is seeded so that every
+    process agrees on the hashes, which lets them be stored on disk and shared.
+
+    :param n: size of the board n*n.
+    :return: (keys, side) where keys[piece_type][i][j] is the key of a stone and side is
+             xored in when 'O' is to move.
+    '''
+    if n not in _zobrist_tables:
+        rng = random.Random(561)
+        keys = [[[0] * n for _ in range(n)]]
+        for piece_type in (1, 2):
+            keys.append([[rng.getrandbits(64) for _ in range(n)] for _ in range(n)])
+        _zobrist_tables[n] = (keys, rng.getrandbits(64))
+    return _zobrist_tables[n]
+
+def zobrist_hash(board):
+    '''
+    Compute the Zobrist hash of the stones of a board, without side to move.
+
+    :param board: n*n board.
+    :return: 64-bit hash.
+    '''
+    keys = zobrist_table(len(board))[0]
+    h = 0
+    for i, row in enumerate(board):
+        for j, piece_type in enumerate(row):
+            if piece_type:
+                h ^= keys[piece_type][i][j]
+    return h
+
+class Group:
+    __slots__ = ('color', 'stones', 'liberties')
+
+    def __init__(self, color, stones, liberties):
+        """
+        A chain of connected stones. Groups are never mutated: when a move changes a
+        chain, GO replaces it with a new Group so that undo can restore the old one.
+
+        :param color: 1('X') or 2('O').
+        :param stones: frozenset of the stones row and column (row, column).
+        :param liberties: frozenset of the empty points adjacent to the chain.
+        """
+        self.color = color
+        self.stones = stones
+        self.liberties = liberties
+
 class GO:
-    def __init__(self, n):
+    def __init__(self, n, ko_rule="simple"):
         """
         Go game.
 
         :param n: size of the board n*n
+        :param ko_rule: "simple" forbids retaking a ko right away (assignment rules),
+                        "superko" forbids repeating any board position of the game.
         """
         self.size = n
         #self.previous_board = None # Store the previous board
@@ -24,6 +100,14 @@ class GO:
         self.max_move = n * n - 1 # The max movement of a Go game
         self.komi = n/2 # Komi rule
         self.verbose = False # Verbose only when there is a manual player
+        self.undo_stack = [] # Undo records of the moves played with make_move
+        self.neighbors = neighbor_table(n) # Neighbors of every point
+        self.groups = None # Group of every stone, None for empty points
+        self.ko_rule = ko_rule
+        self.zobrist, self.zobrist_side = zobrist_table(n)
+        self.board_hash = 0 # Zobrist hash of the stones on the board
+        self.previous_hash = 0 # Zobrist hash of the stones on the previous board
+        self.seen_hashes = set() # Zobrist hashes of every board of the game, for superko
 
     def init_board(self, n):
         '''
@@ -37,6 +121,9 @@ class GO:
         # 'O' pieces marked as 2
         self.board = board
         self.previous_board = deepcopy(board)
+        self.build_groups()
+        self.board_hash = self.previous_hash = 0
+        self.seen_hashes = {0}
 
     def set_board(self, piece_type, previous_board, board):
         '''
@@ -57,6 +144,21 @@ class GO:
         # self.piece_type = piece_type
         self.previous_board = previous_board
         self.board = board
+        self.X_move = piece_type == 1
+        self.build_groups()
+        self.board_hash = zobrist_hash(board)
+        self.previous_hash = zobrist_hash(previous_board)
+        self.seen_hashes = {self.previous_hash, self.board_hash}
+
+    @property
+    def hash(self):
+        '''
+        Zobrist hash of the position including the side to move, usable as a
+        transposition table key.
+
+        :return: 64-bit hash.
+        '''
+        return self.board_hash if self.X_move else self.board_hash ^ self.zobrist_side
 
     def compare_board(self, board1, board2):
         for i in range(self.size):
@@ -70,9 +172,22 @@ class GO:
         Copy the current board for potential testing.
 
         :param: None.
-        :return: the copied board instance.
-        '''
-        return deepcopy(self)
+        :return: the copied board instance, with an empty undo history.
+        '''
+        new = object.__new__(GO)
+        new.__dict__.update(self.__dict__)
+        new.board = [row[:] for row in self.board]
+        new.previous_board = [row[:] for row in self.previous_board]
+        new.died_pieces = list(self.died_pieces)
+        new.undo_stack = []
+        new.seen_hashes = set(self.seen_hashes)
+        if self.groups is None:
+            # The board was assigned directly and its groups were never built
+            new.build_groups()
+        else:
+            # Groups are never mutated, so the copy can share them
+            new.groups = [row[:] for row in self.groups]
+        return new
 
     def detect_neighbor(self, i, j):
         '''
@@ -117,14 +232,19 @@ class GO:
         :param j: column number of the board.
         :return: a list containing the all allies row and column (row, column) of position (i, j).
         '''
+        group = self.groups[i][j]
+        if group is not None:
+            return list(group.stones)
         stack = [(i, j)]  # stack for DFS serach
-        ally_members = []  # record allies positions during the search
+        visited = {(i, j)}  # record allies positions during the search
+        ally_members = []
         while stack:
             piece = stack.pop()
             ally_members.append(piece)
             neighbor_allies = self.detect_neighbor_ally(piece[0], piece[1])
             for ally in neighbor_allies:
-                if ally not in stack and ally not in ally_members:
+                if ally not in visited:
+                    visited.add(ally)
                     stack.append(ally)
         return ally_members
 
@@ -136,6 +256,9 @@ class GO:
         :param j: column number of the board.
         :return: boolean indicating whether the given stone still has liberty.
         '''
+        group = self.groups[i][j]
+        if group is not None:
+            return bool(group.liberties)
         board = self.board
         ally_members = self.ally_dfs(i, j)
         for member in ally_members:
@@ -154,15 +277,16 @@ class GO:
         :param piece_type: 1('X') or 2('O').
         :return: a list containing the dead pieces row and column(row, column).
         '''
-        board = self.board
+        groups = self.groups
         died_pieces = []
 
-        for i in range(len(board)):
-            for j in range(len(board)):
+        for i in range(self.size):
+            for j in range(self.size):
+                group = groups[i][j]
                 # Check if there is a piece at this position:
-                if board[i][j] == piece_type:
+                if group is not None and group.color == piece_type:
                     # The piece die if it has no liberty
-                    if not self.find_liberty(i, j):
+                    if not group.liberties:
                         died_pieces.append((i,j))
         return died_pieces
 
@@ -176,7 +300,11 @@ class GO:
 
         died_pieces = self.find_died_pieces(piece_type)
         if not died_pieces: return []
-        self.remove_certain_pieces(died_pieces)
+        groups = self.groups
+        for piece in died_pieces:
+            group = groups[piece[0]][piece[1]]
+            if group is not None:
+                self.remove_group(group)
         return died_pieces
 
     def remove_certain_pieces(self, positions):
@@ -205,9 +333,9 @@ class GO:
         valid_place = self.valid_place_check(i, j, piece_type)
         if not valid_place:
             return False
-        self.previous_board = deepcopy(board)
-        board[i][j] = piece_type
-        self.update_board(board)
+        self.previous_board = [row[:] for row in board]
+        self.previous_hash = self.board_hash
+        self.add_stone(i, j, piece_type)
         # Remove the following line for HW2 CS561 S2020
         # self.n_move += 1
         return True
@@ -243,31 +371,335 @@ class GO:
                 print('Invalid placement. There is already a chess in this position.')
             return False
         
-        # Copy the board for testing
-        test_go = self.copy_board()
-        test_board = test_go.board
-
-        # Check if the place has liberty
-        test_board[i][j] = piece_type
-        test_go.update_board(test_board)
-        if test_go.find_liberty(i, j):
-            return True
-
-        # If not, remove the died pieces of opponent and check again
-        test_go.remove_died_pieces(3 - piece_type)
-        if not test_go.find_liberty(i, j):
+        error, captured = self.placement_check(i, j, piece_type)
+        if error == "liberty":
             if verbose:
                 print('Invalid placement. No liberty found in this position.')
             return False
+        if error == "superko":
+            if verbose:
+                print('Invalid placement. A repeat board state not permitted by the superko rule.')
+            return False
+        if error == "ko":
+            if verbose:
+                print('Invalid placement. A repeat move not permitted by the KO rule.')
+            return False
+        return True
+
+    def placement_check(self, i, j, piece_type):
+        '''
+        Check a placement on an empty point using only the groups adjacent to it.
+
+        :param i: row number of the board.
+        :param j: column number of the board.
+        :param piece_type: 1('X') or 2('O').
+        :return: (error, captured) where error is None for a valid placement, or "liberty",
+                 "ko" or "superko", and captured is the list of opponent Groups it captures.
+        '''
+        # Check if the place has liberty, and collect the opponent groups it captures
+        groups = self.groups
+        liberty = False
+        captured = []
+        for x, y in self.neighbors[i][j]:
+            group = groups[x][y]
+            if group is None:
+                liberty = True
+            elif group.color == piece_type:
+                if len(group.liberties) > 1:
+                    liberty = True
+            elif len(group.liberties) == 1 and group not in captured:
+                captured.append(group)
+
+        # If not, the placement must capture some pieces of opponent
+        if not liberty and not captured:
+            return "liberty", captured
 
         # Check special case: repeat placement causing the repeat board state (KO rule)
-        else:
-            if self.died_pieces and self.compare_board(self.previous_board, test_go.board):
-                if verbose:
-                    print('Invalid placement. A repeat move not permitted by the KO rule.')
+        if self.ko_rule == "superko":
+            if self.hash_after_move(i, j, piece_type, captured) in self.seen_hashes:
+                return "superko", captured
+        elif not liberty and self.died_pieces:
+            if self.hash_after_move(i, j, piece_type, captured) == self.previous_hash:
+                return "ko", captured
+        return None, captured
+
+    def legal_moves(self, piece_type):
+        '''
+        Find every valid placement in one pass over the board.
+
+        :param piece_type: 1('X') or 2('O').
+        :return: n*n-bit mask where bit i * n + j is set if (i, j) is a valid placement.
+        '''
+        return self.scan_moves(piece_type)[0]
+
+    def capture_counts(self, piece_type):
+        '''
+        Count the opponent stones captured by every valid placement in one pass over the board.
+
+        :param piece_type: 1('X') or 2('O').
+        :return: a list of n*n counts indexed by i * n + j, 0 for invalid placements.
+        '''
+        return self.scan_moves(piece_type)[1]
+
+    def scan_moves(self, piece_type):
+        '''
+        Check every empty point of the board for piece_type.
+
+        :param piece_type: 1('X') or 2('O').
+        :return: (mask, counts) as returned by legal_moves and capture_counts.
+        '''
+        n = self.size
+        board = self.board
+        mask = 0
+        counts = [0] * (n * n)
+        for i in range(n):
+            row = board[i]
+            for j in range(n):
+                if row[j] != 0:
+                    continue
+                error, captured = self.placement_check(i, j, piece_type)
+                if error is None:
+                    mask |= 1 << (i * n + j)
+                    for group in captured:
+                        counts[i * n + j] += len(group.stones)
+        return mask, counts
+
+    def moves_from_mask(self, mask):
+        '''
+        Convert a mask returned by legal_moves into moves.
+
+        :param mask: n*n-bit mask of points.
+        :return: a list of (row, column) in row-major order.
+        '''
+        n = self.size
+        moves = []
+        while mask:
+            low = mask & -mask
+            p = low.bit_length() - 1
+            moves.append((p // n, p % n))
+            mask ^= low
+        return moves
+
+    def hash_after_move(self, i, j, piece_type, captured):
+        '''
+        Compute the board hash reached by placing a stone and removing captured groups.
+
+        :param i: row number of the board.
+        :param j: column number of the board.
+        :param piece_type: 1('X') or 2('O').
+        :param captured: a list of the opponent Groups captured by the stone.
+        :return: 64-bit hash of the stones, without side to move.
+        '''
+        keys = self.zobrist
+        h = self.board_hash ^ keys[piece_type][i][j]
+        for group in captured:
+            opponent_keys = keys[group.color]
+            for x, y in group.stones:
+                h ^= opponent_keys[x][y]
+        return h
+
+    def build_groups(self):
+        '''
+        Rebuild the group of every stone from scratch.
+
+        :return: None.
+        '''
+        board = self.board
+        neighbors = self.neighbors
+        self.groups = groups = [[None] * self.size for _ in range(self.size)]
+        for i in range(self.size):
+            for j in range(self.size):
+                color = board[i][j]
+                if color == 0 or groups[i][j] is not None:
+                    continue
+                stones = {(i, j)}
+                liberties = set()
+                stack = [(i, j)]
+                while stack:
+                    x, y = stack.pop()
+                    for piece in neighbors[x][y]:
+                        value = board[piece[0]][piece[1]]
+                        if value == 0:
+                            liberties.add(piece)
+                        elif value == color and piece not in stones:
+                            stones.add(piece)
+                            stack.append(piece)
+                self.set_group(Group(color, frozenset(stones), frozenset(liberties)))
+
+    def set_group(self, group, journal=None):
+        '''
+        Point every stone of a group to it.
+
+        :param group: the new Group.
+        :param journal: list recording (row, column, old group) for undo, or None.
+        :return: None.
+        '''
+        groups = self.groups
+        for x, y in group.stones:
+            if journal is not None:
+                journal.append((x, y, groups[x][y]))
+            groups[x][y] = group
+
+    def add_stone(self, i, j, piece_type, journal=None):
+        '''
+        Place a stone and update only the groups adjacent to it. Opponent stones left
+        without liberty stay on the board until they are removed.
+
+        :param i: row number of the board.
+        :param j: column number of the board.
+        :param piece_type: 1('X') or 2('O').
+        :param journal: list recording (row, column, old group) for undo, or None.
+        :return: the updated opponent groups adjacent to the stone.
+        '''
+        groups = self.groups
+        point = (i, j)
+        stones = {point}
+        liberties = set()
+        opponents = []
+        for piece in self.neighbors[i][j]:
+            group = groups[piece[0]][piece[1]]
+            if group is None:
+                liberties.add(piece)
+            elif group.color == piece_type:
+                stones |= group.stones
+                liberties |= group.liberties
+            elif group not in opponents:
+                opponents.append(group)
+        liberties.discard(point)
+        self.board[i][j] = piece_type
+        self.board_hash ^= self.zobrist[piece_type][i][j]
+        self.set_group(Group(piece_type, frozenset(stones), frozenset(liberties)), journal)
+        updated = []
+        for group in opponents:
+            group = Group(group.color, group.stones, group.liberties - {point})
+            self.set_group(group, journal)
+            updated.append(group)
+        return updated
+
+    def remove_group(self, group, journal=None):
+        '''
+        Remove the stones of a group and give their points back as liberties to the adjacent groups.
+
+        :param group: the Group to remove.
+        :param journal: list recording (row, column, old group) for undo, or None.
+        :return: None.
+        '''
+        board = self.board
+        groups = self.groups
+        gained = {}
+        keys = self.zobrist[group.color]
+        for x, y in group.stones:
+            board[x][y] = 0
+            self.board_hash ^= keys[x][y]
+            if journal is not None:
+                journal.append((x, y, group))
+            groups[x][y] = None
+        for point in group.stones:
+            for piece in self.neighbors[point[0]][point[1]]:
+                neighbor = groups[piece[0]][piece[1]]
+                if neighbor is not None:
+                    gained.setdefault(neighbor, set()).add(point)
+        for neighbor, points in gained.items():
+            self.set_group(Group(neighbor.color, neighbor.stones, neighbor.liberties | points), journal)
+
+    def group_of(self, i, j):
+        '''
+        Get the group of a given stone.
+
+        :param i: row number of the board.
+        :param j: column number of the board.
+        :return: the Group of the stone, None for an empty point.
+        '''
+        return self.groups[i][j]
+
+    def liberties(self, group):
+        '''
+        Get the liberties of a group.
+
+        :param group: a Group returned by group_of.
+        :return: frozenset of the liberties row and column (row, column).
+        '''
+        return group.liberties
+
+    def atari_groups(self, color):
+        '''
+        Find the groups of a color that have a single liberty left.
+
+        :param color: 1('X') or 2('O').
+        :return: a list of Groups in atari.
+        '''
+        found = []
+        for row in self.groups:
+            for group in row:
+                if group is not None and group.color == color and len(group.liberties) == 1 \
+                        and group not in found:
+                    found.append(group)
+        return found
+
+    def make_move(self, move, piece_type):
+        '''
+        Play a move in place, remove the captured stones and record how to undo it.
+
+        :param move: (i, j) or "PASS".
+        :param piece_type: 1('X') or 2('O').
+        :return: boolean indicating whether the move was played.
+        '''
+        board = self.board
+        if move != "PASS":
+            i, j = move
+            if not self.valid_place_check(i, j, piece_type, test_check=True):
                 return False
+        previous_board, died_pieces = self.previous_board, self.died_pieces
+        board_hash, previous_hash = self.board_hash, self.previous_hash
+        self.previous_board = [row[:] for row in board]
+        self.previous_hash = board_hash
+        journal = []
+        captured = []
+        if move != "PASS":
+            # Only the opponent groups adjacent to the move can be captured
+            for group in self.add_stone(i, j, piece_type, journal):
+                if not group.liberties:
+                    captured.extend(group.stones)
+                    self.remove_group(group, journal)
+            captured.sort()
+        self.died_pieces = captured
+        added = self.board_hash not in self.seen_hashes
+        if added:
+            self.seen_hashes.add(self.board_hash)
+        # Undo record: move, piece type, captured stones, the previous KO state and the group changes
+        record = (move, piece_type, captured, previous_board, died_pieces, self.X_move, journal,
+                  board_hash, previous_hash, added)
+        self.undo_stack.append(record)
+        self.n_move += 1
+        self.X_move = piece_type == 2
         return True
-        
+
+    def undo_move(self):
+        '''
+        Take back the last move played with make_move.
+
+        :return: the move that was undone, (i, j) or "PASS".
+        '''
+        (move, piece_type, captured, previous_board, died_pieces, X_move, journal,
+         board_hash, previous_hash, added) = self.undo_stack.pop()
+        if added:
+            self.seen_hashes.discard(self.board_hash)
+        board = self.board
+        if move != "PASS":
+            board[move[0]][move[1]] = 0
+            for piece in captured:
+                board[piece[0]][piece[1]] = 3 - piece_type
+        groups = self.groups
+        for x, y, group in reversed(journal):
+            groups[x][y] = group
+        self.previous_board = previous_board
+        self.died_pieces = died_pieces
+        self.board_hash = board_hash
+        self.previous_hash = previous_hash
+        self.n_move -= 1
+        self.X_move = X_move
+        return move
+
     def update_board(self, new_board):
         '''
         Update the board with new_board
@@ -276,6 +708,9 @@ class GO:
         :return: None.
         '''   
         self.board = new_board
+        self.build_groups()
+        self.board_hash = zobrist_hash(new_board)
+        self.seen_hashes.add(self.board_hash)
 
     def visualize_board(self):
         '''
@@ -397,8 +832,10 @@ class GO:
                     continue
 
                 self.died_pieces = self.remove_died_pieces(3 - piece_type) # Remove the dead pieces of opponent
+                self.seen_hashes.add(self.board_hash)
             else:
-                self.previous_board = deepcopy(self.board)
+                self.previous_board = [row[:] for row in self.board]
+                self.previous_hash = self.board_hash
 
             if verbose:
                 self.visualize_board() # Visualize the board again
@@ -0,0 +1,143 @@
+import os
+import sys
+import csv
+import json
+import time
+import resource
+import subprocess
+
+FIELDS = ('player', 'game', 'move', 'color', 'mode', 'wall', 'user', 'sys', 'max_rss_mb', 'timed_out')
+# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+_RSS_UNIT = 1024 * 1024 if sys.platform == 'darwin' else 1024
+_CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+def process_usage(pid):
+    '''
+    Read the CPU time and peak memory of a running process from /proc (Linux).
+
+    :param pid: process id.
+    :return: (user seconds, system seconds, peak RSS in MB), or None when /proc is not available.
+    '''
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            # The command name may contain spaces, the fields after it do not
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open(f'/proc/{pid}/status') as f:
+            peak = next((int(line.split()[1]) for line in f if line.startswith('VmHWM:')), 0)
+    except (OSError, IndexError, ValueError):
+        return None
+    return int(fields[11]) / _CLOCK_TICKS, int(fields[12]) / _CLOCK_TICKS, peak / 1024
+
+def self_usage():
+    '''
+    CPU time and peak memory of this process.
+
+    :return: (user seconds, system seconds, peak RSS in MB).
+    '''
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime, usage.ru_stime, usage.ru_maxrss / _RSS_UNIT
+
+def run_process(args, timeout, cwd=None):
+    '''
+    Run a command like subprocess.run and collect its resource usage with os.wait4.
+
+    :param args: command line.
+    :param timeout: seconds before the process is killed.
+    :param cwd: working directory.
+    :return: (timed_out, (user seconds, system seconds, peak RSS in MB)).
+    '''
+    process = subprocess.Popen(args, cwd=cwd)
+    deadline = time.time() + timeout
+    delay = 0.0005
+    timed_out = False
+    while True:
+        pid, status, usage = os.wait4(process.pid, os.WNOHANG)
+        if pid:
+            break
+        if time.time() > deadline:
+            process.kill()
+            _, status, usage = os.wait4(process.pid, 0)
+            timed_out = True
+            break
+        time.sleep(delay)
+        delay = min(delay * 2, 0.005)
+    process.returncode = os.waitstatus_to_exitcode(status) # Already reaped, Popen must not wait for it
+    return timed_out, (usage.ru_utime, usage.ru_stime, usage.ru_maxrss / _RSS_UNIT)
+
+def percentile(values, q):
+    '''
+    Nearest-rank percentile.
+
+    :param values: sorted list of numbers.
+    :param q: percentile in [0, 100].
+    :return: number, or None for an empty list.
+    '''
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * q // 100))
+    return values[int(rank) - 1]
+
+def summarize(records):
+    '''
+    Summarize move records per player.
+
+    :param records: list of dicts with the FIELDS keys.
+    :return: dict of player to dict with "moves", "timeouts", and for "wall" and "cpu"
+             (user + system) the "p50", "p95", "p99" and "max" seconds, and "max_rss_mb".
+    '''
+    by_player = {}
+    for record in records:
+        by_player.setdefault(record['player'], []).append(record)
+    summary = {}
+    for player, moves in by_player.items():
+        entry = {'moves': len(moves), 'timeouts': sum(1 for move in moves if move['timed_out'])}
+        for name, values in (('wall', [move['wall'] for move in moves]),
+                             ('cpu', [move['user'] + move['sys'] for move in moves if move['user'] is not None])):
+            values.sort()
+            entry[name] = {'p50': percentile(values, 50), 'p95': percentile(values, 95),
+                           'p99': percentile(values, 99), 'max': values[-1] if values else None}
+        rss = [move['max_rss_mb'] for move in moves if move['max_rss_mb'] is not None]
+        entry['max_rss_mb'] = max(rss) if rss else None
+        summary[player] = entry
+    return summary
+
+def print_summary(records, limit=None):
+    '''
+    Print the latency and resource table of summarize.
+
+    :param records: move records.
+    :param limit: seconds allowed per move, to show the margin left by the slowest move.
+    :return: None.
+    '''
+    def ms(seconds):
+        return "-" if seconds is None else f"{seconds * 1000:.1f}"
+
+    summary = summarize(records)
+    width = max([len(player) for player in summary] + [6])
+    print(f"\n{'Player':<{width}} {'Moves':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'cpu p95':>8} {'cpu max':>8} {'RSS MB':>7} {'Timeouts':>8}")
+    for player, entry in sorted(summary.items()):
+        wall, cpu = entry['wall'], entry['cpu']
+        rss = "-" if entry['max_rss_mb'] is None else f"{entry['max_rss_mb']:.1f}"
+        print(f"{player:<{width}} {entry['moves']:>6} {ms(wall['p50']):>8} {ms(wall['p95']):>8} {ms(wall['p99']):>8} "
+              f"{ms(wall['max']):>8} {ms(cpu['p95']):>8} {ms(cpu['max']):>8} {rss:>7} {entry['timeouts']:>8}")
+        if limit is not None and wall['max'] is not None and wall['max'] > 0.8 * limit:
+            print(f"  warning: {player} used {wall['max'] / limit:.0%} of the {limit:g} s limit")
+
+def export(path, records):
+    '''
+    Write move records and their summary: JSON ({"moves": [...], "summary": {...}})
+    for a .json path, otherwise CSV with one row per move.
+
+    :param path: output file.
+    :param records: move records.
+    :return: None.
+    '''
+    if path.endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump({'moves': records, 'summary': summarize(records)}, f, indent=1)
+    else:
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
@@ -0,0 +1,147 @@
+import os
+import math
+import json
+from itertools import combinations
+
+DEFAULT_LEAGUE_FILE = 'league.jsonl'
+ELO_SCALE = 400 / math.log(10) # Elo points per unit of natural-log strength
+
+def read_games(path):
+    '''
+    Read the finished games of a league file.
+
+    :param path: JSON lines file, one game per line as written by append_game.
+    :return: list of {"black", "white", "winner"} dicts, winner "black", "white" or "tie";
+             empty if the file does not exist.
+    '''
+    if not os.path.exists(path):
+        return []
+    games = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                games.append(json.loads(line))
+            except ValueError:
+                # A line cut short by a crash; every complete game before and after it is kept
+                continue
+    return games
+
+def append_game(path, game):
+    '''
+    Append one finished game to a league file, flushed at once so that an
+    interrupted league keeps every game played so far.
+
+    :param path: JSON lines file.
+    :param game: {"black", "white", "winner"} dict.
+    :return: None.
+    '''
+    with open(path, 'a') as f:
+        f.write(json.dumps(game) + "\n")
+
+def schedule(players, games, played=()):
+    '''
+    List the games of a round-robin league. Every pair plays games games, the
+    colours alternating, and the pairings are interleaved so that a league stopped
+    early has played every pair about the same number of times.
+
+    :param players: player names.
+    :param games: games per pair.
+    :param played: finished games, as read_games; they are taken off the schedule
+                   by (black, white), so a league is extended by raising games.
+    :return: list of (black, white).
+    '''
+    remaining = {}
+    for game in played:
+        key = (game['black'], game['white'])
+        remaining[key] = remaining.get(key, 0) + 1
+    pairs = list(combinations(sorted(set(players)), 2))
+    result = []
+    for k in range(games):
+        for a, b in pairs:
+            black, white = (a, b) if k % 2 == 0 else (b, a)
+            if remaining.get((black, white), 0) > 0:
+                remaining[(black, white)] -= 1
+            else:
+                result.append((black, white))
+    return result
+
+def ratings(games, prior=2.0, iterations=10000, tolerance=1e-10):
+    '''
+    Compute Elo ratings from game results with the Bradley-Terry model, ties
+    counting as half a win for each side.
+
+    As in BayesElo, every pair that met gets prior virtual tied games, so that
+    players with only wins or only losses still get finite ratings. The ratings
+    are the maximum of the posterior, found with the minorization-maximization
+    iteration of Hunter (2004), and centered on 0. The intervals use the normal
+    approximation of each rating with the others fixed.
+
+    :param games: list of {"black", "white", "winner"} dicts.
+    :param prior: virtual tied games per pair of opponents.
+    :return: dict of player to (elo, 95% interval half-width, games, score), score in [0, 1].
+    '''
+    players = sorted({game['black'] for game in games} | {game['white'] for game in games})
+    if not players:
+        return {}
+    index = {player: i for i, player in enumerate(players)}
+    n = len(players)
+    meetings = [[0.0] * n for _ in range(n)] # Games between i and j, virtual ties included
+    wins = [0.0] * n
+    played = [0] * n
+    points = [0.0] * n
+    for game in games:
+        i, j = index[game['black']], index[game['white']]
+        meetings[i][j] += 1
+        meetings[j][i] += 1
+        played[i] += 1
+        played[j] += 1
+        score = {'black': 1.0, 'white': 0.0}.get(game['winner'], 0.5)
+        points[i] += score
+        points[j] += 1 - score
+    for i in range(n):
+        wins[i] = points[i]
+        for j in range(n):
+            if meetings[i][j]:
+                meetings[i][j] += prior
+                wins[i] += prior / 2
+
+    gamma = [1.0] * n
+    for _ in range(iterations):
+        change = 0.0
+        for i in range(n):
+            denominator = sum(meetings[i][j] / (gamma[i] + gamma[j]) for j in range(n) if meetings[i][j])
+            if denominator:
+                updated = wins[i] / denominator
+                change = max(change, abs(math.log(updated / gamma[i])))
+                gamma[i] = updated
+        mean = sum(math.log(g) for g in gamma) / n
+        gamma = [g / math.exp(mean) for g in gamma]
+        if change < tolerance:
+            break
+
+    result = {}
+    for i, player in enumerate(players):
+        # Fisher information of log(gamma_i): sum over opponents of n * p * (1 - p)
+        information = sum(meetings[i][j] * gamma[i] * gamma[j] / (gamma[i] + gamma[j]) ** 2
+                          for j in range(n) if meetings[i][j])
+        interval = 1.96 * ELO_SCALE / math.sqrt(information) if information else float('inf')
+        result[player] = (ELO_SCALE * math.log(gamma[i]), interval, played[i],
+                          points[i] / played[i] if played[i] else 0.0)
+    return result
+
+def print_ratings(games):
+    '''
+    Print the league table, best rating first.
+
+    :param games: list of {"black", "white", "winner"} dicts.
+    :return: None.
+    '''
+    table = ratings(games)
+    width = max([len(player) for player in table] + [6])
+    print(f"\n{'Rank':<5} {'Player':<{width}} {'Elo':>7} {'95% CI':>8} {'Games':>6} {'Score':>6}")
+    for rank, (player, (elo, interval, played, score)) in enumerate(
+            sorted(table.items(), key=lambda item: -item[1][0]), 1):
+        print(f"{rank:<5} {player:<{width}} {elo:>7.0f} {'±' + format(interval, '.0f'):>8} {played:>6} {score:>6.1%}")
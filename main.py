@@ -1,13 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import subprocess
 import time
 import os
 import random
 import shutil
 from PIL import Image, ImageTk
-from read import readInput, readOutput
-from write import writeNextInput
+from engine import EngineClient, EngineError
 
 BOARD_SIZE = 5
 PLAYER_DIR = 'players'
@@ -28,9 +26,12 @@ class GoGUI:
         self.game_log = []
         self.running = False
         self.manual_mode = False
+        self.engines = {} # One persistent engine.py process per player file
+        self.last_move = None
         self.pass_count = 0
         
         self.create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         
     def load_images(self):
         # Create assets directory if it doesn't exist
@@ -205,15 +206,20 @@ class GoGUI:
         
         self.root.update()
 
-    def write_input(self):
-        writeNextInput(self.turn, self.previous_board, self.board)
+    def get_engine(self, player_file):
+        if player_file not in self.engines:
+            self.engines[player_file] = EngineClient(os.path.join(PLAYER_DIR, player_file), timeout=9)
+        return self.engines[player_file]
 
     def run_player(self, player_file):
-        subprocess.run(["python", os.path.join(PLAYER_DIR, player_file)], timeout=9)
+        try:
+            self.last_move = self.get_engine(player_file).genmove(self.turn, self.previous_board, self.board)
+        except EngineError as e:
+            self.game_log.append(f"{player_file} failed to move ({e}), passing")
+            self.last_move = ("PASS", -1, -1)
 
     def read_move(self):
-        move_type, x, y = readOutput()
-        return move_type, x, y
+        return self.last_move
 
     def apply_move(self, move_type, x, y):
         from host import GO
@@ -260,15 +266,7 @@ class GoGUI:
         # Check if current player has any valid moves
         game = GO(BOARD_SIZE)
         game.set_board(self.turn, self.previous_board, self.board)
-        has_valid_moves = False
-        
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
-                if self.board[i][j] == 0 and game.valid_place_check(i, j, self.turn):
-                    has_valid_moves = True
-                    break
-            if has_valid_moves:
-                break
+        has_valid_moves = game.legal_moves(self.turn) != 0
         
         # If current player has no valid moves, they must pass
         if not has_valid_moves and sum(1 for i in range(BOARD_SIZE) for j in range(BOARD_SIZE) if self.board[i][j] == 0) > 0:
@@ -310,7 +308,6 @@ class GoGUI:
         if self.manual_mode and self.turn == 1:
             return  # Wait for human move
             
-        self.write_input()
         player_file = self.black_var.get() if self.turn == 1 else self.white_var.get()
         
         # Update status
@@ -370,6 +367,13 @@ class GoGUI:
             for j in range(BOARD_SIZE):
                 self.buttons[i][j].config(image=self.bg_img)
         
+        for player_file in {self.black_var.get(), self.white_var.get()}:
+            if player_file in self.engines:
+                try:
+                    self.engines[player_file].new_game()
+                except EngineError:
+                    pass
+
         self.status_var.set("Game started!")
         self.turn_indicator.config(text="Black")
         
@@ -378,6 +382,13 @@ class GoGUI:
         else:
             self.status_var.set("Your turn (Black)")
 
+    def close(self):
+        # Stop the engine processes before the window goes, so none outlives the GUI
+        for engine in self.engines.values():
+            engine.close()
+        self.engines = {}
+        self.root.destroy()
+
     def export_log(self):
         with open("game_log.txt", "w") as f:
             for line in self.game_log:
@@ -0,0 +1,130 @@
+class MoveOrdering:
+    def __init__(self, n=5, killers=2, history=True, tactical=True):
+        """
+        Move ordering for alpha-beta search.
+
+        Moves are tried in this order: the hash move (best move of the transposition
+        table or the previous iteration), the tactical moves given by the caller
+        (captures, then atari escapes), the killer moves of the ply, then every other
+        move by history score. Killers are the last moves that caused a cutoff at the
+        same ply; the history table adds depth * depth to a move each time it causes a
+        cutoff anywhere in the tree. Ties keep the order of the move list.
+
+        Cutoff statistics are kept so the effect on the branching factor can be measured.
+
+        :param n: size of the board n*n.
+        :param killers: killer moves kept per ply, 0 disables them.
+        :param history: whether to order quiet moves by the history table.
+        :param tactical: whether to try the tactical moves early.
+        """
+        self.size = n
+        self.killer_slots = killers
+        self.use_history = history
+        self.use_tactical = tactical
+        self.history = [[0] * n for _ in range(n)]
+        self.killers = []
+        self.reset_stats()
+
+    def reset_stats(self):
+        '''
+        Clear the cutoff statistics.
+
+        :return: None.
+        '''
+        self.nodes = [] # Nodes searched at every ply
+        self.interior = 0 # Nodes whose moves were searched
+        self.cutoffs = 0 # Interior nodes that failed high
+        self.first_cutoffs = 0 # Of those, the ones where the first move caused the cutoff
+        self.moves_searched = 0 # Moves searched at interior nodes
+
+    def new_search(self):
+        '''
+        Forget the killers of the previous search and halve the history scores, so
+        that recent cutoffs weigh more than old ones.
+
+        :return: None.
+        '''
+        self.killers = []
+        for row in self.history:
+            for j in range(len(row)):
+                row[j] >>= 1
+
+    def order(self, moves, ply, hash_move=None, tactical=()):
+        '''
+        Sort moves so that the ones most likely to cause a cutoff come first.
+
+        :param moves: list of (row, column) moves.
+        :param ply: distance from the root, used for the killer moves.
+        :param hash_move: move to try first, or None.
+        :param tactical: moves to try right after the hash move, best first, without duplicates.
+        :return: new list of the same moves.
+        '''
+        rank = {}
+        if ply < len(self.killers):
+            for k, move in enumerate(self.killers[ply]):
+                rank[move] = (2, k)
+        if self.use_tactical:
+            for k, move in enumerate(tactical):
+                rank[move] = (1, k)
+        if hash_move is not None:
+            rank[hash_move] = (0, 0)
+        history = self.history if self.use_history else None
+        def key(move):
+            if move in rank:
+                return rank[move]
+            return 3, -history[move[0]][move[1]] if history else 0
+        return sorted(moves, key=key)
+
+    def count_node(self, ply):
+        '''
+        Count a node, called once at the entry of every node.
+
+        :param ply: distance from the root.
+        :return: None.
+        '''
+        while len(self.nodes) <= ply:
+            self.nodes.append(0)
+        self.nodes[ply] += 1
+
+    def update(self, move, ply, depth, searched, cutoff):
+        '''
+        Record the result of an interior node.
+
+        :param move: best move found, or None.
+        :param ply: distance from the root.
+        :param depth: remaining depth of the node.
+        :param searched: number of moves searched.
+        :param cutoff: whether move caused a beta cutoff.
+        :return: None.
+        '''
+        self.interior += 1
+        self.moves_searched += searched
+        if not cutoff or move is None:
+            return
+        self.cutoffs += 1
+        if searched == 1:
+            self.first_cutoffs += 1
+        if self.killer_slots:
+            while len(self.killers) <= ply:
+                self.killers.append([])
+            killers = self.killers[ply]
+            if move in killers:
+                killers.remove(move)
+            killers.insert(0, move)
+            del killers[self.killer_slots:]
+        self.history[move[0]][move[1]] += depth * depth
+
+    def first_cutoff_rate(self):
+        return self.first_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def branching_factor(self):
+        '''
+        Get the effective branching factor: the average number of moves searched per interior node.
+
+        :return: float.
+        '''
+        return self.moves_searched / self.interior if self.interior else 0.0
+
+    def stats(self):
+        return (f"first_cutoff={self.first_cutoff_rate():.1%} cutoffs={self.cutoffs} "
+                f"ebf={self.branching_factor():.2f} nodes_per_ply={self.nodes}")
@@ -0,0 +1,110 @@
+import os
+import sys
+import ast
+import importlib.util
+
+PLAYER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'players')
+DEFAULT_TIME_LIMIT = 7.0 # Seconds per move, safely under the 9s limit
+
+# In-process players by name: function (position, deadline) returning (row, column) or "PASS"
+_registry = {}
+
+def register(name, select_move=None):
+    '''
+    Register an in-process player. Works as a function or as a decorator:
+
+        @register("center_player")
+        def select_move(position, deadline):
+            return (2, 2) if position.board[2][2] == 0 else "PASS"
+
+    :param name: name the player is looked up by, e.g. its file name "greedy_player.py".
+    :param select_move: function (position, deadline) where position is a position.Position
+                        and deadline a time.time() value or None; it returns (row, column)
+                        or "PASS" and must not change the position.
+    :return: select_move, or the decorator when select_move is None.
+    '''
+    if select_move is None:
+        return lambda function: register(name, function)
+    _registry[name] = select_move
+    return select_move
+
+def time_limit(seconds=None):
+    '''
+    Seconds a player searches for one move: --time-limit, then the GO_TIME_LIMIT
+    environment variable, then DEFAULT_TIME_LIMIT.
+
+    :param seconds: value of --time-limit, or None.
+    :return: float.
+    '''
+    if seconds is not None:
+        return seconds
+    return float(os.environ.get('GO_TIME_LIMIT', DEFAULT_TIME_LIMIT))
+
+def move_deadline(start, seconds=None, deadline=None, safety=0.0):
+    '''
+    Time a search must stop by: time_limit(seconds) after start, and no later than
+    safety seconds before the deadline of the caller.
+
+    :param start: time.time() value the move started at.
+    :param seconds: value of --time-limit, or None.
+    :param deadline: time.time() value the caller wants the answer by, or None.
+    :param safety: seconds kept before deadline.
+    :return: time.time() value.
+    '''
+    budget = start + time_limit(seconds)
+    if deadline is not None:
+        budget = min(budget, deadline - safety)
+    return budget
+
+def moves_left(stones, n=5):
+    '''
+    Bound the moves left in a game of n*n - 1 moves: every stone on the board took
+    a move, so at most this many are left (fewer if there were passes).
+
+    :param stones: number of stones on the board.
+    :param n: size of the board n*n.
+    :return: int.
+    '''
+    return n * n - 1 - stones
+
+def registered_players():
+    return sorted(_registry)
+
+def defines_function(path, name):
+    '''
+    Check that a script defines a top-level function, without running it.
+
+    :param path: path of the script.
+    :param name: function name.
+    :return: boolean.
+    '''
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    return any(isinstance(node, ast.FunctionDef) and node.name == name for node in tree.body)
+
+def load_player(name, player_dir=PLAYER_DIR):
+    '''
+    Get the in-process entry point of a player, importing players/<name> the first
+    time if it defines select_move(position, deadline).
+
+    Script-only players (code at module level, like random_player.py) are never
+    imported, since importing them would play a move on input.txt; the caller runs
+    them as processes instead.
+
+    :param name: registered name or file name in player_dir.
+    :param player_dir: directory of the player scripts.
+    :return: select_move function, or None if the player can only run as a process.
+    '''
+    if name in _registry:
+        return _registry[name]
+    path = os.path.join(player_dir, name)
+    if not name.endswith('.py') or not os.path.isfile(path) or not defines_function(path, 'select_move'):
+        return None
+    # The players import each other's modules (read, host, ...) from the repository root
+    root = os.path.dirname(os.path.abspath(player_dir))
+    if root not in sys.path:
+        sys.path.append(root)
+    spec = importlib.util.spec_from_file_location(f"go_player_{name[:-3]}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return register(name, module.select_move)
@@ -20,6 +20,17 @@ def main():
     
     writeOutput(move if move != "PASS" else "PASS")
 
+def select_move(position, deadline=None):
+    """
+    In-process entry point (player_api.load_player)
+
+    :param position: position.Position to play
+    :param deadline: time.time() value to answer by, or None; TIME_LIMIT counts from start_time
+    :return: (i, j) or "PASS"
+    """
+    start_time = min(time.time(), deadline - TIME_LIMIT) if deadline is not None else time.time()
+    return find_aggressive_move(position.to_go(), position.piece_type, start_time)
+
 def find_aggressive_move(go, piece_type, start_time):
     board_size = len(go.board)
     opponent = 3 - piece_type
@@ -29,52 +40,34 @@ def find_aggressive_move(go, piece_type, start_time):
 
     for i in range(board_size):
         for j in range(board_size):
-            if not go.valid_place_check(i, j, piece_type, test_check=True):
+            if not go.make_move((i, j), piece_type):
                 continue
             valid_moves.append((i, j))
-            
-            test_go = go.copy_board()
-            test_go.place_chess(i, j, piece_type)
-            immediate = len(test_go.find_died_pieces(opponent))
-            test_go.remove_died_pieces(opponent)
+            immediate = len(go.died_pieces)
 
             # Opponent's best counter-move
             min_our_second_gain = float('inf')
             opponent_counter_limit = 5  # pruning
             second_response_limit = 5
 
-            counter_moves = [
-                (x, y) for x in range(board_size) for y in range(board_size)
-                if test_go.valid_place_check(x, y, opponent, test_check=True)
-            ][:opponent_counter_limit]
+            counter_moves = go.moves_from_mask(go.legal_moves(opponent))[:opponent_counter_limit]
 
             if not counter_moves:
                 total = immediate
             else:
                 for x2, y2 in counter_moves:
-                    resp_go = test_go.copy_board()
-                    resp_go.place_chess(x2, y2, opponent)
-                    resp_go.remove_died_pieces(piece_type)
-
-                    second_gain = 0
-                    for sx in range(board_size):
-                        for sy in range(board_size):
-                            if resp_go.valid_place_check(sx, sy, piece_type, test_check=True):
-                                sim = resp_go.copy_board()
-                                sim.place_chess(sx, sy, piece_type)
-                                captured = len(sim.find_died_pieces(opponent))
-                                second_gain = max(second_gain, captured)
-                                if second_gain > min_our_second_gain:
-                                    break
-                        if second_gain > min_our_second_gain:
-                            break
+                    go.make_move((x2, y2), opponent)
+
+                    second_gain = max(go.capture_counts(piece_type))
 
+                    go.undo_move()
                     min_our_second_gain = min(min_our_second_gain, second_gain)
                     if time.time() - start_time > TIME_LIMIT:
                         break
 
                 total = immediate + min_our_second_gain
 
+            go.undo_move()
             if total > max_total:
                 max_total = total
                 best_move = (i, j)
@@ -5,6 +5,15 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from read import readInput
 from write import writeOutput
 from host import GO
+from move_ordering import MoveOrdering
+from transposition import EXACT
+from shared_table import SharedTranspositionTable
+
+ordering = MoveOrdering(5) # Killer moves, history table and cutoff statistics of the search
+# Evaluations shared by every process and run through a memory-mapped table, when GO_SHARED_TT names one
+eval_cache = SharedTranspositionTable(os.environ['GO_SHARED_TT']) if os.environ.get('GO_SHARED_TT') else None
+# Keys of the evaluations of each side, apart from the positions my_player.py stores in the same file
+_eval_keys = [0] + [random.Random(563 + piece_type).getrandbits(64) for piece_type in (1, 2)]
 
 def main():
     # Read the input
@@ -23,6 +32,16 @@ def main():
     else:
         writeOutput(best_move)
 
+def select_move(position, deadline=None):
+    """
+    In-process entry point (player_api.load_player)
+
+    :param position: position.Position to play
+    :param deadline: time.time() value to answer by, unused: the search depth is fixed
+    :return: (i, j) or "PASS"
+    """
+    return find_minimax_move(position.to_go(), position.piece_type)
+
 def evaluate(go, piece_type):
     """
     Evaluate the board state from piece_type's perspective
@@ -80,6 +99,24 @@ def evaluate(go, piece_type):
     
     return score
 
+def cached_evaluate(go, piece_type):
+    """
+    Evaluate through eval_cache when there is one
+
+    :param go: GO game instance
+    :param piece_type: 1('X') or 2('O')
+    :return: score, as evaluate
+    """
+    if eval_cache is None:
+        return evaluate(go, piece_type)
+    key = go.board_hash ^ _eval_keys[piece_type]
+    entry = eval_cache.probe(key)
+    if entry is not None:
+        return entry[2]
+    score = evaluate(go, piece_type)
+    eval_cache.store(key, 0, EXACT, score, None)
+    return score
+
 def get_valid_moves(go, piece_type, limit=10):
     """
     Get valid moves for the given piece type, limited by the branching factor
@@ -87,41 +124,48 @@ def get_valid_moves(go, piece_type, limit=10):
     :param go: GO game instance
     :param piece_type: 1('X') or 2('O')
     :param limit: maximum number of moves to return (branching factor)
-    :return: list of (i, j) positions for valid moves
+    :return: (moves, captures): list of (i, j) positions for valid moves, and the
+             stones captured by every point as returned by go.capture_counts
     """
-    valid_moves = []
     board_size = len(go.board)
+    legal, captures = go.scan_moves(piece_type)
+    valid_moves = go.moves_from_mask(legal)
     
-    # First check for capturing moves
-    for i in range(board_size):
-        for j in range(board_size):
-            if go.valid_place_check(i, j, piece_type, test_check=True):
-                test_go = go.copy_board()
-                test_go.place_chess(i, j, piece_type)
-                
-                # Prioritize moves that capture opponent pieces
-                died_pieces = test_go.find_died_pieces(3 - piece_type)
-                if died_pieces:
-                    valid_moves.append((i, j, len(died_pieces)))
+    # First check for capturing moves, prioritizing moves that capture opponent pieces
+    capturing_moves = [move for move in valid_moves if captures[move[0] * board_size + move[1]]]
     
     # Sort by number of captures (descending)
-    capturing_moves = sorted(valid_moves, key=lambda x: x[2], reverse=True)
-    result = [(move[0], move[1]) for move in capturing_moves]
+    result = sorted(capturing_moves, key=lambda x: captures[x[0] * board_size + x[1]], reverse=True)
     
     # If we need more moves to reach the limit, add other valid moves
-    if len(result) < limit:
-        for i in range(board_size):
-            for j in range(board_size):
-                if go.valid_place_check(i, j, piece_type, test_check=True) and (i, j) not in result:
-                    result.append((i, j))
-                    if len(result) >= limit:
-                        break
-            if len(result) >= limit:
-                break
-    
-    return result[:limit]
+    for move in valid_moves:
+        if len(result) >= limit:
+            break
+        if move not in capturing_moves:
+            result.append(move)
+    
+    return result[:limit], captures
+
+def get_tactical_moves(go, piece_type, valid_moves, captures):
+    """
+    Get the moves to search first: captures (already first in valid_moves), then
+    the last liberty of every group of piece_type in atari.
+
+    :param go: GO game instance
+    :param piece_type: 1('X') or 2('O')
+    :param valid_moves: moves returned by get_valid_moves
+    :param captures: capture counts returned by get_valid_moves for the same node
+    :return: list of (i, j) positions
+    """
+    board_size = len(go.board)
+    tactical = [move for move in valid_moves if captures[move[0] * board_size + move[1]]]
+    for group in go.atari_groups(piece_type):
+        escape = next(iter(group.liberties))
+        if escape in valid_moves and escape not in tactical:
+            tactical.append(escape)
+    return tactical
 
-def minimax(go, piece_type, depth, alpha, beta, maximizing):
+def minimax(go, piece_type, depth, alpha, beta, maximizing, ply=0):
     """
     Minimax algorithm with alpha-beta pruning
     
@@ -131,35 +175,39 @@ def minimax(go, piece_type, depth, alpha, beta, maximizing):
     :param alpha: alpha value for pruning
     :param beta: beta value for pruning
     :param maximizing: whether this is a maximizing step
+    :param ply: distance from the root, used by the killer moves
     :return: (score, move) tuple
     """
     opponent = 3 - piece_type
+    ordering.count_node(ply)
     
     # Terminal node or maximum depth reached
     if depth == 0:
-        return evaluate(go, piece_type), None
+        return cached_evaluate(go, piece_type), None
     
     current_player = piece_type if maximizing else opponent
-    valid_moves = get_valid_moves(go, current_player)
+    valid_moves, captures = get_valid_moves(go, current_player)
     
     # No valid moves, player must pass
     if not valid_moves:
         # Evaluate if we're at max depth or make recursive call
         if depth <= 1:
-            return evaluate(go, piece_type), "PASS"
-        new_go = go.copy_board()
-        score, _ = minimax(new_go, piece_type, depth - 1, alpha, beta, not maximizing)
+            return cached_evaluate(go, piece_type), "PASS"
+        score, _ = minimax(go, piece_type, depth - 1, alpha, beta, not maximizing, ply + 1)
         return score, "PASS"
     
     best_move = None
+    searched = 0
+    tactical = get_tactical_moves(go, current_player, valid_moves, captures) if ordering.use_tactical else ()
+    valid_moves = ordering.order(valid_moves, ply, tactical=tactical)
     
     if maximizing:
         max_eval = float('-inf')
         for i, j in valid_moves:
-            new_go = go.copy_board()
-            if new_go.place_chess(i, j, current_player):
-                new_go.remove_died_pieces(opponent)
-                eval_score, _ = minimax(new_go, piece_type, depth - 1, alpha, beta, False)
+            if go.make_move((i, j), current_player):
+                eval_score, _ = minimax(go, piece_type, depth - 1, alpha, beta, False, ply + 1)
+                go.undo_move()
+                searched += 1
                 
                 if eval_score > max_eval:
                     max_eval = eval_score
@@ -169,14 +217,15 @@ def minimax(go, piece_type, depth, alpha, beta, maximizing):
                 if beta <= alpha:
                     break  # Beta cutoff
         
+        ordering.update(best_move, ply, depth, searched, beta <= alpha)
         return max_eval, best_move
     else:
         min_eval = float('inf')
         for i, j in valid_moves:
-            new_go = go.copy_board()
-            if new_go.place_chess(i, j, current_player):
-                new_go.remove_died_pieces(piece_type)
-                eval_score, _ = minimax(new_go, piece_type, depth - 1, alpha, beta, True)
+            if go.make_move((i, j), current_player):
+                eval_score, _ = minimax(go, piece_type, depth - 1, alpha, beta, True, ply + 1)
+                go.undo_move()
+                searched += 1
                 
                 if eval_score < min_eval:
                     min_eval = eval_score
@@ -186,6 +235,7 @@ def minimax(go, piece_type, depth, alpha, beta, maximizing):
                 if beta <= alpha:
                     break  # Alpha cutoff
         
+        ordering.update(best_move, ply, depth, searched, beta <= alpha)
         return min_eval, best_move
 
 def find_minimax_move(go, piece_type):
@@ -196,12 +246,13 @@ def find_minimax_move(go, piece_type):
     :param piece_type: 1('X') or 2('O')
     :return: (i, j) or "PASS" if no valid moves
     """
-    valid_moves = get_valid_moves(go, piece_type)
+    valid_moves, _ = get_valid_moves(go, piece_type)
     
     if not valid_moves:
         return "PASS"
     
     # Use minimax with depth=2 (looking ahead 2 moves)
+    ordering.new_search()
     _, best_move = minimax(go, piece_type, 2, float('-inf'), float('inf'), True)
     
     return best_move if best_move else random.choice(valid_moves)
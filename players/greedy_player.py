@@ -23,6 +23,16 @@ def main():
     else:
         writeOutput(best_move)
 
+def select_move(position, deadline=None):
+    """
+    In-process entry point (player_api.load_player)
+
+    :param position: position.Position to play
+    :param deadline: time.time() value to answer by, unused
+    :return: (i, j) or "PASS"
+    """
+    return find_greedy_move(position.to_go(), position.piece_type)
+
 def find_greedy_move(go, piece_type):
     """
     Find the move that captures the maximum number of opponent stones
@@ -31,28 +41,17 @@ def find_greedy_move(go, piece_type):
     :param piece_type: 1('X') or 2('O')
     :return: (i, j) or "PASS" if no valid moves
     """
-    valid_moves = []
     best_move = None
     max_capture = -1
     board_size = len(go.board)
     
-    # Try each position on the board
-    for i in range(board_size):
-        for j in range(board_size):
-            # Check if the move is valid
-            if go.valid_place_check(i, j, piece_type, test_check=True):
-                # Copy the GO instance to test this move
-                test_go = go.copy_board()
-                test_go.place_chess(i, j, piece_type)
-                
-                # Count how many opponent pieces would be captured
-                died_pieces = test_go.find_died_pieces(3 - piece_type)
-                captures = len(died_pieces)
-                
-                valid_moves.append((i, j))
-                if captures > max_capture:
-                    max_capture = captures
-                    best_move = (i, j)
+    # Find the valid positions and how many opponent pieces each would capture
+    legal, captures = go.scan_moves(piece_type)
+    valid_moves = go.moves_from_mask(legal)
+    for i, j in valid_moves:
+        if captures[i * board_size + j] > max_capture:
+            max_capture = captures[i * board_size + j]
+            best_move = (i, j)
     
     if best_move and max_capture > 0:
         return best_move
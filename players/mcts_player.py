@@ -0,0 +1,380 @@
+import sys
+import os
+import math
+import time
+import random
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from read import readInput
+from write import writeOutput
+from bitboard import board_masks
+from position import Position
+from player_api import DEFAULT_TIME_LIMIT, move_deadline, moves_left
+
+BOARD_SIZE = 5
+AREA = BOARD_SIZE * BOARD_SIZE
+PASS = AREA # Move index of a pass; point moves are i * n + j as in bitboard.py
+KOMI = BOARD_SIZE / 2
+SAFETY = 0.3 # Seconds kept before the caller's deadline
+RAVE_EQUIVALENCE = 500 # Visits of a move at which its AMAF value has weight 1/2
+EXPLORATION = 0.3 # UCT exploration constant
+
+FULL, NOT_FIRST_COL, NOT_LAST_COL, NEIGHBORS = board_masks(BOARD_SIZE)
+NEIGHBOR_POINTS = [tuple(q for q in range(AREA) if NEIGHBORS[p] >> q & 1) for p in range(AREA)]
+# Points of each 5-bit chunk of a mask, so that listing the points of a mask takes 5 lookups
+_chunk_points = [[tuple(k * BOARD_SIZE + j for j in range(BOARD_SIZE) if chunk >> j & 1) for chunk in range(32)]
+                 for k in range(BOARD_SIZE)]
+
+TABLE_VISITS = 4096
+# Exploration factor 1 / sqrt(n + 1) and RAVE weight sqrt(k / (3n + k)) of a child with n visits, below TABLE_VISITS
+_exploration = [1 / math.sqrt(n + 1) for n in range(TABLE_VISITS)]
+_beta = [math.sqrt(RAVE_EQUIVALENCE / (3 * n + RAVE_EQUIVALENCE)) for n in range(TABLE_VISITS)]
+
+_root = None # Search tree of the last move, kept between moves in a persistent process
+last_stats = {} # Statistics of the last search
+
+def points(mask):
+    c = _chunk_points
+    return c[0][mask & 31] + c[1][mask >> 5 & 31] + c[2][mask >> 10 & 31] + c[3][mask >> 15 & 31] + c[4][mask >> 20]
+
+def group_mask(p, stones):
+    group = 1 << p
+    while True:
+        grown = (group | (group << 1 & NOT_FIRST_COL) | (group >> 1 & NOT_LAST_COL)
+                 | (group << BOARD_SIZE & FULL) | group >> BOARD_SIZE) & stones
+        if grown == group:
+            return group
+        group = grown
+
+def liberties(group, empty):
+    return (group << 1 & NOT_FIRST_COL | group >> 1 & NOT_LAST_COL | group << BOARD_SIZE | group >> BOARD_SIZE) & empty
+
+def play(own, opponent, ko, p):
+    '''
+    Play a stone on two colour masks without building any board.
+
+    :param own: mask of the stones of the side to move.
+    :param opponent: mask of the other stones.
+    :param ko: point the side to move may not play because of the KO rule, -1 if none.
+    :param p: empty point i * n + j.
+    :return: (own, opponent, ko) after the move, or None if the move is illegal.
+    '''
+    if p == ko:
+        return None
+    own |= 1 << p
+    empty = FULL & ~(own | opponent)
+    captured = 0
+    for q in NEIGHBOR_POINTS[p]:
+        if opponent >> q & 1 and not captured >> q & 1 and not NEIGHBORS[q] & empty:
+            group = group_mask(q, opponent)
+            if not liberties(group, empty):
+                captured |= group
+    if captured:
+        opponent &= ~captured
+        # Retaking a single stone that just captured a single stone would repeat the previous board
+        if not captured & (captured - 1) and not NEIGHBORS[p] & own and NEIGHBORS[p] & ~opponent == captured:
+            return own, opponent, captured.bit_length() - 1
+        return own, opponent, -1
+    if not NEIGHBORS[p] & empty and not liberties(group_mask(p, own), empty):
+        return None
+    return own, opponent, -1
+
+def atari_move(own, opponent, ko, last):
+    '''
+    Answer the last move of the opponent: capture its group if it is in atari,
+    otherwise save a group of ours next to it that it put in atari.
+
+    :param last: point of the last move.
+    :return: (p, (own, opponent, ko) after the move), or None.
+    '''
+    empty = FULL & ~(own | opponent)
+    libs = liberties(group_mask(last, opponent), empty)
+    if not libs & (libs - 1):
+        p = libs.bit_length() - 1
+        result = play(own, opponent, ko, p)
+        if result is not None:
+            return p, result
+    for q in NEIGHBOR_POINTS[last]:
+        if own >> q & 1:
+            libs = liberties(group_mask(q, own), empty)
+            if not libs & (libs - 1):
+                p = libs.bit_length() - 1
+                result = play(own, opponent, ko, p)
+                # Extending only helps when the group gets out of atari
+                if result is not None:
+                    after = liberties(group_mask(p, result[0]), FULL & ~(result[0] | result[1]))
+                    if after & (after - 1):
+                        return p, result
+    return None
+
+def playout(black, white, to_move, ko, passed, moves_left, last, rng):
+    '''
+    Finish a game on colour masks only: each move answers an atari made by the
+    last move (atari_move), otherwise it is a random legal move that does not
+    fill the player's own single-point eye.
+
+    :param last: point of the move that reached this position, -1 after a pass or at the root.
+    :return: (winner, black_moves, white_moves): the winner 1('X') or 2('O') by stones
+             and komi, and masks of the points each colour played first.
+    '''
+    random = rng.random
+    seen = black_moves = white_moves = 0
+    while moves_left > 0:
+        own, opponent = (black, white) if to_move == 1 else (white, black)
+        result = atari_move(own, opponent, ko, last) if last >= 0 else None
+        if result is not None:
+            p, result = result
+            n = 0
+        else:
+            candidates = list(points(FULL & ~(own | opponent)))
+            n = len(candidates)
+        while n:
+            r = int(random() * n)
+            p = candidates[r]
+            if NEIGHBORS[p] & ~own:
+                result = play(own, opponent, ko, p)
+                if result is not None:
+                    break
+            n -= 1
+            candidates[r] = candidates[n]
+        if result is None:
+            if passed:
+                break
+            passed = True
+            ko = last = -1
+        else:
+            own, opponent, ko = result
+            passed = False
+            last = p
+            bit = 1 << p
+            if not seen & bit:
+                seen |= bit
+                if to_move == 1:
+                    black_moves |= bit
+                else:
+                    white_moves |= bit
+            black, white = (own, opponent) if to_move == 1 else (opponent, own)
+        to_move = 3 - to_move
+        moves_left -= 1
+    winner = 1 if black.bit_count() > white.bit_count() + KOMI else 2
+    return winner, black_moves, white_moves
+
+class Node:
+    __slots__ = ('move', 'to_move', 'black', 'white', 'ko', 'passed', 'moves_left', 'children',
+                 'visits', 'wins', 'amaf_visits', 'amaf_wins')
+
+    def __init__(self, move, to_move, black, white, ko, passed, moves_left):
+        """
+        Position of the search tree with its UCT and AMAF (all moves as first)
+        statistics. wins count the playouts won by the player who played move.
+
+        :param move: point index or PASS played to reach the node, None at the root.
+        :param to_move: 1('X') or 2('O') to move.
+        :param black: mask of 'X' stones.
+        :param white: mask of 'O' stones.
+        :param ko: point to_move may not play because of the KO rule, -1 if none.
+        :param passed: whether move is a pass, so that another pass ends the game.
+        :param moves_left: moves left before the move limit ends the game.
+        """
+        self.move = move
+        self.to_move = to_move
+        self.black = black
+        self.white = white
+        self.ko = ko
+        self.passed = passed
+        self.moves_left = moves_left
+        self.children = None
+        self.visits = 0
+        self.wins = 0
+        self.amaf_visits = 0
+        self.amaf_wins = 0
+
+    def expand(self):
+        '''
+        Create a child for every legal move and the pass. A node at the end of the game gets none.
+
+        :return: None.
+        '''
+        self.children = []
+        if self.moves_left <= 0:
+            return
+        to_move, other = self.to_move, 3 - self.to_move
+        own, opponent = (self.black, self.white) if to_move == 1 else (self.white, self.black)
+        for p in points(FULL & ~(own | opponent)):
+            result = play(own, opponent, self.ko, p)
+            if result is not None:
+                own_after, opponent_after, ko = result
+                black, white = (own_after, opponent_after) if to_move == 1 else (opponent_after, own_after)
+                self.children.append(Node(p, other, black, white, ko, False, self.moves_left - 1))
+        # A pass after a pass ends the game: that child has no moves left and is scored as it is
+        self.children.append(Node(PASS, other, self.black, self.white, -1, True,
+                                  0 if self.passed else self.moves_left - 1))
+
+    def select(self):
+        '''
+        Pick the child with the best UCT-RAVE value: the playout win rate blended
+        with the AMAF win rate, which dominates while the child has few visits,
+        plus an exploration term.
+
+        :return: Node.
+        '''
+        exploration = EXPLORATION * math.sqrt(math.log(self.visits + 1))
+        best, best_value = None, -1.0
+        for child in self.children:
+            visits = child.visits
+            if visits < TABLE_VISITS:
+                beta, factor = _beta[visits], _exploration[visits]
+            else:
+                beta, factor = math.sqrt(RAVE_EQUIVALENCE / (3 * visits + RAVE_EQUIVALENCE)), 1 / math.sqrt(visits + 1)
+            if child.amaf_visits:
+                amaf = child.amaf_wins / child.amaf_visits
+                value = beta * amaf + (1 - beta) * child.wins / visits if visits else amaf
+            else:
+                value = child.wins / visits if visits else 1.0
+            value += exploration * factor
+            if value > best_value:
+                best, best_value = child, value
+        return best
+
+    def find(self, black, white, to_move, ko, depth=2):
+        '''
+        Find a position in the subtree, to reuse its statistics on the next move.
+
+        :param depth: plies searched below this node.
+        :return: Node or None.
+        '''
+        if (self.black, self.white, self.to_move, self.ko) == (black, white, to_move, ko):
+            return self
+        if depth == 0 or not self.children:
+            return None
+        for child in self.children:
+            if child.visits:
+                node = child.find(black, white, to_move, ko, depth - 1)
+                if node is not None:
+                    return node
+        return None
+
+def search(root, deadline=None, max_playouts=None, rng=random):
+    '''
+    Run MCTS playouts from root until the deadline or the playout limit.
+
+    :return: number of playouts run.
+    '''
+    playouts = 0
+    while max_playouts is None or playouts < max_playouts:
+        if deadline is not None and playouts % 64 == 0 and time.time() > deadline:
+            break
+        node = root
+        path = [root]
+        while node.children:
+            node = node.select()
+            path.append(node)
+        if node.children is None and (node.visits or node is root):
+            node.expand()
+            if node.children:
+                node = node.select()
+                path.append(node)
+        last = -1 if node.move is None or node.move == PASS else node.move
+        winner, black_moves, white_moves = playout(node.black, node.white, node.to_move, node.ko, node.passed,
+                                                   node.moves_left, last, rng)
+
+        # Back up the result; moves played later by the side to move of a node count as AMAF samples of its children
+        for node in reversed(path):
+            node.visits += 1
+            if winner != node.to_move:
+                node.wins += 1
+            if node.children:
+                first = black_moves if node.to_move == 1 else white_moves
+                won = winner == node.to_move
+                for child in node.children:
+                    if child.move != PASS and first >> child.move & 1:
+                        child.amaf_visits += 1
+                        if won:
+                            child.amaf_wins += 1
+            if node.move is not None and node.move != PASS:
+                # The move was played before every move already recorded, so it is its colour's first play
+                bit = 1 << node.move
+                if node.to_move == 2:
+                    black_moves |= bit
+                    white_moves &= ~bit
+                else:
+                    white_moves |= bit
+                    black_moves &= ~bit
+        playouts += 1
+    return playouts
+
+def get_root(position, reuse=True):
+    '''
+    Get the search tree of a position: the subtree of the previous search when
+    the position is one or two plies below its root, otherwise a new tree.
+
+    :return: Node.
+    '''
+    global _root
+    black, white = position.stones & FULL, position.stones >> AREA
+    ko = position.ko
+    ko = -1 if ko is None else ko[0] * BOARD_SIZE + ko[1]
+    node = _root.find(black, white, position.piece_type, ko) if reuse and _root is not None else None
+    if node is None:
+        node = Node(None, position.piece_type, black, white, ko, position.previous == position.stones,
+                    moves_left(black.bit_count() + white.bit_count(), BOARD_SIZE))
+    node.move = None
+    _root = node
+    return node
+
+def find_mcts_move(position, deadline=None, max_playouts=None, reuse=True, rng=random):
+    '''
+    Search a position and pick the most visited move.
+
+    :return: (i, j) or "PASS".
+    '''
+    start = time.time()
+    root = get_root(position, reuse)
+    reused = root.visits
+    playouts = search(root, deadline, max_playouts, rng)
+    elapsed = time.time() - start
+    last_stats.update(playouts=playouts, reused=reused, seconds=elapsed,
+                      playouts_per_second=playouts / elapsed if elapsed else 0.0)
+    if not root.children:
+        return "PASS"
+    best = max(root.children, key=lambda child: (child.visits, child.wins))
+    last_stats.update(win_rate=best.wins / best.visits if best.visits else 0.0)
+    return "PASS" if best.move == PASS else divmod(best.move, BOARD_SIZE)
+
+def select_move(position, deadline=None):
+    """
+    In-process entry point (player_api.load_player). The search tree is kept
+    between calls, so successive moves of a game reuse it.
+
+    :param position: position.Position to play
+    :param deadline: time.time() value to answer by, or None
+    :return: (i, j) or "PASS"
+    """
+    return find_mcts_move(position, move_deadline(time.time(), deadline=deadline, safety=SAFETY))
+
+def new_game():
+    # Called by the engine shim on clear_board: the tree of the last game is never reused
+    global _root
+    _root = None
+
+def main():
+    start = time.time()
+    parser = argparse.ArgumentParser(description='Monte Carlo tree search player with UCT and RAVE')
+    parser.add_argument('--time-limit', type=float, help=f'Seconds per move (default: $GO_TIME_LIMIT or {DEFAULT_TIME_LIMIT})')
+    parser.add_argument('--playouts', type=int, help='Run exactly this many playouts instead of using the time limit')
+    parser.add_argument('--seed', type=int, help='Random seed of the playouts')
+    parser.add_argument('--stats', action='store_true', help='Print search statistics to stderr')
+    args = parser.parse_args()
+
+    piece_type, previous_board, board = readInput(5)
+    position = Position.from_input(piece_type, previous_board, board)
+    deadline = None if args.playouts is not None else move_deadline(start, args.time_limit)
+    rng = random.Random(args.seed) if args.seed is not None else random
+    move = find_mcts_move(position, deadline, args.playouts, rng=rng)
+    if args.stats:
+        print(' '.join(f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+                       for key, value in last_stats.items()), file=sys.stderr)
+    writeOutput(move)
+
+if __name__ == "__main__":
+    main()
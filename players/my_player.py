@@ -1,33 +1,56 @@
 #import host
-import numpy as np
+import sys
+import os
+import random
+import argparse
 import time
-
-#Input
-with open('input.txt') as f:
-    lines = f.readlines()
-
-# Parse player number 
-playerNumber = int(lines[0])
-
-# Use numpy to convert to array directly 
-previous_board = np.array([list(line.rstrip()) for line in lines[1:6]], dtype=int)
-current_board = np.array([list(line.rstrip()) for line in lines[6:11]], dtype=int)
-
-# Convert to list of lists if needed
-previousBoard = previous_board.tolist() 
-currentBoard = current_board.tolist()
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from read import readInput
+from write import writeOutput
+from host import zobrist_table, neighbor_table
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+from shared_table import SharedTranspositionTable
+from move_ordering import MoveOrdering
+from book import OpeningBook
+from position import Position
+from tablebase import Tablebase
+from player_api import DEFAULT_TIME_LIMIT, move_deadline, moves_left
+from symmetry import SYMMETRIES, symmetry_table, symmetric_zobrist, pack_keys, unpack_keys, inverse_symmetry, transform_move
 
 _komi = 2.5 #Seting komi for white player
-_yourPlayer = playerNumber
-_maxDepth = 5 #Seting max depth for Min-Max algorithm
+_yourPlayer = 1 #Set from input.txt in main()
+_maxDepth = 5 #Seting max depth for Min-Max algorithm, raised by iterative deepening
+_tt = TranspositionTable(0) #Transposition table, sized in main()
+_ttConfig = (0, None) #Size and shared file of _tt, kept between moves when main() runs in a persistent engine.py process
+_ordering = MoveOrdering(5) #Killer moves, history table and cutoff statistics
+_useSymmetry = True #Key the transposition table on the canonical form of the 8 symmetric boards
+_nodes = 0 #Number of nodes searched
+_completedPlies = 0 #Plies of the last completed iteration, SOLVED_DEPTH if the tree was solved
+_deadline = None #time.time() at which the search must stop
+_horizonCount = 0 #Number of nodes cut off by the depth limit
+
+SOLVED_DEPTH = 99 #Stored depth of positions searched without reaching the depth limit
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'book.bin') #Written by build_book.py
+TABLEBASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tablebase.bin') #Written by tablebase.py
+
+class SearchTimeout(Exception):
+    pass
+
+_neighbors = neighbor_table(5)
+_zobrist, _zobristSide = zobrist_table(5)
+_koRandom = random.Random(562)
+_koKeys = [[_koRandom.getrandbits(64) for _ in range(5)] for _ in range(5)]
+_perspectiveKey = _koRandom.getrandbits(64) #Scores are for _yourPlayer, so its positions are keyed apart
+_symZobrist = symmetric_zobrist(5)
+_symKoKeys = [[pack_keys(_koKeys[x][y] for x, y in (symmetry_table(5)[t][i][j] for t in range(SYMMETRIES)))
+               for j in range(5)] for i in range(5)]
+_symSide = pack_keys([_zobristSide] * SYMMETRIES)
 
 def countOccurrences(matrix, target):
-    matrix_array = np.array(matrix)
-    return np.sum(matrix_array == target)
+    return sum(row.count(target) for row in matrix)
 
 def getAllAvailableMoves(board):
-    open = np.where(np.array(board) == 0)
-    return list(zip(open[0], open[1]))
+    return [(i, j) for i in range(len(board)) for j in range(len(board[0])) if board[i][j] == 0]
 
 def removeLongJumpMoves(availableMoves, currentBoard, playerNumber):
     deltas = ([0, 1], [1, 0], [0, -1], [-1, 0],  
@@ -46,49 +69,77 @@ def removeLongJumpMoves(availableMoves, currentBoard, playerNumber):
             
     return availableMoves
 
-def removeCapturedPieces(board, opponentNumber):
-    new_board = [row[:] for row in board]
-    to_check = set()
-    for i in range(len(board)):
-        for j in range(len(board[0])):
-            if board[i][j] == opponentNumber:
-                deltas = ([0, 1], [1, 0], [0, -1], [-1, 0])
-                # check if any of the surrounding cells is 0
-                for dx, dy in deltas:
-                    if 0 <= i+dx < len(board) and 0 <= j+dy < len(board[0]) and board[i+dx][j+dy] == 0:
-                        new_board[i][j] = "r"
-                        to_check.add((i, j))
-                        break
-                else:
-                    new_board[i][j] = "g"
-                    to_check.add((i, j))
-
-    while to_check:
-        tempBoard = [row[:] for row in new_board]
-        to_check_next = set()
-        for i, j in to_check:
-            if new_board[i][j] == "g":
-                deltas = ([0, 1], [1, 0], [0, -1], [-1, 0])
-                # check if any of the surrounding cells is "r"
-                for dx, dy in deltas:
-                    if 0 <= i+dx < len(board) and 0 <= j+dy < len(board[0]) and new_board[i+dx][j+dy] == "r":
-                        new_board[i][j] = "r"
-                        to_check_next.add((i, j))
-                        break
-                else:
-                    to_check_next.add((i, j))
-        if tempBoard == new_board:
-            break
-        to_check = to_check_next
-
-    for i in range(len(board)):
-        for j in range(len(board[0])):
-            if new_board[i][j] == "g":
-                new_board[i][j] = 0
-            elif new_board[i][j] == "r":
-                new_board[i][j] = opponentNumber
-
-    return new_board
+def getGroup(board, point):
+    # Flood fill the group of the stone at point. Returns (group, hasLiberty) and stops
+    # as soon as a liberty is found, so the group is only complete when it has none.
+    color = board[point[0]][point[1]]
+    group = {point}
+    stack = [point]
+    while stack:
+        i, j = stack.pop()
+        for x, y in _neighbors[i][j]:
+            if board[x][y] == 0:
+                return group, True
+            if board[x][y] == color and (x, y) not in group:
+                group.add((x, y))
+                stack.append((x, y))
+    return group, False
+
+def findCapturedPieces(board, move, opponentNumber):
+    # Only the opponent groups touching the just-played point can lose their last liberty
+    captured = set()
+    for x, y in _neighbors[move[0]][move[1]]:
+        if board[x][y] == opponentNumber and (x, y) not in captured:
+            group, hasLiberty = getGroup(board, (x, y))
+            if not hasLiberty:
+                captured |= group
+    return captured
+
+def removeCapturedPieces(board, move, opponentNumber):
+    # Remove the opponent stones captured by the stone just played at move, in place
+    captured = findCapturedPieces(board, move, opponentNumber)
+    for i, j in captured:
+        board[i][j] = 0
+    return captured
+
+def getLiberties(board, point):
+    # Flood fill the whole group of the stone at point and collect its liberties
+    color = board[point[0]][point[1]]
+    group = {point}
+    liberties = set()
+    stack = [point]
+    while stack:
+        i, j = stack.pop()
+        for x, y in _neighbors[i][j]:
+            if board[x][y] == 0:
+                liberties.add((x, y))
+            elif board[x][y] == color and (x, y) not in group:
+                group.add((x, y))
+                stack.append((x, y))
+    return group, liberties
+
+def getTacticalMoves(currentBoard, availableMoves, playerNumber):
+    # Captures, most stones first, then the last liberty of our groups in atari.
+    # A move captures exactly the opponent groups whose last liberty it fills.
+    captures = {}
+    escapes = []
+    seen = set()
+    for i in range(len(currentBoard)):
+        for j in range(len(currentBoard[0])):
+            if currentBoard[i][j] != 0 and (i, j) not in seen:
+                group, liberties = getLiberties(currentBoard, (i, j))
+                seen |= group
+                if len(liberties) == 1:
+                    point = next(iter(liberties))
+                    if currentBoard[i][j] == playerNumber:
+                        escapes.append(point)
+                    else:
+                        captures[point] = captures.get(point, 0) + len(group)
+    tacticalMoves = [move for move in sorted(captures, key=lambda move: -captures[move]) if move in availableMoves]
+    for move in escapes:
+        if move in availableMoves and move not in tacticalMoves:
+            tacticalMoves.append(move)
+    return tacticalMoves
 
 def getLibertyMoves(currentBoard, availableMoves, playerNumber):
     libertyMoves = []
@@ -96,15 +147,17 @@ def getLibertyMoves(currentBoard, availableMoves, playerNumber):
         tempBoard = [row[:] for row in currentBoard]
         tempBoard[move[0]][move[1]] = playerNumber
 
-        if tempBoard != removeCapturedPieces(tempBoard, (playerNumber%2)+1):
+        if findCapturedPieces(tempBoard, move, (playerNumber%2)+1):
             libertyMoves.append(move)
     
     return libertyMoves
 
 def removeKOMoves(libertyMoves, previousBoard, availableMoves, playerNumber):
-    for move in libertyMoves:
+    for move in libertyMoves[:]:
         if previousBoard[move[0]][move[1]] == playerNumber:
-            availableMoves.remove(move)
+            # removeLongJumpMoves may already have dropped it
+            if move in availableMoves:
+                availableMoves.remove(move)
             libertyMoves.remove(move)
     return availableMoves
 
@@ -115,15 +168,15 @@ def removeSuicideMoves(currentBoard, availableMoves, libertyMoves, playerNumber)
             #check if this move kills our player
             tempBoard = [row[:] for row in currentBoard]
             tempBoard[move[0]][move[1]] = playerNumber
-            if tempBoard == removeCapturedPieces(tempBoard, playerNumber):
+            if getGroup(tempBoard, move)[1]:
                 newMovesAfterSuicide.append(move)
         else:
             newMovesAfterSuicide.append(move)
     return newMovesAfterSuicide     
 
-def getAvailableMoves(currentBoard, previousBoard, playerNumber, count):
-    #Getting all available moves
-    availableMoves = getAllAvailableMoves(currentBoard)
+def getAvailableMoves(currentBoard, previousBoard, playerNumber, count, emptyPoints=None):
+    #Getting all available moves, from the empty points kept by the search when given
+    availableMoves = getAllAvailableMoves(currentBoard) if emptyPoints is None else list(emptyPoints)
     # print("[INFO] Available moves: ")
     # print(availableMoves, end="\n\n")
 
@@ -157,22 +210,111 @@ def evaluateBoard(whitePoints, blackPoints, numAvailableMoves):
     else:
         return (blackPoints-(whitePoints+_komi))*0.8 + numAvailableMoves*0.2
 
-def getMaxMove(currentBoard, previousBoard, playerNumber, depth, alpha, beta):
-    whitePoints = countOccurrences(currentBoard, 1)
-    blackPoints = countOccurrences(currentBoard, 2)
-    availableMoves = getAvailableMoves(currentBoard.copy(), previousBoard.copy(), playerNumber, whitePoints+blackPoints)
+def getPositionKey(currentBoard, previousBoard, playerNumber):
+    # Zobrist hash of the stones, the side to move and the KO state. removeKOMoves looks at
+    # the empty points that held our stone on the previous board, so those are hashed too.
+    key = _zobristSide if playerNumber == 2 else 0
+    for i in range(len(currentBoard)):
+        for j in range(len(currentBoard[0])):
+            if currentBoard[i][j] != 0:
+                key ^= _zobrist[currentBoard[i][j]][i][j]
+            elif previousBoard[i][j] == playerNumber:
+                key ^= _koKeys[i][j]
+    return key
+
+def getCanonicalKey(currentBoard, previousBoard, playerNumber):
+    # Position key of the smallest of the 8 symmetric copies of the position, and the
+    # symmetry that maps this board onto that copy. Stored moves are in the copy's frame.
+    perspective = _perspectiveKey if _yourPlayer == 2 else 0
+    if not _useSymmetry:
+        return getPositionKey(currentBoard, previousBoard, playerNumber) ^ perspective, 0
+    packed = _symSide if playerNumber == 2 else 0
+    for i in range(len(currentBoard)):
+        for j in range(len(currentBoard[0])):
+            if currentBoard[i][j] != 0:
+                packed ^= _symZobrist[currentBoard[i][j]][i][j]
+            elif previousBoard[i][j] == playerNumber:
+                packed ^= _symKoKeys[i][j]
+    keys = unpack_keys(packed)
+    key = min(keys)
+    return key ^ perspective, keys.index(key)
+
+def probeTable(key, symmetry, depth, alpha, beta):
+    # Returns (score, move) when the stored bound settles this node, else (None, ttMove)
+    global _horizonCount
+    entry = _tt.probe(key)
+    if entry is None:
+        return None, None
+    entryDepth, flag, score, move = entry
+    move = transform_move(move, inverse_symmetry(symmetry), 5)
+    if entryDepth >= _maxDepth - depth:
+        if flag == LOWER:
+            alpha = max(alpha, score)
+        elif flag == UPPER:
+            beta = min(beta, score)
+        if flag == EXACT or alpha >= beta:
+            if entryDepth < SOLVED_DEPTH:
+                _horizonCount += 1
+            return score, move
+    return None, move
+
+def storeTable(key, symmetry, depth, alpha, beta, score, move, horizonCount):
+    # A subtree that never reached the depth limit is solved for every deeper iteration
+    searched = SOLVED_DEPTH if _horizonCount == horizonCount else _maxDepth - depth
+    if score <= alpha:
+        flag = UPPER
+    elif score >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    _tt.store(key, searched, flag, score, transform_move(move, symmetry, 5))
+
+def playMove(currentBoard, move, playerNumber, points, emptyPoints):
+    # Returns the next board, stone counts (X, O) and sorted empty points after playerNumber plays move
+    opponentNumber = playerNumber % 2 + 1
+    nextBoard = [row[:] for row in currentBoard]
+    nextBoard[move[0]][move[1]] = playerNumber
+    captured = removeCapturedPieces(nextBoard, move, opponentNumber)
+    nextEmptyPoints = [point for point in emptyPoints if point != move]
+    if captured:
+        nextEmptyPoints = sorted(nextEmptyPoints + list(captured))
+    nextPoints = list(points)
+    nextPoints[playerNumber - 1] += 1
+    nextPoints[opponentNumber - 1] -= len(captured)
+    return nextBoard, nextPoints, nextEmptyPoints
+
+def getMaxMove(currentBoard, previousBoard, playerNumber, depth, alpha, beta, points, emptyPoints):
+    global _nodes, _horizonCount
+    _nodes += 1
+    if _deadline is not None and time.time() > _deadline:
+        raise SearchTimeout()
+    _ordering.count_node(depth - 1)
+    key, symmetry = getCanonicalKey(currentBoard, previousBoard, playerNumber)
+    score, ttMove = probeTable(key, symmetry, depth, alpha, beta)
+    if score is not None:
+        return score, ttMove
+    horizonCount = _horizonCount
+
+    whitePoints, blackPoints = points
+    availableMoves = getAvailableMoves(currentBoard, previousBoard, playerNumber, whitePoints+blackPoints, emptyPoints)
     if len(availableMoves) == 0 or depth == _maxDepth:
-        return evaluateBoard(whitePoints, blackPoints, len(availableMoves)), None  # Return the best score and no move initially
+        score = evaluateBoard(whitePoints, blackPoints, len(availableMoves))
+        if len(availableMoves) == 0:
+            _tt.store(key, SOLVED_DEPTH, EXACT, score, None)
+        else:
+            _horizonCount += 1
+            _tt.store(key, 0, EXACT, score, None)
+        return score, None  # Return the best score and no move initially
 
+    alphaOrig = alpha
     best_score = float('-inf')
     best_move = None
 
-    for move in availableMoves:
-        nextBoard = [row[:] for row in currentBoard]
-        nextBoard[move[0]][move[1]] = playerNumber
-        nextBoard = removeCapturedPieces(nextBoard.copy(), playerNumber % 2 + 1)
+    tacticalMoves = getTacticalMoves(currentBoard, availableMoves, playerNumber) if _ordering.use_tactical else ()
+    for searched, move in enumerate(_ordering.order(availableMoves, depth - 1, ttMove, tacticalMoves), 1):
+        nextBoard, nextPoints, nextEmptyPoints = playMove(currentBoard, move, playerNumber, points, emptyPoints)
 
-        current_score, _ = getMinMove(nextBoard.copy(), currentBoard.copy(), playerNumber % 2 + 1, depth + 1, alpha, beta)
+        current_score, _ = getMinMove(nextBoard, currentBoard, playerNumber % 2 + 1, depth + 1, alpha, beta, nextPoints, nextEmptyPoints)
 
         if current_score > best_score:
             best_score = current_score
@@ -183,24 +325,42 @@ def getMaxMove(currentBoard, previousBoard, playerNumber, depth, alpha, beta):
         if beta <= alpha:
             break  # Prune the rest of the branches
 
+    _ordering.update(best_move, depth - 1, _maxDepth - depth, searched, beta <= alpha)
+    storeTable(key, symmetry, depth, alphaOrig, beta, best_score, best_move, horizonCount)
     return best_score, best_move
 
-def getMinMove(currentBoard, previousBoard, playerNumber, depth, alpha, beta):
-    whitePoints = countOccurrences(currentBoard, 1)
-    blackPoints = countOccurrences(currentBoard, 2)
-    availableMoves = getAvailableMoves(currentBoard.copy(), previousBoard.copy(), playerNumber, whitePoints+blackPoints)
+def getMinMove(currentBoard, previousBoard, playerNumber, depth, alpha, beta, points, emptyPoints):
+    global _nodes, _horizonCount
+    _nodes += 1
+    if _deadline is not None and time.time() > _deadline:
+        raise SearchTimeout()
+    _ordering.count_node(depth - 1)
+    key, symmetry = getCanonicalKey(currentBoard, previousBoard, playerNumber)
+    score, ttMove = probeTable(key, symmetry, depth, alpha, beta)
+    if score is not None:
+        return score, ttMove
+    horizonCount = _horizonCount
+
+    whitePoints, blackPoints = points
+    availableMoves = getAvailableMoves(currentBoard, previousBoard, playerNumber, whitePoints+blackPoints, emptyPoints)
     if len(availableMoves) == 0 or depth == _maxDepth:
-        return evaluateBoard(whitePoints, blackPoints, len(availableMoves)), None  # Return the best score and no move initially
+        score = evaluateBoard(whitePoints, blackPoints, len(availableMoves))
+        if len(availableMoves) == 0:
+            _tt.store(key, SOLVED_DEPTH, EXACT, score, None)
+        else:
+            _horizonCount += 1
+            _tt.store(key, 0, EXACT, score, None)
+        return score, None  # Return the best score and no move initially
 
+    betaOrig = beta
     best_score = float('inf')
     best_move = None
 
-    for move in availableMoves:
-        nextBoard = [row[:] for row in currentBoard]
-        nextBoard[move[0]][move[1]] = playerNumber
-        nextBoard = removeCapturedPieces(nextBoard.copy(), playerNumber % 2 + 1)
+    tacticalMoves = getTacticalMoves(currentBoard, availableMoves, playerNumber) if _ordering.use_tactical else ()
+    for searched, move in enumerate(_ordering.order(availableMoves, depth - 1, ttMove, tacticalMoves), 1):
+        nextBoard, nextPoints, nextEmptyPoints = playMove(currentBoard, move, playerNumber, points, emptyPoints)
 
-        current_score, _ = getMaxMove(nextBoard.copy(), currentBoard.copy(), playerNumber % 2 + 1, depth + 1, alpha, beta)
+        current_score, _ = getMaxMove(nextBoard, currentBoard, playerNumber % 2 + 1, depth + 1, alpha, beta, nextPoints, nextEmptyPoints)
 
         if current_score < best_score:
             best_score = current_score
@@ -211,53 +371,164 @@ def getMinMove(currentBoard, previousBoard, playerNumber, depth, alpha, beta):
         if beta <= alpha:
             break  # Prune the rest of the branches
 
+    _ordering.update(best_move, depth - 1, _maxDepth - depth, searched, beta <= alpha)
+    storeTable(key, symmetry, depth, alpha, betaOrig, best_score, best_move, horizonCount)
     return best_score, best_move
 
 
 ###############################################################################################################
 
-# print(playerNumber)
-# print(previousBoard)
-# print("[INFO] Current board: ")
-# for row in currentBoard:
-#     print(row)
-# print()
-
-#Play best first move
-if all(all(x==0 for x in y) for y in currentBoard):
-    with open("output.txt", "w") as f:
-        f.write("2,2")
-    #print("[OUTPUT] 2,2")
-    exit()
-elif (countOccurrences(currentBoard, (playerNumber%2 + 1)) == 1) and (countOccurrences(currentBoard, playerNumber) == 0):
-    if currentBoard[2][2] == (playerNumber%2 + 1):
-        with open("output.txt", "w") as f:
-            f.write("1,2")
-        #print("[OUTPUT] 1,2")
-        exit()
+def searchBestMove(currentBoard, previousBoard, playerNumber, deadline=None, maxPlies=None, verbose=False):
+    # Iterative deepening: search 1, 2, 3... plies until the deadline, the ply limit, or
+    # an iteration that never reached the depth limit (the game tree is solved).
+    # Each iteration tries the previous best move first through the transposition table.
+    global _yourPlayer, _nodes, _maxDepth, _deadline, _completedPlies
+    _yourPlayer = playerNumber
+    _nodes = 0
+    _completedPlies = 0
+    _deadline = deadline
+    _tt.new_search()
+    _ordering.new_search()
+    _ordering.reset_stats()
+    best_score, best_move = None, None
+    points = [countOccurrences(currentBoard, 1), countOccurrences(currentBoard, 2)]
+    emptyPoints = getAllAvailableMoves(currentBoard)
+    plies = 1
+    while maxPlies is None or plies <= maxPlies:
+        _maxDepth = plies + 1
+        horizonCount = _horizonCount
+        iterationStart = time.time()
+        try:
+            best_score, best_move = getMaxMove(currentBoard, previousBoard, playerNumber, 1, float('-inf'), float('inf'), points, emptyPoints)
+        except SearchTimeout:
+            break
+        finally:
+            _deadline = deadline
+        _completedPlies = plies
+        if verbose:
+            print(f"depth={plies} nodes={_nodes} time={time.time()-iterationStart:.3f}s move={best_move}", file=sys.stderr)
+        if _horizonCount == horizonCount:
+            _completedPlies = SOLVED_DEPTH
+            break
+        # The next iteration takes longer than this one, so do not start it without that much time left
+        if deadline is not None and time.time() + (time.time() - iterationStart) > deadline:
+            break
+        plies += 1
+    _deadline = None
+    return best_score, best_move
+
+def getOpeningMove(currentBoard, playerNumber):
+    # Fixed first move of each colour. The search cannot play these: with no stone of our
+    # own on the board, removeLongJumpMoves filters out every move.
+    if all(all(x==0 for x in y) for y in currentBoard):
+        return (2, 2)
+    elif (countOccurrences(currentBoard, (playerNumber%2 + 1)) == 1) and (countOccurrences(currentBoard, playerNumber) == 0):
+        if currentBoard[2][2] == (playerNumber%2 + 1):
+            return (1, 2)
+        else:
+            return (2, 2)
+    return None
+
+def lookupBook(path, currentBoard, previousBoard, playerNumber):
+    # Book move of the position, or None when there is no book, no entry, or the move is not available here
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        book = OpeningBook(path)
+    except ValueError:
+        return None
+    with book:
+        entry = book.lookup(currentBoard, playerNumber)
+    if entry is None or entry[0] == "PASS":
+        return None
+    stones = countOccurrences(currentBoard, 1) + countOccurrences(currentBoard, 2)
+    if entry[0] not in getAvailableMoves(currentBoard, previousBoard, playerNumber, stones):
+        return None
+    return entry[0]
+
+def lookupTablebase(path, currentBoard, previousBoard, playerNumber):
+    # Solved move of the position, or None when there is no tablebase, no entry, or the move is not available here
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        tablebase = Tablebase(path)
+    except ValueError:
+        return None
+    position = Position.from_input(playerNumber, previousBoard, currentBoard)
+    with tablebase:
+        entry = tablebase.probe_position(position)
+    if entry is None:
+        return None
+    stones = countOccurrences(currentBoard, 1) + countOccurrences(currentBoard, 2)
+    if entry[0] != "PASS" and entry[0] not in getAvailableMoves(currentBoard, previousBoard, playerNumber, stones):
+        return None
+    return entry[0]
+
+def main():
+    global _tt, _ttConfig, _ordering, _useSymmetry
+    startTime = time.time()
+    parser = argparse.ArgumentParser(description='Minimax player with alpha-beta pruning')
+    parser.add_argument('--tt-mb', type=float, default=16, help='Transposition table memory cap in MB, 0 to disable (default: 16)')
+    parser.add_argument('--time-limit', type=float, help=f'Seconds per move (default: $GO_TIME_LIMIT or {DEFAULT_TIME_LIMIT})')
+    parser.add_argument('--shared-tt', default=os.environ.get('GO_SHARED_TT'), help='Memory-mapped transposition table file shared by all processes and runs, created with --tt-mb MB (default: $GO_SHARED_TT, none)')
+    parser.add_argument('--depth', type=int, help='Search exactly this many plies instead of using the time limit')
+    parser.add_argument('--ordering', choices=['full', 'hash'], default='full', help='Move ordering: hash move, captures, atari escapes, killers and history (full), or the hash move only (default: full)')
+    parser.add_argument('--no-symmetry', action='store_true', help='Do not merge the 8 symmetric copies of a position in the transposition table')
+    parser.add_argument('--book', default=BOOK_PATH, help='Opening book written by build_book.py, empty to disable (default: book.bin)')
+    parser.add_argument('--tablebase', default=TABLEBASE_PATH, help='Endgame tablebase written by tablebase.py, empty to disable (default: tablebase.bin)')
+    parser.add_argument('--stats', action='store_true', help='Print search statistics to stderr')
+    args = parser.parse_args()
+    if (args.tt_mb, args.shared_tt) != _ttConfig:
+        if args.shared_tt:
+            _tt = SharedTranspositionTable(args.shared_tt, args.tt_mb)
+        else:
+            _tt = TranspositionTable(args.tt_mb)
+        _ttConfig = (args.tt_mb, args.shared_tt)
+    _useSymmetry = not args.no_symmetry
+    if args.ordering == 'hash':
+        _ordering = MoveOrdering(5, killers=0, history=False, tactical=False)
+
+    playerNumber, previousBoard, currentBoard = readInput(5)
+
+    #Play best first move
+    openingMove = getOpeningMove(currentBoard, playerNumber)
+    if openingMove is not None:
+        writeOutput(openingMove)
+        return
+
+    #Answer from the opening book before searching
+    bookMove = lookupBook(args.book, currentBoard, previousBoard, playerNumber)
+    if bookMove is not None:
+        if args.stats:
+            print(f"book move={bookMove} time={time.time()-startTime:.6f}s", file=sys.stderr)
+        writeOutput(bookMove)
+        return
+
+    #Play the solved move of endgames in the tablebase
+    solvedMove = lookupTablebase(args.tablebase, currentBoard, previousBoard, playerNumber)
+    if solvedMove is not None:
+        if args.stats:
+            print(f"tablebase move={solvedMove} time={time.time()-startTime:.6f}s", file=sys.stderr)
+        writeOutput(solvedMove)
+        return
+
+    #Using Min-Max algorithm with iterative deepening to find best move
+    if args.depth is not None:
+        deadline, maxPlies = None, args.depth
     else:
-        with open("output.txt", "w") as f:
-            f.write("2,2")
-        #print("[OUTPUT] 2,2")
-        exit()
-else:
-    pass
+        stones = countOccurrences(currentBoard, 1) + countOccurrences(currentBoard, 2)
+        deadline, maxPlies = move_deadline(startTime, args.time_limit), max(1, moves_left(stones))
+    best_score, best_move = searchBestMove(currentBoard, previousBoard, playerNumber, deadline, maxPlies, args.stats)
+    if args.stats:
+        print(f"nodes={_nodes} time={time.time()-startTime:.3f}s tt_hit_rate={_tt.hit_rate():.1%} {_ordering.stats()}", file=sys.stderr)
+    whitePoints = countOccurrences(currentBoard, 1)
+    blackPoints = countOccurrences(currentBoard, 2)
+    possibleMoves = getAvailableMoves(currentBoard, previousBoard, playerNumber, whitePoints+blackPoints)
+
+    if len(possibleMoves)>0:
+        writeOutput(best_move if best_move is not None else possibleMoves[0])
+    else:
+        writeOutput("PASS")
 
-#Using Min-Max algorithm to find best move
-start = time.time()
-best_score, best_move = getMaxMove(currentBoard.copy(), previousBoard.copy(), playerNumber, 1, float('-inf'), float('inf'))
-# print("Time taken:", time.time()-start)
-whitePoints = countOccurrences(currentBoard, 1)
-blackPoints = countOccurrences(currentBoard, 2)
-possibleMoves = getAvailableMoves(currentBoard.copy(), previousBoard.copy(), playerNumber, whitePoints+blackPoints)
-# print("Available moves: ", possibleMoves)
-
-if len(possibleMoves)>0:
-    # print("Best move: ", best_move)
-    # print("Best score: ", best_score)
-    with open("output.txt", "w") as f:
-        f.write(str(best_move[0])+","+str(best_move[1]))
-else:
-    # print("BEST MOVE: PASS")
-    with open("output.txt", "w") as f:
-        f.write("PASS")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+from bitboard import board_to_bits, bits_to_board
+from host import GO, zobrist_table
+
+class Position:
+    __slots__ = ('size', 'stones', 'previous', 'piece_type', 'n_move', 'hash')
+
+    def __init__(self, size, stones, previous, piece_type, n_move=0, board_hash=None):
+        """
+        Immutable snapshot of a game position.
+
+        Each board is packed into one integer: bit i * n + j holds an 'X' stone and bit
+        n * n + i * n + j an 'O' stone. Snapshots never change, so copy() is O(1) and
+        the same object can be shared by transposition tables and replay buffers.
+
+        :param size: size of the board n*n.
+        :param stones: packed current board.
+        :param previous: packed previous board, used by the KO rule.
+        :param piece_type: 1('X') or 2('O') to move.
+        :param n_move: number of moves already played.
+        :param board_hash: Zobrist hash of the stones if already known, as GO.board_hash.
+        """
+        keys, side = zobrist_table(size)
+        if board_hash is None:
+            board_hash = 0
+            bits = stones
+            while bits:
+                low = bits & -bits
+                p = low.bit_length() - 1
+                color, p = (2, p - size * size) if p >= size * size else (1, p)
+                board_hash ^= keys[color][p // size][p % size]
+                bits ^= low
+        h = board_hash if piece_type == 1 else board_hash ^ side
+        set_slot = object.__setattr__
+        set_slot(self, 'size', size)
+        set_slot(self, 'stones', stones)
+        set_slot(self, 'previous', previous)
+        set_slot(self, 'piece_type', piece_type)
+        set_slot(self, 'n_move', n_move)
+        set_slot(self, 'hash', h) # Same value as GO.hash for this position
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Position is immutable')
+
+    def __eq__(self, other):
+        return isinstance(other, Position) and (self.stones, self.previous, self.piece_type, self.n_move) \
+            == (other.stones, other.previous, other.piece_type, other.n_move)
+
+    def __hash__(self):
+        return self.hash
+
+    def __reduce__(self):
+        return (Position, (self.size, self.stones, self.previous, self.piece_type, self.n_move))
+
+    def copy(self):
+        return self
+
+    @staticmethod
+    def pack(board):
+        '''
+        Pack a list-of-lists board into one integer.
+
+        :param board: n*n board.
+        :return: packed board.
+        '''
+        black, white = board_to_bits(board)
+        return black | white << (len(board) * len(board))
+
+    def unpack(self, packed):
+        '''
+        Unpack an integer into a list-of-lists board.
+
+        :param packed: packed board.
+        :return: n*n board.
+        '''
+        area = self.size * self.size
+        return bits_to_board(packed & ((1 << area) - 1), packed >> area, self.size)
+
+    @property
+    def board(self):
+        return self.unpack(self.stones)
+
+    @property
+    def previous_board(self):
+        return self.unpack(self.previous)
+
+    @property
+    def ko(self):
+        '''
+        Find the point the side to move may not play right now because of the KO rule.
+
+        :return: (row, column) or None.
+        '''
+        area = self.size * self.size
+        shift = 0 if self.piece_type == 1 else area
+        own = (self.stones >> shift) & ((1 << area) - 1)
+        died = (self.previous >> shift) & ((1 << area) - 1) & ~own
+        if died & (died - 1) or not died:
+            return None
+        p = died.bit_length() - 1
+        i, j = p // self.size, p % self.size
+        error, _ = self.to_go().placement_check(i, j, self.piece_type)
+        return (i, j) if error == "ko" else None
+
+    @classmethod
+    def from_input(cls, piece_type, previous_board, board, n_move=0):
+        '''
+        Build a position from the tuple returned by read.readInput.
+
+        :param piece_type: 1('X') or 2('O') to move.
+        :param previous_board: previous board state.
+        :param board: current board state.
+        :param n_move: number of moves already played.
+        :return: Position.
+        '''
+        return cls(len(board), cls.pack(board), cls.pack(previous_board), piece_type, n_move)
+
+    def to_input(self):
+        '''
+        Convert the position into the (piece_type, previous_board, board) tuple of read.readInput.
+
+        :return: (piece_type, previous_board, board).
+        '''
+        return self.piece_type, self.previous_board, self.board
+
+    @classmethod
+    def from_go(cls, go, piece_type):
+        '''
+        Snapshot a GO instance.
+
+        :param go: GO instance.
+        :param piece_type: 1('X') or 2('O') to move.
+        :return: Position.
+        '''
+        return cls(go.size, cls.pack(go.board), cls.pack(go.previous_board), piece_type, go.n_move,
+                   go.board_hash)
+
+    def to_go(self, ko_rule="simple"):
+        '''
+        Restore the position into a new GO instance.
+
+        :param ko_rule: KO rule of the GO instance.
+        :return: GO.
+        '''
+        go = GO(self.size, ko_rule)
+        go.set_board(self.piece_type, self.previous_board, self.board)
+        go.n_move = self.n_move
+        return go
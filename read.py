@@ -5,26 +5,31 @@
 # Description:
 # TodoList:
 
-def readInput(n, path="input.txt"):
+from transport import read_text, default_input, default_output
 
-    with open(path, 'r') as f:
-        lines = f.readlines()
+def readInput(n, path=None):
+    '''
+    :param path: transport to read from (transport.read_text), default input.txt.
+    '''
+    lines = read_text(path if path is not None else default_input(), 2*n+1).split('\n')
 
-        piece_type = int(lines[0])
+    piece_type = int(lines[0])
 
-        previous_board = [[int(x) for x in line.rstrip('\n')] for line in lines[1:n+1]]
-        board = [[int(x) for x in line.rstrip('\n')] for line in lines[n+1: 2*n+1]]
+    previous_board = [[int(x) for x in line] for line in lines[1:n+1]]
+    board = [[int(x) for x in line] for line in lines[n+1: 2*n+1]]
 
-        return piece_type, previous_board, board
+    return piece_type, previous_board, board
 
-def readOutput(path="output.txt"):
-    with open(path, 'r') as f:
-        position = f.readline().strip().split(',')
+def readOutput(path=None):
+    '''
+    :param path: transport to read from (transport.read_text), default output.txt.
+    '''
+    position = read_text(path if path is not None else default_output(), 1).strip().split(',')
 
-        if position[0] == "PASS":
-            return "PASS", -1, -1
+    if position[0] == "PASS":
+        return "PASS", -1, -1
 
-        x = int(position[0])
-        y = int(position[1])
+    x = int(position[0])
+    y = int(position[1])
 
     return "MOVE", x, y
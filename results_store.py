@@ -0,0 +1,197 @@
+import sys
+import json
+import sqlite3
+import argparse
+
+DEFAULT_STORE = 'tournament.db'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS games (
+    player1 TEXT NOT NULL,      -- Players and KO rule identify a tournament
+    player2 TEXT NOT NULL,
+    ko_rule TEXT NOT NULL,
+    game INTEGER NOT NULL,      -- Round index; player1 is black in even rounds
+    black TEXT NOT NULL,
+    white TEXT NOT NULL,
+    winner TEXT NOT NULL,       -- "black", "white" or "tie"
+    reason TEXT NOT NULL,       -- "score", "timeout" or "invalid"
+    black_score REAL NOT NULL,
+    white_score REAL NOT NULL,  -- Komi included
+    moves TEXT NOT NULL,        -- JSON list of "row,column" / "PASS"
+    board TEXT NOT NULL,        -- Final board, 25 digits row by row
+    move_time REAL NOT NULL,    -- Seconds spent by both players
+    finished REAL NOT NULL,     -- time.time() when the game was stored
+    PRIMARY KEY (player1, player2, ko_rule, game)
+);
+CREATE TABLE IF NOT EXISTS move_stats (
+    player1 TEXT NOT NULL,
+    player2 TEXT NOT NULL,
+    ko_rule TEXT NOT NULL,
+    game INTEGER NOT NULL,
+    move INTEGER NOT NULL,      -- Move number in the game, from 1
+    player TEXT NOT NULL,
+    color TEXT NOT NULL,
+    mode TEXT NOT NULL,         -- "in process", "persistent engine" or "one process per move"
+    wall REAL NOT NULL,         -- Seconds, as instrumentation.FIELDS
+    user REAL,                  -- NULL when the CPU time was not measured
+    sys REAL,
+    max_rss_mb REAL,
+    timed_out INTEGER NOT NULL,
+    PRIMARY KEY (player1, player2, ko_rule, game, move)
+);
+'''
+# Seat of a game: player1 plays black in even rounds
+P1_BLACK = 'game % 2 = 0'
+
+class ResultStore:
+    def __init__(self, path=DEFAULT_STORE, batch=20):
+        """
+        SQLite store of finished tournament games.
+
+        Games are inserted as they finish and committed every batch games (and on
+        close), so a crash loses at most the games of the last open batch. The
+        database uses write-ahead logging, so reports can be queried while a
+        tournament is writing.
+
+        :param path: database file.
+        :param batch: games per commit.
+        """
+        self.path = path
+        self.batch = batch
+        self.pending = 0
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def commit(self):
+        self.connection.commit()
+        self.pending = 0
+
+    def close(self):
+        if self.connection is not None:
+            self.commit()
+            self.connection.close()
+            self.connection = None
+
+    def add(self, player1, player2, ko_rule, record):
+        '''
+        Store one finished game and its per-move records.
+
+        :param record: game dict returned by TournamentSimulator.run_single_game, with
+                       the instrumentation records of its moves under "move_records".
+        :return: None.
+        '''
+        self.connection.execute(
+            'INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (player1, player2, ko_rule, record['game'], record['black'], record['white'], record['winner'],
+             record['reason'], record['black_score'], record['white_score'], json.dumps(record['moves']),
+             record['board'], record['move_time'], record['finished']))
+        self.connection.execute('DELETE FROM move_stats WHERE player1 = ? AND player2 = ? AND ko_rule = ? AND game = ?',
+                                (player1, player2, ko_rule, record['game']))
+        self.connection.executemany(
+            'INSERT INTO move_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(player1, player2, ko_rule, record['game'], move['move'], move['player'], move['color'], move['mode'],
+              move['wall'], move['user'], move['sys'], move['max_rss_mb'], move['timed_out'])
+             for move in record.get('move_records', ())])
+        self.pending += 1
+        if self.pending >= self.batch:
+            self.commit()
+
+    def clear(self, player1, player2, ko_rule):
+        '''
+        Delete the stored games of a tournament.
+
+        :return: number of games deleted.
+        '''
+        cursor = self.connection.execute('DELETE FROM games WHERE player1 = ? AND player2 = ? AND ko_rule = ?',
+                                         (player1, player2, ko_rule))
+        self.connection.execute('DELETE FROM move_stats WHERE player1 = ? AND player2 = ? AND ko_rule = ?',
+                                (player1, player2, ko_rule))
+        self.commit()
+        return cursor.rowcount
+
+    def games(self, player1, player2, ko_rule):
+        '''
+        :return: list of game dicts of a tournament, by game index.
+        '''
+        cursor = self.connection.execute(
+            'SELECT game, black, white, winner, reason, black_score, white_score, moves, board, move_time, finished '
+            'FROM games WHERE player1 = ? AND player2 = ? AND ko_rule = ? ORDER BY game', (player1, player2, ko_rule))
+        names = [column[0] for column in cursor.description]
+        games = [dict(zip(names, row)) for row in cursor]
+        for game in games:
+            game['moves'] = json.loads(game['moves'])
+        return games
+
+    def move_records(self, player1, player2, ko_rule):
+        '''
+        :return: list of the per-move dicts of a tournament (instrumentation.FIELDS), by game and move.
+        '''
+        cursor = self.connection.execute(
+            'SELECT player, game, move, color, mode, wall, user, sys, max_rss_mb, timed_out FROM move_stats '
+            'WHERE player1 = ? AND player2 = ? AND ko_rule = ? ORDER BY game, move', (player1, player2, ko_rule))
+        names = [column[0] for column in cursor.description]
+        records = [dict(zip(names, row)) for row in cursor]
+        for record in records:
+            record['timed_out'] = bool(record['timed_out'])
+        return records
+
+    def results(self, player1, player2, ko_rule):
+        '''
+        Count the wins, losses and ties of a tournament by colour. Games are
+        attributed by seat, not by name, so self-play is counted once per game.
+
+        :return: dict with the keys of TournamentSimulator.results.
+        '''
+        results = {}
+        for p, seat in (('p1', P1_BLACK), ('p2', f'NOT ({P1_BLACK})')):
+            for colour, opposite, condition in (('black', 'white', seat), ('white', 'black', f'NOT ({seat})')):
+                wins, losses, ties = self.connection.execute(
+                    "SELECT COALESCE(SUM(winner = ?), 0), COALESCE(SUM(winner = ?), 0), COALESCE(SUM(winner = 'tie'), 0) "
+                    f"FROM games WHERE player1 = ? AND player2 = ? AND ko_rule = ? AND {condition}",
+                    (colour, opposite, player1, player2, ko_rule)).fetchone()
+                results[f'{p}_as_{colour}_wins'] = wins
+                results[f'{p}_as_{colour}_losses'] = losses
+                results[f'{p}_as_{colour}_ties'] = ties
+        return results
+
+    def report(self):
+        '''
+        Aggregate every stored tournament.
+
+        :return: list of (player1, player2, ko_rule, games, player1 score, black win rate,
+                 timeouts, invalid moves, average moves per game).
+        '''
+        return self.connection.execute(f'''
+            SELECT player1, player2, ko_rule, COUNT(*),
+                   AVG(CASE WHEN winner = 'tie' THEN 0.5
+                            WHEN (winner = 'black') = ({P1_BLACK}) THEN 1.0
+                            ELSE 0.0 END),
+                   AVG(winner = 'black'), SUM(reason = 'timeout'), SUM(reason = 'invalid'),
+                   AVG(json_array_length(moves))
+            FROM games GROUP BY player1, player2, ko_rule ORDER BY player1, player2, ko_rule''').fetchall()
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize the games stored by tournament.py')
+    parser.add_argument('store', nargs='?', default=DEFAULT_STORE, help=f'Result database (default: {DEFAULT_STORE})')
+    args = parser.parse_args()
+    with ResultStore(args.store) as store:
+        rows = store.report()
+    if not rows:
+        print(f"No games in {args.store}")
+        sys.exit(0)
+    print(f"{'Player 1':<22} {'Player 2':<22} {'KO':<8} {'Games':>6} {'P1 score':>9} {'Black wins':>11} "
+          f"{'Timeouts':>9} {'Invalid':>8} {'Moves':>6}")
+    for player1, player2, ko_rule, games, score, black, timeouts, invalid, moves in rows:
+        print(f"{player1:<22} {player2:<22} {ko_rule:<8} {games:>6} {score:>9.1%} {black:>11.1%} "
+              f"{timeouts:>9} {invalid:>8} {moves:>6.1f}")
+
+if __name__ == "__main__":
+    main()
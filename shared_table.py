@@ -0,0 +1,140 @@
+import os
+import mmap
+import time
+import struct
+
+from book import PASS_MOVE
+
+MAGIC = b'GOTT'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQ') # magic, version, board size, number of slots
+SLOT = struct.Struct('<QdQ') # key ^ score bits ^ info, score, info
+NO_MOVE = 254 # Stored move of an entry without best move
+_DOUBLE = struct.Struct('<d')
+_BITS = struct.Struct('<Q')
+
+def _score_bits(score):
+    return _BITS.unpack(_DOUBLE.pack(score))[0]
+
+class SharedTranspositionTable:
+    def __init__(self, path, max_mb=16, n=5):
+        """
+        Transposition table in a memory-mapped file, shared by every process that
+        opens the same path: the moves of a game, later games and parallel
+        tournament workers all read and extend the same entries, which also
+        survive between runs.
+
+        Slots are fixed-size records indexed by key modulo the number of slots,
+        replaced like TranspositionTable's. Writers take no lock: a slot stores
+        key ^ score ^ info next to score and info, and a probe only accepts it when
+        the XOR gives back its key, so an entry torn by two concurrent writers, or
+        read halfway through a write, reads as a miss instead of a wrong score.
+
+        The table has the probe/store/new_search/hit_rate interface of
+        TranspositionTable. An existing file keeps its size; max_mb only sizes a
+        new one.
+
+        :param path: table file, created if missing.
+        :param max_mb: size of a new file in megabytes.
+        :param n: size of the board n*n, for the move encoding.
+        """
+        self.path = path
+        self.n = n
+        self.generation = os.getpid() & 0xFF # Entries of other processes count as older searches
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        slots = max(1, int(max_mb * 1024 * 1024) // SLOT.size)
+        try:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+            try:
+                # The header goes in before the file grows, so readers never see a sized file without it
+                os.write(fd, HEADER.pack(MAGIC, VERSION, n, slots))
+                os.ftruncate(fd, HEADER.size + slots * SLOT.size)
+            except BaseException:
+                os.close(fd)
+                os.remove(path)
+                raise
+        except FileExistsError:
+            fd = os.open(path, os.O_RDWR)
+        self.file = os.fdopen(fd, 'r+b')
+        self.data = self.map_file()
+        self.size = (len(self.data) - HEADER.size) // SLOT.size
+
+    def map_file(self):
+        # Another process may have created the file and not sized it yet
+        for _ in range(100):
+            size = os.fstat(self.file.fileno()).st_size
+            if size >= HEADER.size:
+                magic, version, n, slots = HEADER.unpack(os.pread(self.file.fileno(), HEADER.size, 0))
+                if magic != MAGIC or version != VERSION or n != self.n:
+                    self.file.close()
+                    raise ValueError(f'{self.path} is not a transposition table of a {self.n}x{self.n} board')
+                if size == HEADER.size + slots * SLOT.size:
+                    return mmap.mmap(self.file.fileno(), size)
+            time.sleep(0.01)
+        self.file.close()
+        raise ValueError(f'{self.path} is incomplete')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.data is not None:
+            self.data.close()
+            self.file.close()
+            self.data = None
+
+    def new_search(self):
+        self.generation = (self.generation + 1) & 0xFF
+
+    def encode_move(self, move):
+        if move is None:
+            return NO_MOVE
+        return PASS_MOVE if move == "PASS" else move[0] * self.n + move[1]
+
+    def decode_move(self, code):
+        if code == NO_MOVE:
+            return None
+        return "PASS" if code == PASS_MOVE else (code // self.n, code % self.n)
+
+    def probe(self, key):
+        '''
+        Look up a position.
+
+        :param key: 64-bit position hash.
+        :return: (depth, flag, score, move) or None.
+        '''
+        self.probes += 1
+        check, score, info = SLOT.unpack_from(self.data, HEADER.size + key % self.size * SLOT.size)
+        if check ^ _score_bits(score) ^ info != key or not info:
+            return None
+        self.hits += 1
+        return info >> 8 & 0xFF, info >> 16 & 0xFF, score, self.decode_move(info >> 24 & 0xFF)
+
+    def store(self, key, depth, flag, score, move):
+        '''
+        Store the result of searching a position.
+
+        :param key: 64-bit position hash.
+        :param depth: remaining depth the position was searched to, at most 255.
+        :param flag: EXACT, LOWER or UPPER.
+        :param score: score found by the search.
+        :param move: best move found, "PASS" or None.
+        :return: None.
+        '''
+        offset = HEADER.size + key % self.size * SLOT.size
+        check, old_score, old_info = SLOT.unpack_from(self.data, offset)
+        if old_info and check ^ _score_bits(old_score) ^ old_info != key \
+                and old_info & 0xFF == self.generation and depth < old_info >> 8 & 0xFF:
+            return
+        # Bit 32 keeps info non-zero, so that an empty (all zero) slot never matches key 0
+        info = 1 << 32 | self.encode_move(move) << 24 | flag << 16 | min(depth, 0xFF) << 8 | self.generation
+        SLOT.pack_into(self.data, offset, key ^ _score_bits(score) ^ info, score, info)
+        self.stores += 1
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
@@ -0,0 +1,104 @@
+import math
+
+SCORES = (0.0, 0.5, 1.0) # Loss, draw, win
+
+def elo_to_score(elo):
+    return 1 / (1 + 10 ** (-elo / 400))
+
+def closest_distribution(probabilities, score):
+    '''
+    Maximum likelihood loss/draw/win distribution with a given expected score:
+    p_j = q_j / (1 + theta * (a_j - score)), theta found by bisection.
+
+    :param probabilities: observed frequencies q of loss, draw and win.
+    :param score: expected score the distribution must have, in (0, 1).
+    :return: list of 3 probabilities.
+    '''
+    low, high = -1 / (1 - score), 1 / score # The probabilities stay positive in between
+    for _ in range(100):
+        theta = (low + high) / 2
+        if sum(q * (a - score) / (1 + theta * (a - score)) for q, a in zip(probabilities, SCORES)) > 0:
+            low = theta
+        else:
+            high = theta
+    return [q / (1 + theta * (a - score)) for q, a in zip(probabilities, SCORES)]
+
+class SPRT:
+    def __init__(self, elo0=0.0, elo1=50.0, alpha=0.05, beta=0.05):
+        """
+        Sequential probability ratio test between H0: the Elo difference is elo0
+        and H1: it is elo1, from the point of view of the first player.
+
+        The generalized log-likelihood ratio compares the loss/draw/win
+        distributions closest to the results with the expected score of each
+        hypothesis, as Fishtest does for trinomial results, and is checked after
+        every game against the Wald bounds:
+        H0 is accepted at log(beta / (1 - alpha)), H1 at log((1 - beta) / alpha).
+
+        :param elo0: Elo difference of H0, e.g. 0 for "not stronger".
+        :param elo1: Elo difference of H1, e.g. the gain worth detecting.
+        :param alpha: probability of accepting H1 when H0 holds.
+        :param beta: probability of accepting H0 when H1 holds.
+        """
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+    @property
+    def games(self):
+        return self.wins + self.draws + self.losses
+
+    def update(self, result):
+        '''
+        Add one game.
+
+        :param result: score of the first player, 1 (win), 0.5 (draw) or 0 (loss).
+        :return: decision after the game, as decision().
+        '''
+        if result == 1:
+            self.wins += 1
+        elif result == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+        return self.decision()
+
+    def llr(self):
+        '''
+        Log-likelihood ratio of H1 against H0 for the games so far.
+
+        :return: float, 0 before any game.
+        '''
+        if self.games == 0:
+            return 0.0
+        # Outcomes not seen yet get a tiny count, so that every distribution has full support
+        counts = [max(count, 1e-3) for count in (self.losses, self.draws, self.wins)]
+        total = sum(counts)
+        probabilities = [count / total for count in counts]
+        p0 = closest_distribution(probabilities, elo_to_score(self.elo0))
+        p1 = closest_distribution(probabilities, elo_to_score(self.elo1))
+        return sum(count * math.log(x / y) for count, x, y in zip(counts, p1, p0))
+
+    def decision(self):
+        '''
+        :return: "H1" when H1 is accepted, "H0" when H0 is accepted, None to keep playing.
+        '''
+        llr = self.llr()
+        if llr >= self.upper:
+            return "H1"
+        if llr <= self.lower:
+            return "H0"
+        return None
+
+    def summary(self):
+        decision = self.decision()
+        verdict = f"{decision} accepted" if decision else "no decision"
+        return (f"SPRT elo0={self.elo0:g} elo1={self.elo1:g} alpha={self.alpha:g} beta={self.beta:g}: "
+                f"LLR {self.llr():.2f} in [{self.lower:.2f}, {self.upper:.2f}] after {self.games} games "
+                f"(+{self.wins} ={self.draws} -{self.losses}), {verdict}")
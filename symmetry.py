@@ -0,0 +1,139 @@
+from host import zobrist_table
+
+SYMMETRIES = 8 # Rotations and reflections of a square board
+
+_symmetry_tables = {}
+_symmetric_zobrist_tables = {}
+
+def symmetry_table(n):
+    '''
+    Precompute the 8 dihedral transforms of a board.
+
+    Transform 0 is the identity, 1-3 rotate by 90, 180 and 270 degrees, 4-7 are the
+    reflections (columns, main diagonal, rows, anti-diagonal).
+
+    :param n: size of the board n*n.
+    :return: table where table[t][i][j] is the point (row, column) that (i, j) maps to under t.
+    '''
+    if n not in _symmetry_tables:
+        m = n - 1
+        maps = (lambda i, j: (i, j), lambda i, j: (j, m - i), lambda i, j: (m - i, m - j),
+                lambda i, j: (m - j, i), lambda i, j: (i, m - j), lambda i, j: (j, i),
+                lambda i, j: (m - i, j), lambda i, j: (m - j, m - i))
+        _symmetry_tables[n] = [[[f(i, j) for j in range(n)] for i in range(n)] for f in maps]
+    return _symmetry_tables[n]
+
+def inverse_symmetry(t):
+    '''
+    Get the transform that undoes t.
+
+    :param t: transform index.
+    :return: transform index.
+    '''
+    return (0, 3, 2, 1, 4, 5, 6, 7)[t]
+
+def transform_board(board, t):
+    '''
+    Apply a transform to a board.
+
+    :param board: n*n board.
+    :param t: transform index.
+    :return: new n*n board.
+    '''
+    n = len(board)
+    table = symmetry_table(n)[t]
+    result = [[0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            x, y = table[i][j]
+            result[x][y] = board[i][j]
+    return result
+
+def transform_move(move, t, n):
+    '''
+    Apply a transform to a move.
+
+    :param move: (row, column), or "PASS" / None which are returned unchanged.
+    :param t: transform index.
+    :param n: size of the board n*n.
+    :return: transformed move.
+    '''
+    if move is None or move == "PASS":
+        return move
+    return symmetry_table(n)[t][move[0]][move[1]]
+
+def pack_keys(keys):
+    '''
+    Pack 8 64-bit keys into one integer, key t in bits 64 * t to 64 * t + 63, so that
+    a single XOR updates the hashes of all 8 symmetric boards.
+
+    :param keys: 8 keys, one per transform.
+    :return: packed keys.
+    '''
+    packed = 0
+    for t, key in enumerate(keys):
+        packed |= key << (64 * t)
+    return packed
+
+def unpack_keys(packed):
+    '''
+    Split packed keys back into the 8 hashes.
+
+    :param packed: integer built by XORing pack_keys results.
+    :return: list of 8 hashes, one per transform.
+    '''
+    return [(packed >> (64 * t)) & 0xFFFFFFFFFFFFFFFF for t in range(SYMMETRIES)]
+
+def symmetric_zobrist(n):
+    '''
+    Zobrist keys of the transformed boards, so that the 8 hashes of a position
+    are computed in one pass over its stones.
+
+    :param n: size of the board n*n.
+    :return: table where table[color][i][j] packs (pack_keys) the 8 keys of color at the images of (i, j).
+    '''
+    if n not in _symmetric_zobrist_tables:
+        keys, _ = zobrist_table(n)
+        table = symmetry_table(n)
+        _symmetric_zobrist_tables[n] = [[[pack_keys(keys[color][x][y] for x, y in (table[t][i][j] for t in range(SYMMETRIES)))
+                                          for j in range(n)] for i in range(n)] for color in range(3)]
+    return _symmetric_zobrist_tables[n]
+
+def canonical_hash(board, piece_type=1):
+    '''
+    Find the canonical representative of a position among its 8 symmetric copies,
+    as the copy with the smallest Zobrist hash. Symmetric positions get the same
+    hash, so caches keyed on it share their entries.
+
+    :param board: n*n board.
+    :param piece_type: 1('X') or 2('O') to move.
+    :return: (hash, t) where hash matches GO.hash of transform_board(board, t).
+    '''
+    n = len(board)
+    keys = symmetric_zobrist(n)
+    packed = 0
+    for i in range(n):
+        for j in range(n):
+            if board[i][j]:
+                packed ^= keys[board[i][j]][i][j]
+    hashes = unpack_keys(packed)
+    if piece_type == 2:
+        side = zobrist_table(n)[1]
+        hashes = [h ^ side for h in hashes]
+    h = min(hashes)
+    return h, hashes.index(h)
+
+def canonical_board(board, previous_board=None, piece_type=1):
+    '''
+    Map a position to its canonical symmetric representative.
+
+    :param board: n*n board.
+    :param previous_board: previous board for the KO rule, transformed the same way.
+    :param piece_type: 1('X') or 2('O') to move; the side to move is part of the hash,
+                       so it can change which copy is canonical.
+    :return: (board, previous_board, t) with t the transform of canonical_hash(board, piece_type);
+             moves found on the canonical boards map back with transform_move(move, inverse_symmetry(t), n).
+    '''
+    _, t = canonical_hash(board, piece_type)
+    previous = transform_board(previous_board, t) if previous_board is not None else None
+    return transform_board(board, t), previous, t
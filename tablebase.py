@@ -0,0 +1,262 @@
+# tablebase.py
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+from multiprocessing import Pool
+from host import GO
+from position import Position
+from book import OpeningBook, write_book, decode_move, SOLVED
+from symmetry import canonical_hash, inverse_symmetry, transform_move
+
+BOARD_SIZE = 5
+DEFAULT_TABLEBASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tablebase.bin')
+DEFAULT_EMPTIES = 6
+MEMO_LIMIT = 2000000 # Solved nodes kept per worker before the memo is cleared
+
+_keyRandom = random.Random(564)
+KO_KEYS = [[_keyRandom.getrandbits(64) for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+PASS_KEY = _keyRandom.getrandbits(64) # The opponent just passed: passing again ends the game
+
+def tablebase_key(board, piece_type, ko=None, passed=False):
+    '''
+    Key a position of the tablebase on its canonical symmetric copy, with the KO
+    point and a pass by the opponent, which change the moves and the value.
+
+    :param board: n*n board.
+    :param piece_type: 1('X') or 2('O') to move.
+    :param ko: point the side to move may not play because of the KO rule, or None.
+    :param passed: whether the previous move was a pass.
+    :return: (key, t), t the transform of symmetry.canonical_hash.
+    '''
+    key, t = canonical_hash(board, piece_type)
+    if ko is not None:
+        x, y = transform_move(ko, t, len(board))
+        key ^= KO_KEYS[x][y]
+    if passed:
+        key ^= PASS_KEY
+    return key, t
+
+class Solver:
+    def __init__(self, n=BOARD_SIZE):
+        """
+        Exact minimax solver of Little-Go endgames.
+
+        The value of a position is the final score margin for the side to move
+        under perfect play by both sides: its stones minus the opponent's, with
+        komi counted for white. The game ends when the moves left run out or
+        on a pass right after a pass, as in host.judge. A board does not record
+        how many moves were played, so a position with e empty points is solved
+        with e - 1 moves left, the number left when every move so far placed a
+        stone (max_move = n*n - 1), which is also what my_player.py assumes.
+
+        Nodes are memoized on (board, KO state, side, pass, moves left) and
+        every move is searched without pruning, so every node's value is exact.
+        Nodes whose moves left match their empty points, as the root's, are
+        kept in entries for the table.
+
+        :param n: size of the board n*n.
+        """
+        self.n = n
+        self.komi = n / 2
+        self.memo = {}
+        self.entries = {}
+        self.solved = 0
+
+    def margin(self, board, piece_type):
+        own = sum(row.count(piece_type) for row in board)
+        other = sum(row.count(3 - piece_type) for row in board)
+        return own - other + (self.komi if piece_type == 2 else -self.komi)
+
+    def solve_position(self, position):
+        '''
+        Solve a position and the positions reachable from it.
+
+        :param position: position.Position, its board assumed to have e - 1 moves left.
+        :return: (value, move) for the side to move, move (i, j), "PASS" or None at the end of the game.
+        '''
+        go = position.to_go()
+        empties = sum(row.count(0) for row in go.board)
+        return self.solve(go, position.piece_type, position.previous == position.stones, empties - 1)
+
+    def solve(self, go, piece_type, passed, moves_left):
+        if moves_left <= 0:
+            return self.margin(go.board, piece_type), None
+        key = (go.board_hash, go.previous_hash if go.died_pieces else 0, piece_type, passed, moves_left)
+        result = self.memo.get(key)
+        if result is not None:
+            return result
+        if len(self.memo) >= MEMO_LIMIT:
+            self.memo.clear()
+
+        best_value, best_move = float('-inf'), None
+        for move in go.moves_from_mask(go.legal_moves(piece_type)):
+            go.make_move(move, piece_type)
+            value = -self.solve(go, 3 - piece_type, False, moves_left - 1)[0]
+            go.undo_move()
+            if value > best_value:
+                best_value, best_move = value, move
+        # A pass is played only when it is strictly better, so solved lines keep placing stones
+        if passed:
+            value = self.margin(go.board, piece_type)
+        else:
+            go.make_move("PASS", piece_type)
+            value = -self.solve(go, 3 - piece_type, True, moves_left - 1)[0]
+            go.undo_move()
+        if value > best_value:
+            best_value, best_move = value, "PASS"
+
+        result = (best_value, best_move)
+        self.memo[key] = result
+        self.solved += 1
+        if moves_left == sum(row.count(0) for row in go.board) - 1:
+            self.store(go, piece_type, passed, best_value, best_move)
+        return result
+
+    def store(self, go, piece_type, passed, value, move):
+        ko = None
+        if len(go.died_pieces) == 1:
+            i, j = go.died_pieces[0]
+            if go.board[i][j] == 0 and go.placement_check(i, j, piece_type)[0] == "ko":
+                ko = (i, j)
+        key, t = tablebase_key(go.board, piece_type, ko, passed)
+        self.entries[key] = (transform_move(move, t, self.n), SOLVED, value)
+
+def sample_roots(games, empties, seed=0):
+    '''
+    Collect endgame positions from self-play: both sides capture the most stones
+    they can, otherwise play a random legal move, like greedy_player.py.
+
+    :param games: number of games.
+    :param empties: largest number of empty points of a collected position.
+    :param seed: random seed.
+    :return: list of position.Position, the first position of each game with at most empties empty points.
+    '''
+    rng = random.Random(seed)
+    roots = []
+    for _ in range(games):
+        go = GO(BOARD_SIZE)
+        go.init_board(BOARD_SIZE)
+        piece_type = 1
+        for _ in range(4 * BOARD_SIZE * BOARD_SIZE): # Capture cycles can make a game endless
+            if sum(row.count(0) for row in go.board) <= empties:
+                roots.append(Position.from_go(go, piece_type))
+                break
+            legal, captures = go.scan_moves(piece_type)
+            moves = go.moves_from_mask(legal)
+            if not moves:
+                break
+            most = max(captures[i * BOARD_SIZE + j] for i, j in moves)
+            go.make_move(rng.choice([(i, j) for i, j in moves if captures[i * BOARD_SIZE + j] == most]), piece_type)
+            piece_type = 3 - piece_type
+    return roots
+
+def stored_roots(path, empties):
+    '''
+    Collect the endgame positions of the games stored by tournament.py.
+
+    :param path: results_store database.
+    :param empties: largest number of empty points of a collected position.
+    :return: list of position.Position, every position of a stored game with at most empties empty points.
+    '''
+    connection = sqlite3.connect(path)
+    try:
+        rows = connection.execute('SELECT moves FROM games').fetchall()
+    finally:
+        connection.close()
+    roots = []
+    for moves, in rows:
+        go = GO(BOARD_SIZE)
+        go.init_board(BOARD_SIZE)
+        piece_type = 1
+        for move in json.loads(moves):
+            if sum(row.count(0) for row in go.board) <= empties:
+                roots.append(Position.from_go(go, piece_type))
+            if move != "PASS":
+                move = tuple(int(x) for x in move.split(','))
+            if not go.make_move(move, piece_type):
+                break
+            piece_type = 3 - piece_type
+    return roots
+
+_solver = None
+
+def solve_roots(roots):
+    '''
+    Solve a chunk of positions, run in a worker process. The memo is kept
+    between chunks, so positions shared by several roots are solved once per worker.
+
+    :param roots: list of position.Position.
+    :return: (entries solved in this chunk, number of nodes solved).
+    '''
+    global _solver
+    if _solver is None:
+        _solver = Solver()
+    solved = _solver.solved
+    _solver.entries = {}
+    for position in roots:
+        _solver.solve_position(position)
+    return _solver.entries, _solver.solved - solved
+
+def build(roots, jobs, chunk=16):
+    '''
+    Solve positions on every worker and merge their table entries.
+
+    :param roots: list of position.Position.
+    :param jobs: worker processes.
+    :param chunk: positions per task.
+    :return: (entries for write_book, number of nodes solved).
+    '''
+    entries = {}
+    solved = 0
+    chunks = [roots[k:k + chunk] for k in range(0, len(roots), chunk)]
+    with Pool(jobs) as pool:
+        for done, (chunk_entries, chunk_solved) in enumerate(pool.imap_unordered(solve_roots, chunks), 1):
+            entries.update(chunk_entries)
+            solved += chunk_solved
+            print(f"\r{done}/{len(chunks)} chunks, {len(entries)} entries", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    return entries, solved
+
+class Tablebase(OpeningBook):
+    def probe_position(self, position):
+        '''
+        Find the solved value and best move of a position.
+
+        :param position: position.Position.
+        :return: (move, value) with the move in the frame of the position and the
+                 value the score margin for the side to move, or None if the position is not in the table.
+        '''
+        board = position.board
+        key, t = tablebase_key(board, position.piece_type, position.ko, position.previous == position.stones)
+        record = self.probe(key)
+        if record is None:
+            return None
+        code, _, value = record
+        return transform_move(decode_move(code, self.size), inverse_symmetry(t), self.size), value
+
+def main():
+    parser = argparse.ArgumentParser(description='Solve Little-Go endgames exactly and write them to a tablebase')
+    parser.add_argument('--empties', type=int, default=DEFAULT_EMPTIES, help=f'Solve positions with at most this many empty points (default: {DEFAULT_EMPTIES})')
+    parser.add_argument('--games', type=int, default=2000, help='Self-play games sampled for endgame positions (default: 2000)')
+    parser.add_argument('--store', help='Also solve the endgames of the games in this tournament.py database')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the self-play games (default: 0)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help='Worker processes (default: all CPUs)')
+    parser.add_argument('-o', '--output', default=DEFAULT_TABLEBASE, help='Tablebase file (default: tablebase.bin)')
+    args = parser.parse_args()
+
+    roots = sample_roots(args.games, args.empties, args.seed)
+    if args.store:
+        roots += stored_roots(args.store, args.empties)
+    start = time.time()
+    entries, solved = build(roots, args.jobs)
+    elapsed = time.time() - start
+    write_book(args.output, entries, BOARD_SIZE)
+    print(f"Solved {solved} positions from {len(roots)} roots in {elapsed:.1f}s ({solved / elapsed:.0f} positions/s)")
+    print(f"Wrote {len(entries)} positions to {args.output} ({os.path.getsize(args.output) / 1024:.1f} KB)")
+
+if __name__ == "__main__":
+    main()
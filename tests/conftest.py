@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The modules live at the repository root and the players in players/, as the scripts expect
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'players'))
+sys.path.insert(0, ROOT)
@@ -0,0 +1,81 @@
+import random
+
+import numpy as np
+
+from batch import BatchGO
+from host import GO
+from test_host import ko_position
+
+def random_positions(count, seed):
+    # Positions of random games at every stage, with the side to move
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        go = GO(5)
+        go.init_board(5)
+        piece_type = 1
+        for _ in range(rng.randrange(40)):
+            moves = go.moves_from_mask(go.legal_moves(piece_type))
+            go.make_move(rng.choice(moves) if moves and rng.random() > 0.05 else "PASS", piece_type)
+            piece_type = 3 - piece_type
+        positions.append((piece_type, [row[:] for row in go.previous_board], [row[:] for row in go.board]))
+    return positions
+
+def check_batch(positions):
+    batch = BatchGO(len(positions))
+    for k, position in enumerate(positions):
+        batch.set_board(k, *position)
+    legal, captured = batch.legal_moves()
+    for k, (piece_type, previous_board, board) in enumerate(positions):
+        go = GO(5)
+        go.set_board(piece_type, previous_board, board)
+        mask = sum(1 << p for p in np.flatnonzero(legal[k]).tolist())
+        assert mask == go.legal_moves(piece_type)
+        assert captured[k].tolist() == go.capture_counts(piece_type)
+        assert batch.get_board(k) == board
+
+def test_legal_masks_match_host():
+    check_batch(random_positions(300, 9))
+
+def test_ko_and_suicide():
+    go = ko_position()
+    go.make_move((1, 2), 1)
+    ko = (2, go.previous_board, go.board)
+    # (0, 4) is a white suicide point: black (0, 3) and (1, 4) surround it and have other liberties
+    board = [[0] * 5 for _ in range(5)]
+    board[0][3] = board[1][4] = 1
+    suicide = (2, [row[:] for row in board], board)
+    check_batch([ko, suicide])
+    batch = BatchGO(2)
+    batch.set_board(0, *ko)
+    batch.set_board(1, *suicide)
+    legal, _ = batch.legal_moves()
+    assert not legal[0][1 * 5 + 1] and not legal[1][0 * 5 + 4]
+    assert legal[1][0 * 5 + 0]
+
+def test_play_matches_make_move():
+    rng = random.Random(10)
+    games = [GO(5) for _ in range(20)]
+    for go in games:
+        go.init_board(5)
+    batch = BatchGO(len(games))
+    piece_type = 1
+    for _ in range(batch.max_move):
+        legal, _ = batch.legal_moves()
+        moves = []
+        for k, go in enumerate(games):
+            if batch.done[k]:
+                # Over after two passes: the batch ignores its moves, so its GO twin stops too
+                moves.append(-1)
+                continue
+            assert sum(1 << p for p in np.flatnonzero(legal[k]).tolist()) == go.legal_moves(piece_type)
+            choices = go.moves_from_mask(go.legal_moves(piece_type))
+            move = rng.choice(choices) if choices and rng.random() > 0.1 else "PASS"
+            go.make_move(move, piece_type)
+            moves.append(-1 if move == "PASS" else move[0] * 5 + move[1])
+        batch.play(np.array(moves))
+        for k, go in enumerate(games):
+            assert batch.get_board(k) == go.board
+        piece_type = 3 - piece_type
+    assert batch.done.all()
+    assert batch.judge_winner().tolist() == [go.judge_winner() for go in games]
@@ -0,0 +1,82 @@
+import random
+
+from bitboard import BitboardGO, bits_to_board, board_to_bits
+from host import GO
+from test_host import ko_position
+
+def play(go, move, piece_type):
+    # The move sequence of GO.play: place, then remove the opponent's dead stones
+    if move == "PASS":
+        go.previous_board = [row[:] for row in go.board]
+        if isinstance(go, GO):
+            go.previous_hash = go.board_hash
+        return True
+    if not go.place_chess(move[0], move[1], piece_type):
+        return False
+    go.died_pieces = go.remove_died_pieces(3 - piece_type)
+    return True
+
+def check_same(go, bitboard, piece_type):
+    assert bitboard.board == go.board
+    assert bitboard.previous_board == go.previous_board
+    assert bitboard.died_pieces == go.died_pieces
+    for player in (1, 2):
+        assert bitboard.find_died_pieces(player) == go.find_died_pieces(player)
+        assert bitboard.score(player) == go.score(player)
+        for i in range(5):
+            for j in range(5):
+                assert bitboard.valid_place_check(i, j, player, True) == go.valid_place_check(i, j, player, True)
+                if go.board[i][j]:
+                    assert sorted(bitboard.ally_dfs(i, j)) == sorted(go.ally_dfs(i, j))
+                    assert bitboard.find_liberty(i, j) == go.find_liberty(i, j)
+    assert bitboard.judge_winner() == go.judge_winner()
+    for action in ("MOVE", "PASS"):
+        assert bitboard.game_end(piece_type, action) == go.game_end(piece_type, action)
+
+def test_random_games_match_host():
+    rng = random.Random(8)
+    kos = captures = 0
+    for _ in range(30):
+        go, bitboard = GO(5), BitboardGO(5)
+        go.init_board(5)
+        bitboard.init_board(5)
+        piece_type = 1
+        while not go.game_end(piece_type):
+            check_same(go, bitboard, piece_type)
+            empty = [(i, j) for i in range(5) for j in range(5) if go.board[i][j] == 0]
+            kos += any(go.placement_check(i, j, piece_type)[0] == "ko" for i, j in empty)
+            # Illegal tries included, so both engines must reject the same moves
+            move = "PASS" if rng.random() < 0.05 else rng.choice(empty)
+            played = play(go, move, piece_type)
+            assert play(bitboard, move, piece_type) == played
+            if not played:
+                continue
+            captures += len(go.died_pieces)
+            go.n_move += 1
+            bitboard.n_move += 1
+            piece_type = 3 - piece_type
+        check_same(go, bitboard, piece_type)
+    assert kos and captures
+
+def test_ko_matches_host():
+    go = ko_position()
+    bitboard = BitboardGO(5)
+    bitboard.set_board(1, go.previous_board, go.board)
+    check_same(go, bitboard, 1)
+    assert play(go, (1, 2), 1) and play(bitboard, (1, 2), 1)
+    check_same(go, bitboard, 2)
+    assert not bitboard.valid_place_check(1, 1, 2, True)
+
+def test_board_assignment():
+    go = ko_position()
+    bitboard = BitboardGO(5)
+    bitboard.init_board(5)
+    bitboard.board = go.board
+    assert (bitboard.black, bitboard.white) == board_to_bits(go.board)
+    assert bits_to_board(bitboard.black, bitboard.white, 5) == go.board
+    # The board is a copy: changing it does not change the game
+    bitboard.board[0][0] = 1
+    assert bitboard.board == go.board
+    copy = bitboard.copy_board()
+    copy.board = [[0] * 5 for _ in range(5)]
+    assert bitboard.board == go.board
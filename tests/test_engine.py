@@ -0,0 +1,53 @@
+import mcts_player
+from engine import EngineClient
+from position import Position
+
+PLAYER = '''
+games = 0
+
+def new_game():
+    global games
+    games += 1
+
+def select_move(position, deadline=None):
+    return (games, 0)
+'''
+
+def test_shim_calls_new_game(tmp_path):
+    path = tmp_path / 'counting_player.py'
+    path.write_text(PLAYER)
+    board = [[0] * 5 for _ in range(5)]
+    client = EngineClient(str(path))
+    try:
+        assert client.genmove(1, board, board) == ("MOVE", 0, 0)
+        client.new_game()
+        client.new_game()
+        assert client.genmove(1, board, board) == ("MOVE", 2, 0)
+    finally:
+        client.close()
+
+SLOW_PLAYER = '''
+import time
+
+def select_move(position, deadline=None):
+    time.sleep(max(0.0, deadline - time.time()))
+    return "PASS"
+'''
+
+def test_player_using_its_whole_budget_is_not_killed(tmp_path):
+    path = tmp_path / 'slow_player.py'
+    path.write_text(SLOW_PLAYER)
+    board = [[0] * 5 for _ in range(5)]
+    client = EngineClient(str(path), timeout=1.0)
+    try:
+        for _ in range(3):
+            assert client.genmove(1, board, board) == ("PASS", -1, -1)
+    finally:
+        client.close()
+
+def test_mcts_new_game_drops_tree():
+    board = [[0] * 5 for _ in range(5)]
+    mcts_player.find_mcts_move(Position.from_input(1, board, board), max_playouts=50)
+    assert mcts_player._root is not None
+    mcts_player.new_game()
+    assert mcts_player._root is None
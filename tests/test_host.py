@@ -0,0 +1,196 @@
+import random
+from copy import deepcopy
+
+from host import GO, zobrist_hash
+
+def snapshot(go):
+    groups = tuple(None if group is None else (group.color, group.stones, group.liberties)
+                   for row in go.groups for group in row)
+    return (deepcopy(go.board), deepcopy(go.previous_board), list(go.died_pieces), go.board_hash,
+            go.previous_hash, frozenset(go.seen_hashes), groups, go.n_move, go.X_move)
+
+def ko_position(ko_rule="simple"):
+    # White (1, 1) is in atari; black (1, 2) captures it and white may not retake at once
+    go = GO(5, ko_rule)
+    board = [[0, 1, 2, 0, 0],
+             [1, 2, 0, 2, 0],
+             [0, 1, 2, 0, 0],
+             [0, 0, 0, 0, 0],
+             [0, 0, 0, 0, 0]]
+    go.set_board(1, deepcopy(board), board)
+    return go
+
+def test_random_games_undo_to_start():
+    rng = random.Random(2)
+    captures = passes = 0
+    for _ in range(40):
+        go = GO(5)
+        go.init_board(5)
+        start = snapshot(go)
+        history = []
+        piece_type = 1
+        for _ in range(60):
+            moves = go.moves_from_mask(go.legal_moves(piece_type))
+            move = "PASS" if not moves or rng.random() < 0.05 else rng.choice(moves)
+            history.append(snapshot(go))
+            assert go.make_move(move, piece_type)
+            captures += len(go.died_pieces)
+            passes += move == "PASS"
+            piece_type = 3 - piece_type
+        while history:
+            go.undo_move()
+            assert snapshot(go) == history.pop()
+        assert snapshot(go) == start
+        assert go.undo_stack == []
+    assert captures and passes
+
+def test_ko_capture_and_undo():
+    go = ko_position()
+    before = snapshot(go)
+    assert go.make_move((1, 2), 1)
+    assert go.died_pieces == [(1, 1)]
+    assert go.placement_check(1, 1, 2)[0] == "ko"
+    assert not go.make_move((1, 1), 2)
+    assert go.make_move("PASS", 2)
+    assert go.make_move("PASS", 1)
+    # After the passes the KO point may be played
+    assert go.make_move((1, 1), 2)
+    for _ in range(4):
+        go.undo_move()
+    assert snapshot(go) == before
+
+def test_groups_match_rebuild():
+    rng = random.Random(3)
+    go = GO(5)
+    go.init_board(5)
+    piece_type = 1
+    for _ in range(40):
+        moves = go.moves_from_mask(go.legal_moves(piece_type))
+        go.make_move(rng.choice(moves) if moves else "PASS", piece_type)
+        piece_type = 3 - piece_type
+        incremental = snapshot(go)[6]
+        go.build_groups()
+        assert snapshot(go)[6] == incremental
+
+def test_incremental_hash_matches_board():
+    rng = random.Random(4)
+    for _ in range(20):
+        go = GO(5)
+        go.init_board(5)
+        piece_type = 1
+        for _ in range(50):
+            moves = go.moves_from_mask(go.legal_moves(piece_type))
+            if moves:
+                i, j = rng.choice(moves)
+                captured = go.placement_check(i, j, piece_type)[1]
+                expected = go.hash_after_move(i, j, piece_type, captured)
+                go.make_move((i, j), piece_type)
+                assert go.board_hash == expected
+            else:
+                go.make_move("PASS", piece_type)
+            assert go.board_hash == zobrist_hash(go.board)
+            assert go.previous_hash == zobrist_hash(go.previous_board)
+            assert go.board_hash in go.seen_hashes
+            piece_type = 3 - piece_type
+
+def test_hash_includes_side_to_move():
+    go = GO(5)
+    go.init_board(5)
+    go.make_move((2, 2), 1)
+    go.X_move = True
+    black_to_move = go.hash
+    go.X_move = False
+    assert go.hash == black_to_move ^ go.zobrist_side
+    assert go.hash != black_to_move
+    assert black_to_move == go.board_hash
+
+def test_superko_forbids_repeated_board():
+    for ko_rule, allowed in (("simple", True), ("superko", False)):
+        go = ko_position(ko_rule)
+        start = go.board_hash
+        assert go.make_move((1, 2), 1)
+        assert go.make_move("PASS", 2)
+        assert go.make_move("PASS", 1)
+        # Retaking restores the starting board, which only superko remembers
+        captured = go.placement_check(1, 1, 2)[1]
+        assert go.hash_after_move(1, 1, 2, captured) == start
+        assert go.placement_check(1, 1, 2)[0] == (None if allowed else "superko")
+        assert go.make_move((1, 1), 2) == allowed
+
+def test_superko_forgets_undone_boards():
+    go = ko_position("superko")
+    assert go.make_move((1, 2), 1)
+    captured_hash = go.board_hash
+    go.undo_move()
+    assert captured_hash not in go.seen_hashes
+    assert go.make_move((1, 2), 1)
+    assert go.board_hash == captured_hash
+
+def test_copy_before_groups_are_built():
+    # Players may assign the boards of a new GO directly instead of calling set_board
+    board = ko_position().board
+    go = GO(5)
+    go.board = [row[:] for row in board]
+    go.previous_board = [row[:] for row in board]
+    copy = go.copy_board()
+    assert go.groups is None
+    assert copy.board == board and copy.board is not go.board
+    copy.build_groups()
+    groups = snapshot(copy)[6]
+    assert snapshot(go.copy_board())[6] == groups
+    assert go.copy_board().valid_place_check(1, 2, 1, True)
+
+def reference_placement(go, i, j, piece_type):
+    # The original check: place on a copy, rebuild its groups, remove dead stones, compare boards
+    if go.board[i][j] != 0:
+        return False, 0
+    test_go = go.copy_board()
+    test_board = [row[:] for row in test_go.board]
+    test_board[i][j] = piece_type
+    test_go.update_board(test_board)
+    died = test_go.find_died_pieces(3 - piece_type)
+    if test_go.find_liberty(i, j):
+        return True, len(died)
+    test_go.remove_died_pieces(3 - piece_type)
+    if not test_go.find_liberty(i, j):
+        return False, 0
+    if go.died_pieces and go.compare_board(go.previous_board, test_go.board):
+        return False, 0
+    return True, len(died)
+
+def check_masks(go, piece_type):
+    legal, captures = go.scan_moves(piece_type)
+    assert (legal, captures) == (go.legal_moves(piece_type), go.capture_counts(piece_type))
+    for i in range(5):
+        for j in range(5):
+            valid, captured = reference_placement(go, i, j, piece_type)
+            assert bool(legal >> (i * 5 + j) & 1) == valid == go.valid_place_check(i, j, piece_type, True)
+            assert captures[i * 5 + j] == captured
+
+def test_masks_match_original_check():
+    rng = random.Random(11)
+    kos = suicides = 0
+    for _ in range(15):
+        go = GO(5)
+        go.init_board(5)
+        piece_type = 1
+        for _ in range(50):
+            for player in (1, 2):
+                check_masks(go, player)
+            errors = [go.placement_check(i, j, piece_type)[0] for i in range(5) for j in range(5) if go.board[i][j] == 0]
+            kos += errors.count("ko")
+            suicides += errors.count("liberty")
+            moves = go.moves_from_mask(go.legal_moves(piece_type))
+            go.make_move(rng.choice(moves) if moves else "PASS", piece_type)
+            piece_type = 3 - piece_type
+    assert kos and suicides
+
+def test_masks_at_ko_and_suicide():
+    go = ko_position()
+    go.make_move((1, 2), 1)
+    check_masks(go, 2)
+    assert not go.legal_moves(2) >> (1 * 5 + 1) & 1
+    # (0, 0) is enclosed by stones of 1 with other liberties: a stone of 2 there is suicide
+    assert not go.legal_moves(2) >> 0 & 1
+    assert go.placement_check(0, 0, 2)[0] == "liberty"
+    check_masks(go, 1)
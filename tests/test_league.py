@@ -0,0 +1,79 @@
+import math
+
+import pytest
+
+from league import ELO_SCALE, append_game, ratings, read_games, schedule
+
+def games_between(a, b, a_wins, b_wins, ties=0):
+    games = []
+    for k in range(a_wins + b_wins + ties):
+        black, white = (a, b) if k % 2 == 0 else (b, a)
+        winner = a if k < a_wins else b if k < a_wins + b_wins else None
+        games.append({'black': black, 'white': white,
+                      'winner': 'tie' if winner is None else 'black' if winner == black else 'white'})
+    return games
+
+def test_two_players_closed_form():
+    # With two players the maximum is p = (wins + prior / 2) / (games + prior)
+    table = ratings(games_between('a', 'b', 7, 3), prior=2.0)
+    difference = ELO_SCALE * math.log((7 + 1) / (3 + 1))
+    assert table['a'][0] == pytest.approx(difference / 2)
+    assert table['b'][0] == pytest.approx(-difference / 2)
+    assert table['a'][2:] == (10, 0.7)
+    assert table['b'][2:] == (10, 0.3)
+
+def test_ties_count_half():
+    tied = ratings(games_between('a', 'b', 2, 2, ties=4))
+    assert tied['a'][0] == pytest.approx(0.0, abs=1e-6)
+    assert tied['a'][3] == 0.5
+    assert ratings(games_between('a', 'b', 3, 1, ties=2))['a'][3] == pytest.approx(4 / 6)
+
+def test_only_wins_stay_finite():
+    table = ratings(games_between('a', 'b', 10, 0))
+    assert math.isfinite(table['a'][0]) and table['a'][0] > 0
+    assert math.isfinite(table['a'][1])
+
+def test_mm_fixed_point():
+    games = games_between('a', 'b', 6, 4) + games_between('b', 'c', 7, 3) + games_between('a', 'c', 5, 1, ties=2)
+    prior = 2.0
+    table = ratings(games, prior=prior)
+    assert table['a'][0] > table['b'][0] > table['c'][0]
+    assert sum(elo for elo, _, _, _ in table.values()) == pytest.approx(0.0, abs=1e-6)
+    gamma = {player: math.exp(elo / ELO_SCALE) for player, (elo, _, _, _) in table.items()}
+    # Every player's expected score against its opponents equals its actual score, virtual ties included
+    for player in gamma:
+        expected = actual = 0.0
+        for game in games:
+            if player not in (game['black'], game['white']):
+                continue
+            opponent = game['white'] if game['black'] == player else game['black']
+            expected += gamma[player] / (gamma[player] + gamma[opponent])
+            side = 'black' if game['black'] == player else 'white'
+            actual += 1.0 if game['winner'] == side else 0.5 if game['winner'] == 'tie' else 0.0
+        for opponent in {'a', 'b', 'c'} - {player}:
+            expected += prior * gamma[player] / (gamma[player] + gamma[opponent])
+            actual += prior / 2
+        assert expected == pytest.approx(actual, rel=1e-6)
+
+def test_intervals_shrink_with_games():
+    few = ratings(games_between('a', 'b', 3, 2))
+    many = ratings(games_between('a', 'b', 30, 20))
+    assert many['a'][1] < few['a'][1]
+
+def test_schedule_alternates_and_resumes():
+    full = schedule(['b', 'a', 'c'], 2)
+    assert len(full) == 6
+    assert full[:3] == [('a', 'b'), ('a', 'c'), ('b', 'c')]
+    assert full[3:] == [('b', 'a'), ('c', 'a'), ('c', 'b')]
+    played = [{'black': 'a', 'white': 'b', 'winner': 'black'}, {'black': 'c', 'white': 'a', 'winner': 'tie'}]
+    assert schedule(['a', 'b', 'c'], 2, played) == [('a', 'c'), ('b', 'c'), ('b', 'a'), ('c', 'b')]
+
+def test_league_file_skips_cut_lines(tmp_path):
+    path = str(tmp_path / 'league.jsonl')
+    assert read_games(path) == []
+    games = games_between('a', 'b', 1, 1)
+    append_game(path, games[0])
+    with open(path, 'a') as f:
+        f.write('{"black": "a", "wh\n')
+    append_game(path, games[1])
+    assert read_games(path) == games
@@ -0,0 +1,82 @@
+import random
+import time
+
+import mcts_player
+from host import GO
+from mcts_player import AREA, FULL, play, points
+from position import Position
+from test_host import ko_position
+
+def masks(go, piece_type):
+    black, white = Position.pack(go.board) & FULL, Position.pack(go.board) >> AREA
+    return (black, white) if piece_type == 1 else (white, black)
+
+def check_position(go, piece_type, ko):
+    own, opponent = masks(go, piece_type)
+    empty = FULL & ~(own | opponent)
+    legal = 0
+    for p in points(empty):
+        result = play(own, opponent, ko, p)
+        if result is None:
+            continue
+        legal |= 1 << p
+        child = go.copy_board()
+        assert child.make_move(divmod(p, 5), piece_type)
+        assert (result[1], result[0]) == masks(child, 3 - piece_type)
+        # The KO point of the reply is the one GO forbids
+        i, j = divmod(result[2], 5)
+        forbidden = [q for q in points(FULL & ~(result[0] | result[1]))
+                     if child.placement_check(q // 5, q % 5, 3 - piece_type)[0] == "ko"]
+        assert forbidden == ([] if result[2] < 0 else [i * 5 + j])
+    assert legal == go.legal_moves(piece_type)
+
+def test_play_matches_legal_moves():
+    rng = random.Random(5)
+    for _ in range(30):
+        go = GO(5)
+        go.init_board(5)
+        piece_type, ko = 1, -1
+        for _ in range(40):
+            check_position(go, piece_type, ko)
+            moves = go.moves_from_mask(go.legal_moves(piece_type))
+            if not moves or rng.random() < 0.05:
+                go.make_move("PASS", piece_type)
+                ko = -1
+            else:
+                i, j = rng.choice(moves)
+                own, opponent = masks(go, piece_type)
+                ko = play(own, opponent, ko, i * 5 + j)[2]
+                go.make_move((i, j), piece_type)
+            piece_type = 3 - piece_type
+
+def test_play_ko():
+    go = ko_position()
+    check_position(go, 1, -1)
+    own, opponent = masks(go, 1)
+    own, opponent, ko = play(own, opponent, -1, 1 * 5 + 2)
+    assert ko == 1 * 5 + 1
+    assert play(opponent, own, ko, ko) is None
+    go.make_move((1, 2), 1)
+    check_position(go, 2, ko)
+
+def test_search_plays_legal_moves():
+    rng = random.Random(6)
+    go = GO(5)
+    go.init_board(5)
+    piece_type = 1
+    for _ in range(24):
+        position = Position.from_go(go, piece_type)
+        move = mcts_player.find_mcts_move(position, max_playouts=200, rng=rng)
+        assert move == "PASS" or go.placement_check(move[0], move[1], piece_type)[0] is None
+        assert go.make_move(move, piece_type)
+        piece_type = 3 - piece_type
+    mcts_player.new_game()
+
+def test_select_move_keeps_deadline():
+    board = [[0] * 5 for _ in range(5)]
+    position = Position.from_input(1, board, board)
+    deadline = time.time() + mcts_player.SAFETY + 0.2
+    move = mcts_player.select_move(position, deadline)
+    assert time.time() < deadline
+    assert move == "PASS" or board[move[0]][move[1]] == 0
+    mcts_player.new_game()
@@ -0,0 +1,59 @@
+import random
+from copy import deepcopy
+
+import my_player
+from book import SOLVED, write_book
+from host import GO
+from position import Position
+from tablebase import tablebase_key
+from transposition import TranspositionTable
+
+def midgame(seed, moves=8):
+    rng = random.Random(seed)
+    go = GO(5)
+    go.init_board(5)
+    piece_type = 1
+    for _ in range(moves):
+        go.make_move(rng.choice(go.moves_from_mask(go.legal_moves(piece_type))), piece_type)
+        piece_type = 3 - piece_type
+    return go
+
+def search(board, previous_board, player, plies=3):
+    return my_player.searchBestMove(deepcopy(board), deepcopy(previous_board), player, maxPlies=plies)
+
+def test_table_kept_across_colours(monkeypatch):
+    # A persistent engine plays both colours with one table, as tournaments alternate colours
+    for seed in range(2):
+        go = midgame(seed)
+        board, previous_board = deepcopy(go.board), deepcopy(go.previous_board)
+        monkeypatch.setattr(my_player, '_tt', TranspositionTable(16))
+        fresh = search(board, previous_board, 1)
+
+        move = go.moves_from_mask(go.legal_moves(1))[0]
+        go.make_move(move, 1)
+        monkeypatch.setattr(my_player, '_tt', TranspositionTable(16))
+        search(go.board, go.previous_board, 2)
+        assert search(board, previous_board, 1) == fresh
+
+def test_keys_depend_on_root_player(monkeypatch):
+    # Scores are stored for the player to move at the root, so its two colours must not share entries
+    go = midgame(4)
+    keys = {}
+    for player in (1, 2):
+        monkeypatch.setattr(my_player, '_yourPlayer', player)
+        keys[player] = my_player.getCanonicalKey(go.board, go.previous_board, 1)
+    assert keys[1][0] != keys[2][0]
+    assert keys[1][1] == keys[2][1]
+
+def test_tablebase_move_must_be_available(tmp_path):
+    # A corrupt or colliding entry must not be played: the search answers instead
+    go = midgame(5, moves=12)
+    position = Position.from_go(go, 1)
+    key, t = tablebase_key(go.board, 1, position.ko, position.previous == position.stones)
+    stones = sum(row.count(1) + row.count(2) for row in go.board)
+    legal = my_player.getAvailableMoves(go.board, go.previous_board, 1, stones)[0]
+    occupied = next((i, j) for i in range(5) for j in range(5) if go.board[i][j] != 0)
+    path = str(tmp_path / 'tablebase.bin')
+    for move, expected in ((legal, legal), ("PASS", "PASS"), (occupied, None)):
+        write_book(path, {key: (my_player.transform_move(move, t, 5), SOLVED, 0.0)})
+        assert my_player.lookupTablebase(path, go.board, go.previous_board, 1) == expected
@@ -0,0 +1,23 @@
+import pytest
+
+from player_api import DEFAULT_TIME_LIMIT, move_deadline, moves_left, time_limit
+
+def test_time_limit(monkeypatch):
+    monkeypatch.delenv('GO_TIME_LIMIT', raising=False)
+    assert time_limit() == DEFAULT_TIME_LIMIT
+    monkeypatch.setenv('GO_TIME_LIMIT', '2.5')
+    assert time_limit() == 2.5
+    assert time_limit(1.0) == 1.0
+
+def test_move_deadline(monkeypatch):
+    monkeypatch.setenv('GO_TIME_LIMIT', '4')
+    assert move_deadline(100.0) == 104.0
+    assert move_deadline(100.0, 1.0) == 101.0
+    # The caller's deadline wins when it is earlier, less the safety margin
+    assert move_deadline(100.0, deadline=103.0, safety=0.5) == pytest.approx(102.5)
+    assert move_deadline(100.0, deadline=110.0, safety=0.5) == 104.0
+
+def test_moves_left():
+    assert moves_left(0) == 24
+    assert moves_left(10) == 14
+    assert moves_left(0, 3) == 8
@@ -0,0 +1,62 @@
+import pickle
+import random
+from copy import deepcopy
+
+import pytest
+
+from host import GO
+from position import Position
+from test_host import ko_position
+
+def game_positions(seed, moves=40):
+    rng = random.Random(seed)
+    go = GO(5)
+    go.init_board(5)
+    piece_type = 1
+    positions = []
+    for _ in range(moves):
+        legal = go.moves_from_mask(go.legal_moves(piece_type))
+        go.make_move(rng.choice(legal) if legal else "PASS", piece_type)
+        piece_type = 3 - piece_type
+        positions.append((deepcopy(go), piece_type))
+    return positions
+
+def test_input_round_trip():
+    for seed in range(5):
+        for go, piece_type in game_positions(seed):
+            position = Position.from_input(piece_type, go.previous_board, go.board, go.n_move)
+            assert position.to_input() == (piece_type, go.previous_board, go.board)
+            assert Position.from_input(*position.to_input(), n_move=go.n_move) == position
+
+def test_go_round_trip():
+    for seed in range(5):
+        for go, piece_type in game_positions(seed):
+            position = Position.from_go(go, piece_type)
+            assert position.hash == go.hash
+            assert position == Position.from_input(piece_type, go.previous_board, go.board, go.n_move)
+            restored = position.to_go()
+            assert (restored.board, restored.previous_board, restored.n_move) == (go.board, go.previous_board, go.n_move)
+            assert restored.board_hash == go.board_hash
+            assert restored.legal_moves(piece_type) == go.legal_moves(piece_type)
+            assert Position.from_go(restored, piece_type) == position
+
+def test_pickle_round_trip():
+    for go, piece_type in game_positions(6):
+        position = Position.from_go(go, piece_type)
+        copy = pickle.loads(pickle.dumps(position))
+        assert copy == position
+        assert copy.hash == position.hash
+
+def test_ko_point():
+    go = ko_position()
+    assert Position.from_go(go, 1).ko is None
+    go.make_move((1, 2), 1)
+    assert Position.from_go(go, 2).ko == (1, 1)
+    go.make_move("PASS", 2)
+    assert Position.from_go(go, 1).ko is None
+
+def test_immutable():
+    position = Position.from_input(1, [[0] * 5 for _ in range(5)], [[0] * 5 for _ in range(5)])
+    with pytest.raises(AttributeError):
+        position.piece_type = 2
+    assert position.copy() is position
@@ -0,0 +1,68 @@
+import pytest
+
+from results_store import ResultStore
+from tournament import TournamentSimulator
+
+def game(index, winner, moves=2):
+    black, white = ('a.py', 'b.py') if index % 2 == 0 else ('b.py', 'a.py')
+    return {'game': index, 'black': black, 'white': white, 'winner': winner, 'reason': 'score',
+            'black_score': 10, 'white_score': 12.5, 'moves': ["2,2", "PASS"], 'board': '0' * 25,
+            'move_time': 0.5, 'finished': 0.0,
+            'move_records': [{'player': black if k % 2 == 0 else white, 'game': index, 'move': k + 1,
+                              'color': 'black' if k % 2 == 0 else 'white', 'mode': 'in process', 'wall': 0.25,
+                              'user': None, 'sys': None, 'max_rss_mb': 30.0, 'timed_out': False}
+                             for k in range(moves)]}
+
+def self_play(index, winner):
+    record = game(index, winner)
+    record['black'] = record['white'] = 'a.py'
+    return record
+
+def test_results_by_seat(tmp_path):
+    with ResultStore(str(tmp_path / 'store.db')) as store:
+        for index, winner in enumerate(['black', 'black', 'white', 'tie']):
+            store.add('a.py', 'b.py', 'simple', game(index, winner))
+        results = store.results('a.py', 'b.py', 'simple')
+    # Games 0 and 2: a.py is black; games 1 and 3: b.py is black
+    assert results['p1_as_black_wins'] == 1 and results['p1_as_black_losses'] == 1
+    assert results['p2_as_black_wins'] == 1 and results['p2_as_black_ties'] == 1
+    assert results['p1_as_white_losses'] == 1 and results['p1_as_white_ties'] == 1
+    assert results['p2_as_white_wins'] == 1 and results['p2_as_white_losses'] == 1
+
+def test_self_play_counted_once(tmp_path):
+    with ResultStore(str(tmp_path / 'store.db')) as store:
+        for index in range(4):
+            store.add('a.py', 'a.py', 'simple', self_play(index, 'white'))
+        results = store.results('a.py', 'a.py', 'simple')
+        (row,) = store.report()
+    assert sum(results.values()) == 8 # Each game counts once for p1 and once for p2
+    assert results['p1_as_white_wins'] == 2 and results['p2_as_white_wins'] == 2
+    assert row[3] == 4 and row[4] == 0.5
+
+def test_move_records_round_trip(tmp_path):
+    path = str(tmp_path / 'store.db')
+    with ResultStore(path) as store:
+        store.add('a.py', 'b.py', 'simple', game(0, 'black', moves=3))
+        store.add('a.py', 'b.py', 'simple', game(0, 'white', moves=2)) # A replayed round replaces its moves
+    with ResultStore(path) as store:
+        records = store.move_records('a.py', 'b.py', 'simple')
+        assert [record['move'] for record in records] == [1, 2]
+        assert records[0] == game(0, 'white')['move_records'][0]
+        assert store.clear('a.py', 'b.py', 'simple') == 1
+        assert store.move_records('a.py', 'b.py', 'simple') == []
+
+def test_stored_games_need_resume_or_overwrite(tmp_path):
+    path = str(tmp_path / 'store.db')
+    with ResultStore(path) as store:
+        for index in range(3):
+            store.add('a.py', 'b.py', 'simple', game(index, 'black'))
+        store.add('a.py', 'c.py', 'simple', game(0, 'black'))
+        store.commit()
+        with pytest.raises(ValueError):
+            TournamentSimulator('a.py', 'b.py', 4, store=store).pending_rounds()
+        assert len(store.games('a.py', 'b.py', 'simple')) == 3
+        assert TournamentSimulator('a.py', 'b.py', 4, store=store, resume=True).pending_rounds() == [3]
+        assert TournamentSimulator('a.py', 'b.py', 4, ko_rule='superko', store=store).pending_rounds() == [0, 1, 2, 3]
+        assert TournamentSimulator('a.py', 'b.py', 4, store=store, overwrite=True).pending_rounds() == [0, 1, 2, 3]
+        assert store.games('a.py', 'b.py', 'simple') == []
+        assert len(store.games('a.py', 'c.py', 'simple')) == 1
@@ -0,0 +1,73 @@
+import struct
+
+import pytest
+
+from shared_table import HEADER, SLOT, SharedTranspositionTable
+from transposition import EXACT, LOWER, UPPER
+
+def slot_offset(table, key):
+    return HEADER.size + key % table.size * SLOT.size
+
+def test_store_and_probe(tmp_path):
+    with SharedTranspositionTable(str(tmp_path / 'tt.bin'), max_mb=0.01) as table:
+        assert table.probe(0) is None
+        entries = {1: (3, EXACT, 2.5, (1, 4)), 2: (0, LOWER, -7.0, "PASS"), 3: (9, UPPER, 0.0, None)}
+        for key, (depth, flag, score, move) in entries.items():
+            table.store(key, depth, flag, score, move)
+        for key, entry in entries.items():
+            assert table.probe(key) == entry
+        # Another key of the same slot is a miss
+        assert table.probe(1 + table.size) is None
+
+def test_torn_entries_read_as_misses(tmp_path):
+    with SharedTranspositionTable(str(tmp_path / 'tt.bin'), max_mb=0.01) as table:
+        key, other = 5, 5 + table.size
+        table.store(key, 4, EXACT, 1.5, (0, 0))
+        first = SLOT.unpack_from(table.data, slot_offset(table, key))
+        table.new_search()
+        table.store(other, 6, LOWER, -3.25, (2, 2))
+        second = SLOT.unpack_from(table.data, slot_offset(table, key))
+        assert table.probe(other) == (6, LOWER, -3.25, (2, 2))
+        # Every mix of the words of two writes to the slot is rejected for both keys
+        for check, score, info in ((first[0], second[1], second[2]), (second[0], first[1], first[2]),
+                                   (first[0], first[1], second[2]), (second[0], second[1], first[2]),
+                                   (first[0], second[1], first[2])):
+            SLOT.pack_into(table.data, slot_offset(table, key), check, score, info)
+            assert table.probe(key) is None
+            assert table.probe(other) is None
+        SLOT.pack_into(table.data, slot_offset(table, key), *first)
+        assert table.probe(key) == (4, EXACT, 1.5, (0, 0))
+
+def test_entries_are_shared_and_kept(tmp_path):
+    path = str(tmp_path / 'tt.bin')
+    writer = SharedTranspositionTable(path, max_mb=0.01)
+    reader = SharedTranspositionTable(path, max_mb=1) # An existing file keeps its size
+    try:
+        assert reader.size == writer.size
+        writer.store(42, 2, EXACT, 0.5, (3, 1))
+        assert reader.probe(42) == (2, EXACT, 0.5, (3, 1))
+    finally:
+        writer.close()
+        reader.close()
+    with SharedTranspositionTable(path) as table:
+        assert table.probe(42) == (2, EXACT, 0.5, (3, 1))
+
+def test_deeper_entry_of_the_search_is_kept(tmp_path):
+    with SharedTranspositionTable(str(tmp_path / 'tt.bin'), max_mb=0.01) as table:
+        key, other = 7, 7 + table.size
+        table.store(key, 8, EXACT, 1.0, None)
+        table.store(other, 2, EXACT, 2.0, None)
+        assert table.probe(key) == (8, EXACT, 1.0, None)
+        table.new_search()
+        table.store(other, 2, EXACT, 2.0, None)
+        assert table.probe(other) == (2, EXACT, 2.0, None)
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'book.bin'
+    path.write_bytes(struct.pack('<4sHHQ', b'GOBK', 1, 5, 1) + bytes(SLOT.size))
+    with pytest.raises(ValueError):
+        SharedTranspositionTable(str(path))
+    with SharedTranspositionTable(str(tmp_path / 'tt.bin'), n=5):
+        pass
+    with pytest.raises(ValueError):
+        SharedTranspositionTable(str(tmp_path / 'tt.bin'), n=7)
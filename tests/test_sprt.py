@@ -0,0 +1,60 @@
+import math
+
+import pytest
+
+from sprt import SCORES, SPRT, closest_distribution, elo_to_score
+
+def test_wald_bounds():
+    test = SPRT(alpha=0.05, beta=0.05)
+    assert test.lower == pytest.approx(-math.log(19))
+    assert test.upper == pytest.approx(math.log(19))
+    test = SPRT(alpha=0.05, beta=0.1)
+    assert test.lower == pytest.approx(math.log(0.1 / 0.95))
+    assert test.upper == pytest.approx(math.log(0.9 / 0.05))
+
+def test_elo_to_score():
+    assert elo_to_score(0) == 0.5
+    assert elo_to_score(400) == pytest.approx(10 / 11)
+    assert elo_to_score(-50) == pytest.approx(1 - elo_to_score(50))
+
+def test_closest_distribution():
+    observed = [0.3, 0.2, 0.5]
+    for score in (0.4, 0.5, elo_to_score(50), 0.7):
+        p = closest_distribution(observed, score)
+        assert sum(p) == pytest.approx(1.0)
+        assert sum(x * a for x, a in zip(p, SCORES)) == pytest.approx(score)
+    # A distribution that already has the score is its own closest one
+    assert closest_distribution(observed, 0.6) == pytest.approx(observed)
+
+def test_llr_without_draws_is_binomial():
+    # With (almost) no draws the trinomial ratio reduces to the binomial one
+    test = SPRT(0.0, 50.0)
+    for result in [1] * 30 + [0] * 20:
+        test.update(result)
+    s0, s1 = elo_to_score(0), elo_to_score(50)
+    binomial = 30 * math.log(s1 / s0) + 20 * math.log((1 - s1) / (1 - s0))
+    assert test.llr() == pytest.approx(binomial, abs=0.05)
+
+def test_llr_favours_the_closer_hypothesis():
+    test = SPRT(0.0, 50.0)
+    assert test.llr() == 0.0 and test.decision() is None
+    for result in (1, 0.5, 0.5, 0):
+        test.update(result)
+    even = test.llr()
+    assert even < 0
+    test.update(1)
+    assert test.llr() > even
+    assert (test.wins, test.draws, test.losses, test.games) == (2, 2, 1, 5)
+
+def test_decisions():
+    test = SPRT(0.0, 50.0)
+    decision = None
+    while decision is None:
+        decision = test.update(1 if test.games % 3 else 0.5)
+    assert decision == "H1" and test.llr() >= test.upper
+    test = SPRT(0.0, 50.0)
+    while decision != "H0":
+        decision = test.update(0 if test.games % 2 else 0.5)
+        assert decision != "H1"
+    assert test.llr() <= test.lower
+    assert "H0 accepted" in test.summary()
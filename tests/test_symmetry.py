@@ -0,0 +1,51 @@
+import random
+
+from host import GO
+from book import OpeningBook, write_book, SOLVED
+from symmetry import (SYMMETRIES, canonical_board, canonical_hash, inverse_symmetry, transform_board,
+                      transform_move)
+
+def random_board(seed, moves=9):
+    rng = random.Random(seed)
+    go = GO(5)
+    go.init_board(5)
+    piece_type = 1
+    for _ in range(moves):
+        go.make_move(rng.choice(go.moves_from_mask(go.legal_moves(piece_type))), piece_type)
+        piece_type = 3 - piece_type
+    return go.board
+
+def test_symmetric_copies_share_hash():
+    for seed in range(10):
+        board = random_board(seed)
+        for piece_type in (1, 2):
+            key = canonical_hash(board, piece_type)[0]
+            for t in range(SYMMETRIES):
+                assert canonical_hash(transform_board(board, t), piece_type)[0] == key
+
+def test_canonical_board_uses_side_to_move():
+    for seed in range(20):
+        board = random_board(seed)
+        for piece_type in (1, 2):
+            key, t = canonical_hash(board, piece_type)
+            canonical, _, u = canonical_board(board, board, piece_type)
+            assert u == t
+            assert canonical == transform_board(board, t)
+            assert canonical_hash(canonical, piece_type) == (key, 0)
+
+def test_book_moves_map_back(tmp_path):
+    path = str(tmp_path / 'book.bin')
+    board = random_board(7)
+    move = next((i, j) for i in range(5) for j in range(5) if board[i][j] == 0 and (i, j) != (2, 2))
+    entries = {}
+    for piece_type in (1, 2):
+        key, t = canonical_hash(board, piece_type)
+        entries[key] = (transform_move(move, t, 5), SOLVED, float(piece_type))
+    write_book(path, entries)
+    with OpeningBook(path) as book:
+        for piece_type in (1, 2):
+            for t in range(SYMMETRIES):
+                found, depth, score = book.lookup(transform_board(board, t), piece_type)
+                assert found == transform_move(move, t, 5)
+                assert (depth, score) == (SOLVED, piece_type)
+            assert transform_move(transform_move(move, 3, 5), inverse_symmetry(3), 5) == move
@@ -0,0 +1,90 @@
+from copy import deepcopy
+
+import pytest
+
+from book import write_book
+from position import Position
+from symmetry import SYMMETRIES, transform_board
+from tablebase import Solver, Tablebase, sample_roots
+
+def filled(empty_points, white=()):
+    board = [[1] * 5 for _ in range(5)]
+    for i, j in empty_points:
+        board[i][j] = 0
+    for i, j in white:
+        board[i][j] = 2
+    return board
+
+def reference(go, piece_type, passed, moves_left, komi=2.5):
+    # Plain minimax over copies with place_chess, independent of make_move/undo_move and the memo
+    def margin(board):
+        own = sum(row.count(piece_type) for row in board)
+        other = sum(row.count(3 - piece_type) for row in board)
+        return own - other + (komi if piece_type == 2 else -komi)
+    if moves_left <= 0:
+        return margin(go.board)
+    best = float('-inf')
+    for i in range(5):
+        for j in range(5):
+            if go.board[i][j] == 0 and go.valid_place_check(i, j, piece_type, test_check=True):
+                child = go.copy_board()
+                child.place_chess(i, j, piece_type)
+                child.died_pieces = child.remove_died_pieces(3 - piece_type)
+                best = max(best, -reference(child, 3 - piece_type, False, moves_left - 1, komi))
+    if passed:
+        best = max(best, margin(go.board))
+    else:
+        child = go.copy_board()
+        child.previous_board = deepcopy(child.board)
+        child.previous_hash = child.board_hash
+        child.died_pieces = []
+        best = max(best, -reference(child, 3 - piece_type, True, moves_left - 1, komi))
+    return best
+
+def test_values_by_hand():
+    board, before = filled([(0, 0), (4, 4)]), filled([(0, 0), (4, 4), (2, 2)])
+    # Black fills one of its two eyes, the last move: 24 stones against komi
+    assert Solver().solve_position(Position.from_input(1, before, board)) == (21.5, (0, 0))
+    # Every white move is suicide, so white passes and black's 23 stones count
+    assert Solver().solve_position(Position.from_input(2, before, board)) == (-20.5, "PASS")
+    # After a pass, passing again ends the game at once
+    assert Solver().solve_position(Position.from_input(2, board, board)) == (-20.5, "PASS")
+
+def test_capture_is_found():
+    # White (0, 0) and (0, 1) have one liberty at (0, 2): taking them beats filling (4, 4) or passing
+    board = filled([(0, 2), (4, 4)], white=[(0, 0), (0, 1)])
+    before = filled([(0, 2), (4, 4), (3, 3)], white=[(0, 0), (0, 1)])
+    assert Solver().solve_position(Position.from_input(1, before, board)) == (19.5, (0, 2))
+
+@pytest.mark.parametrize('seed', range(3))
+def test_values_match_reference(seed):
+    solver = Solver()
+    for position in sample_roots(8, 4, seed):
+        go = position.to_go()
+        empties = sum(row.count(0) for row in go.board)
+        value, move = solver.solve_position(position)
+        assert value == reference(go, position.piece_type, position.previous == position.stones, empties - 1)
+        if move not in ("PASS", None):
+            assert go.make_move(move, position.piece_type)
+
+def test_symmetric_positions_probe_the_same_value(tmp_path):
+    solver = Solver()
+    roots = sample_roots(6, 4, 7)
+    for position in roots:
+        solver.solve_position(position)
+    path = str(tmp_path / 'tablebase.bin')
+    write_book(path, solver.entries)
+    with Tablebase(path) as tablebase:
+        for position in roots:
+            value = Solver().solve_position(position)[0]
+            for t in range(SYMMETRIES):
+                copy = Position.from_input(position.piece_type, transform_board(position.previous_board, t),
+                                           transform_board(position.board, t))
+                move, stored = tablebase.probe_position(copy)
+                assert stored == value
+                if move != "PASS":
+                    go = copy.to_go()
+                    moves_left = sum(row.count(0) for row in go.board) - 1
+                    assert go.make_move(move, copy.piece_type)
+                    # The stored move reaches the solved value
+                    assert -Solver().solve(go, 3 - copy.piece_type, False, moves_left - 1)[0] == value
@@ -0,0 +1,93 @@
+import io
+import os
+import runpy
+import threading
+from multiprocessing import shared_memory
+
+import pytest
+
+from read import readInput, readOutput
+from transport import default_input, default_output, read_text, redirect, write_text
+from write import writeNextInput, writeOutput
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def boards():
+    previous_board = [[0] * 5 for _ in range(5)]
+    board = [[0] * 5 for _ in range(5)]
+    board[2][2] = 1
+    return previous_board, board
+
+def test_redirect_runs_player_in_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    previous_board, board = boards()
+    inputs, outputs = [], []
+    writeNextInput(2, previous_board, board, inputs.append)
+    with redirect(lambda: inputs[0], outputs.append):
+        runpy.run_path(os.path.join(ROOT, 'players', 'random_player.py'), run_name='__main__')
+    move_type, x, y = readOutput(lambda: outputs[0])
+    assert move_type == "MOVE" and board[x][y] == 0
+    assert os.listdir(tmp_path) == []
+
+def test_redirect_nests_and_restores():
+    assert (default_input(), default_output()) == ("input.txt", "output.txt")
+    with redirect("a.txt"):
+        assert (default_input(), default_output()) == ("a.txt", "output.txt")
+        with redirect(output="b.txt"):
+            assert (default_input(), default_output()) == ("a.txt", "b.txt")
+        assert default_output() == "output.txt"
+    with pytest.raises(RuntimeError):
+        with redirect("c.txt", "d.txt"):
+            raise RuntimeError
+    assert (default_input(), default_output()) == ("input.txt", "output.txt")
+
+def test_redirect_is_per_thread():
+    seen = {}
+    ready, done = threading.Event(), threading.Event()
+
+    def game(name):
+        with redirect(f"{name}.in"):
+            ready.set()
+            done.wait(5)
+            seen[name] = default_input()
+
+    thread = threading.Thread(target=game, args=("other",))
+    thread.start()
+    ready.wait(5)
+    seen["main"] = default_input()
+    done.set()
+    thread.join()
+    assert seen == {"other": "other.in", "main": "input.txt"}
+
+def test_stream_carries_several_messages():
+    previous_board, board = boards()
+    stream = io.StringIO()
+    writeNextInput(1, previous_board, board, stream)
+    writeOutput((3, 4), stream)
+    writeOutput("PASS", stream)
+    stream.seek(0)
+    assert readInput(5, stream) == (1, previous_board, board)
+    assert readOutput(stream) == ("MOVE", 3, 4)
+    assert readOutput(stream) == ("PASS", -1, -1)
+    with pytest.raises(EOFError):
+        read_text(stream)
+
+def test_shared_memory_round_trip():
+    previous_board, board = boards()
+    memory = shared_memory.SharedMemory(create=True, size=64)
+    try:
+        writeNextInput(1, previous_board, board, memory)
+        assert readInput(5, memory) == (1, previous_board, board)
+        writeOutput((0, 1), memory)
+        assert readOutput(memory) == ("MOVE", 0, 1)
+        with pytest.raises(ValueError):
+            write_text(memory, "x" * 65)
+    finally:
+        memory.close()
+        memory.unlink()
+
+def test_file_round_trip(tmp_path):
+    path = tmp_path / 'output.txt'
+    writeOutput((1, 2), path)
+    assert path.read_text() == "1,2"
+    assert readOutput(path) == ("MOVE", 1, 2)
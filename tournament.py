@@ -4,10 +4,21 @@ import time
 import os
 import sys
 import random
+import shutil
+import tempfile
+from multiprocessing import Pool, util
 from read import readInput, readOutput
 from write import writeNextInput
 import argparse
 from host import GO
+from position import Position
+from engine import EngineClient, EngineError, EngineTimeout
+from player_api import load_player
+from league import DEFAULT_LEAGUE_FILE, read_games, append_game, schedule, print_ratings
+from sprt import SPRT
+from instrumentation import process_usage, self_usage, run_process, print_summary, export
+from results_store import DEFAULT_STORE, ResultStore
+from engine import format_board
 
 BOARD_SIZE = 5
 PLAYER_DIR = 'players'
@@ -15,10 +26,37 @@ DEFAULT_PLAYER1 = 'alphabeta_player.py'
 DEFAULT_PLAYER2 = 'my_player.py'
 
 class TournamentSimulator:
-    def __init__(self, player1, player2, rounds=20):
+    def __init__(self, player1, player2, rounds=20, ko_rule="simple", persistent=True, jobs=1, workdir=None,
+                 in_process=True, sprt=None, store=None, resume=False, overwrite=False):
         self.player1 = player1
         self.player2 = player2
         self.rounds = rounds
+        self.ko_rule = ko_rule
+        self.jobs = jobs # Games played at the same time, each in its own worker process
+        # Directory of input.txt/output.txt for players started per move, default the current one
+        self.workdir = workdir
+        # Persistent players run as one engine.py process each for the whole tournament,
+        # otherwise a new Python process is started for every move
+        self.persistent = persistent
+        self.engines = {}
+        # Players defining select_move (player_api) are called in this process; the
+        # others, or all of them when in_process is False, run as processes
+        self.in_process = in_process
+        self.loaded = {}
+        # SPRT of player1 against player2 checked after every game; rounds is then the maximum
+        self.sprt = sprt
+        # ResultStore every finished game is written to; with resume the games it
+        # already holds for these players are not played again, with overwrite they are deleted
+        self.store = store
+        self.resume = resume
+        self.overwrite = overwrite
+        self.last_move = None
+        self.move_time = 0.0
+        self.move_count = 0
+        # One record per move: wall and CPU time, peak memory (instrumentation.FIELDS)
+        self.move_records = []
+        self.game_number = 0
+        self.p1_is_black = True # Seat of player1 in the current game
         self.results = {
             'p1_as_black_wins': 0,
             'p1_as_black_losses': 0,
@@ -39,21 +77,101 @@ class TournamentSimulator:
         self.previous_board = [[0]*BOARD_SIZE for _ in range(BOARD_SIZE)]
         self.turn = 1  # 1 for Black, 2 for White
         self.pass_count = 0
+        self.moves = []
+        # One GO instance per game keeps the position history needed by the KO rules
+        self.go = GO(BOARD_SIZE, self.ko_rule)
+        self.go.init_board(BOARD_SIZE)
     
+    def scratch_path(self, name):
+        return os.path.join(self.workdir, name) if self.workdir else name
+
     def write_input(self):
-        writeNextInput(self.turn, self.previous_board, self.board)
+        writeNextInput(self.turn, self.previous_board, self.board, self.scratch_path("input.txt"))
+
+    def get_engine(self, player_file):
+        if player_file not in self.engines:
+            self.engines[player_file] = EngineClient(os.path.join(PLAYER_DIR, player_file), timeout=9)
+        return self.engines[player_file]
+
+    def get_in_process(self, player_file):
+        if not self.in_process:
+            return None
+        if player_file not in self.loaded:
+            self.loaded[player_file] = load_player(player_file, PLAYER_DIR)
+        return self.loaded[player_file]
+
+    def player_mode(self, player_file):
+        if self.get_in_process(player_file) is not None:
+            return "in process"
+        return "persistent engine" if self.persistent else "one process per move"
+
+    def close_engines(self):
+        for engine in self.engines.values():
+            engine.close()
+        self.engines = {}
 
     def run_player(self, player_file):
+        start = time.time()
+        select_move = self.get_in_process(player_file)
+        mode = self.player_mode(player_file)
+        before = after = None
+        timed_out = False
         try:
-            subprocess.run(["python", os.path.join(PLAYER_DIR, player_file)], timeout=9)
+            if select_move is not None:
+                before = self_usage()
+                try:
+                    move = select_move(Position.from_go(self.go, self.turn), start + 9)
+                    self.last_move = ("PASS", -1, -1) if move == "PASS" else ("MOVE", move[0], move[1])
+                except Exception as e:
+                    print(f"Error in player {player_file}: {e}")
+                    self.last_move = ("PASS", -1, -1)
+                after = self_usage()
+                # The move cannot be interrupted, so the time limit is checked afterwards
+                if time.time() - start > 9:
+                    raise subprocess.TimeoutExpired(player_file, 9)
+            elif self.persistent:
+                engine = self.get_engine(player_file)
+                try:
+                    engine.start()
+                    pid = engine.process.pid
+                    before = process_usage(pid)
+                    self.last_move = engine.genmove(self.turn, self.previous_board, self.board)
+                    after = process_usage(pid)
+                except EngineTimeout:
+                    raise subprocess.TimeoutExpired(player_file, 9)
+                except EngineError as e:
+                    print(f"Error reading player output: {e}")
+                    self.last_move = ("PASS", -1, -1)
+            else:
+                before = (0.0, 0.0, 0.0)
+                timed_out, after = run_process(["python", os.path.abspath(os.path.join(PLAYER_DIR, player_file))],
+                                               9, self.workdir)
+                if timed_out:
+                    raise subprocess.TimeoutExpired(player_file, 9)
         except subprocess.TimeoutExpired:
             print(f"Player {player_file} timed out!")
+            timed_out = True
             return False
+        finally:
+            wall = time.time() - start
+            self.move_time += wall
+            self.move_count += 1
+            measured = before is not None and after is not None
+            self.move_records.append({
+                'player': player_file, 'game': self.game_number, 'move': self.go.n_move + 1,
+                'color': 'black' if self.turn == 1 else 'white', 'mode': mode, 'wall': wall,
+                'user': after[0] - before[0] if measured else None,
+                'sys': after[1] - before[1] if measured else None,
+                # Peak memory of the player's process; in process it is the tournament's own peak
+                'max_rss_mb': after[2] if after is not None else None,
+                'timed_out': timed_out})
         return True
 
-    def read_move(self):
+    def read_move(self, player_file):
+        if self.persistent or self.get_in_process(player_file) is not None:
+            return self.last_move
         try:
-            move_type, x, y = readOutput()
+            move_type, x, y = readOutput(self.scratch_path("output.txt"))
             return move_type, x, y
         except Exception as e:
             print(f"Error reading player output: {e}")
@@ -62,18 +180,15 @@ class TournamentSimulator:
     def apply_move(self, move_type, x, y):
         self.previous_board = [row[:] for row in self.board]
         if move_type == "MOVE":
-            game = GO(BOARD_SIZE)
-            game.set_board(self.turn, self.previous_board, self.board)
-            if game.valid_place_check(x, y, self.turn):
-                game.place_chess(x, y, self.turn)
-                game.remove_died_pieces(3 - self.turn)
-                self.board = [row[:] for row in game.board]
+            if self.go.make_move((x, y), self.turn):
+                self.board = [row[:] for row in self.go.board]
                 self.pass_count = 0
                 return True
             else:
                 print(f"Invalid move by {self.current_player()} at {x},{y}")
                 return False
         else:  # PASS
+            self.go.make_move("PASS", self.turn)
             self.pass_count += 1
             return True
 
@@ -98,62 +213,69 @@ class TournamentSimulator:
             return True
         
         # Check if current player has any valid moves
-        game = GO(BOARD_SIZE)
-        game.set_board(self.turn, self.previous_board, self.board)
-        has_valid_moves = False
-        
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
-                if self.board[i][j] == 0 and game.valid_place_check(i, j, self.turn):
-                    has_valid_moves = True
-                    break
-            if has_valid_moves:
-                break
+        has_valid_moves = self.go.legal_moves(self.turn) != 0
         
         # If current player has no valid moves, they must pass
         if not has_valid_moves and sum(1 for i in range(BOARD_SIZE) for j in range(BOARD_SIZE) if self.board[i][j] == 0) > 0:
-            self.pass_count += 1
             print(f"{self.current_player()} has no valid moves (forced pass)")
+            self.apply_move("PASS", -1, -1)
+            self.moves.append("PASS")
             self.next_turn()
             
         return False
 
+    def count_result(self, winner):
+        """
+        Count a finished game in self.results by seat, so that a player against
+        itself counts once as player1 and once as player2.
+
+        :param winner: "black", "white" or "tie".
+        :return: None.
+        """
+        black, white = ('p1', 'p2') if self.p1_is_black else ('p2', 'p1')
+        if winner == "black":
+            self.results[f'{black}_as_black_wins'] += 1
+            self.results[f'{white}_as_white_losses'] += 1
+        elif winner == "white":
+            self.results[f'{white}_as_white_wins'] += 1
+            self.results[f'{black}_as_black_losses'] += 1
+        else:
+            self.results[f'{black}_as_black_ties'] += 1
+            self.results[f'{white}_as_white_ties'] += 1
+
     def declare_winner(self):
         black_score = sum(sum(1 for cell in row if cell == 1) for row in self.board)
         white_score = sum(sum(1 for cell in row if cell == 2) for row in self.board) + 2.5  # Komi rule
         
         if black_score > white_score:
             winner = "Black"
-            # Update results based on who played black
-            if self.black_player == self.player1:
-                self.results['p1_as_black_wins'] += 1
-                self.results['p2_as_white_losses'] += 1
-            else:
-                self.results['p2_as_black_wins'] += 1
-                self.results['p1_as_white_losses'] += 1
         elif white_score > black_score:
             winner = "White"
-            # Update results based on who played white
-            if self.white_player == self.player1:
-                self.results['p1_as_white_wins'] += 1
-                self.results['p2_as_black_losses'] += 1
-            else:
-                self.results['p2_as_white_wins'] += 1
-                self.results['p1_as_black_losses'] += 1
         else:
             winner = "Tie"
-            # Update ties based on who played which color
-            if self.black_player == self.player1:
-                self.results['p1_as_black_ties'] += 1
-                self.results['p2_as_white_ties'] += 1
-            else:
-                self.results['p2_as_black_ties'] += 1
-                self.results['p1_as_white_ties'] += 1
+        self.count_result(winner.lower())
         
         return winner, black_score, white_score
 
+    def game_record(self, winner, reason, move_time):
+        black_score = sum(sum(1 for cell in row if cell == 1) for row in self.board)
+        white_score = sum(sum(1 for cell in row if cell == 2) for row in self.board) + 2.5  # Komi rule
+        return {'game': self.game_number, 'black': self.black_player, 'white': self.white_player,
+                'winner': winner, 'reason': reason, 'black_score': black_score, 'white_score': white_score,
+                'moves': self.moves, 'board': format_board(self.board), 'move_time': self.move_time - move_time,
+                'finished': time.time(),
+                'move_records': [record for record in self.move_records if record['game'] == self.game_number]}
+
     def run_single_game(self, p1_is_black):
+        """
+        Play one game and count its result in self.results.
+
+        :param p1_is_black: whether player1 plays black.
+        :return: game record (players, winner, termination reason, scores, moves, final board, time).
+        """
         self.reset_game()
+        move_time = self.move_time
+        self.p1_is_black = p1_is_black
         
         if p1_is_black:
             self.black_player = self.player1
@@ -163,71 +285,145 @@ class TournamentSimulator:
             self.white_player = self.player1
         
         print(f"\nGame starting: {self.black_player} (Black) vs {self.white_player} (White)")
+        for player in (self.black_player, self.white_player):
+            if self.persistent and self.get_in_process(player) is None:
+                try:
+                    self.get_engine(player).new_game()
+                except EngineError as e:
+                    print(f"Error starting {player}: {e}")
         
         while True:
             current_player = self.black_player if self.turn == 1 else self.white_player
             
-            self.write_input()
+            if not self.persistent and self.get_in_process(current_player) is None:
+                self.write_input()
             if not self.run_player(current_player):
                 # Player timed out, other player wins
                 print(f"{current_player} timed out! Game over.")
-                if current_player == self.black_player:
-                    if current_player == self.player1:
-                        self.results['p1_as_black_losses'] += 1
-                        self.results['p2_as_white_wins'] += 1
-                    else:
-                        self.results['p2_as_black_losses'] += 1
-                        self.results['p1_as_white_wins'] += 1
-                else:  # current_player is white
-                    if current_player == self.player1:
-                        self.results['p1_as_white_losses'] += 1
-                        self.results['p2_as_black_wins'] += 1
-                    else:
-                        self.results['p2_as_white_losses'] += 1
-                        self.results['p1_as_black_wins'] += 1
-                break
+                self.count_result("white" if self.turn == 1 else "black")
+                return self.game_record("white" if self.turn == 1 else "black", "timeout", move_time)
             
-            move_type, x, y = self.read_move()
+            move_type, x, y = self.read_move(current_player)
             move_desc = f"{x},{y}" if move_type == "MOVE" else "PASS"
             print(f"{current_player} ({('Black' if self.turn == 1 else 'White')}): {move_desc}")
+            self.moves.append(move_desc)
             
             if not self.apply_move(move_type, x, y):
                 # Invalid move, player loses
                 print(f"Invalid move by {current_player}! Game over.")
-                if current_player == self.black_player:
-                    if current_player == self.player1:
-                        self.results['p1_as_black_losses'] += 1
-                        self.results['p2_as_white_wins'] += 1
-                    else:
-                        self.results['p2_as_black_losses'] += 1
-                        self.results['p1_as_white_wins'] += 1
-                else:  # current_player is white
-                    if current_player == self.player1:
-                        self.results['p1_as_white_losses'] += 1
-                        self.results['p2_as_black_wins'] += 1
-                    else:
-                        self.results['p2_as_white_losses'] += 1
-                        self.results['p1_as_black_wins'] += 1
-                break
+                self.count_result("white" if self.turn == 1 else "black")
+                return self.game_record("white" if self.turn == 1 else "black", "invalid", move_time)
             
             if self.check_game_end():
                 winner, black_score, white_score = self.declare_winner()
                 print(f"Game over! {winner} wins! Score - Black: {black_score} | White: {white_score:.1f}")
-                break
+                return self.game_record(winner.lower(), "score", move_time)
             
             self.next_turn()
     
     def run_tournament(self):
         print(f"Starting tournament: {self.player1} vs {self.player2} ({self.rounds} rounds)")
+        rounds = self.pending_rounds()
         
-        for i in range(self.rounds):
-            p1_is_black = i % 2 == 0  # Alternate who starts as black
-            print(f"\n--- Round {i+1}/{self.rounds} ---")
-            self.run_single_game(p1_is_black)
+        try:
+            if self.jobs > 1:
+                self.run_parallel(rounds)
+            else:
+                for i in rounds:
+                    p1_is_black = i % 2 == 0  # Alternate who starts as black
+                    print(f"\n--- Round {i+1}/{self.rounds} ---")
+                    self.game_number = i
+                    record = self.run_single_game(p1_is_black)
+                    self.store_game(record)
+                    if self.sprt_update(record):
+                        break
+        finally:
+            self.close_engines()
+            if self.store is not None:
+                self.store.commit()
         
         self.print_results()
     
+    def pending_rounds(self):
+        """
+        List the rounds left to play. With resume, the rounds already in the store
+        are skipped and their results counted, and the SPRT replays them in order.
+        Otherwise the stored games of a previous run are only deleted with overwrite.
+
+        :return: list of round indices.
+        :raises ValueError: if the store already holds games of this tournament and
+                            neither resume nor overwrite is set.
+        """
+        if self.store is None:
+            return list(range(self.rounds))
+        stored = self.store.games(self.player1, self.player2, self.ko_rule)
+        if not self.resume:
+            if stored and not self.overwrite:
+                raise ValueError(f"{self.store.path} already holds {len(stored)} games of {self.player1} vs "
+                                 f"{self.player2} ({self.ko_rule} ko): pass --resume to continue them or "
+                                 f"--overwrite to replace them")
+            if stored:
+                replaced = self.store.clear(self.player1, self.player2, self.ko_rule)
+                print(f"Replacing {replaced} games of a previous run in {self.store.path}")
+            return list(range(self.rounds))
+        done = {game['game'] for game in stored}
+        print(f"Resuming: {len(done)} games already in {self.store.path}")
+        for game in stored:
+            if self.sprt_update(game):
+                return []
+        return [i for i in range(self.rounds) if i not in done]
+    
+    def store_game(self, record):
+        if self.store is not None:
+            self.store.add(self.player1, self.player2, self.ko_rule, record)
+    
+    def run_parallel(self, rounds):
+        print(f"Playing {self.jobs} games at a time")
+        pool = Pool(self.jobs, initializer=init_worker,
+                    initargs=(self.player1, self.player2, self.ko_rule, self.persistent, self.in_process))
+        try:
+            # imap returns the games in round order, so the merged counters and the log are deterministic
+            for results, move_time, move_count, move_records, record in pool.imap(play_round, rounds):
+                for key, value in results.items():
+                    self.results[key] += value
+                self.move_time += move_time
+                self.move_count += move_count
+                self.move_records.extend(move_records)
+                self.store_game(record)
+                print(f"Round {record['game']+1}/{self.rounds}: {round_summary(results, self.player1, self.player2)}")
+                if self.sprt_update(record):
+                    # Games still running in the workers are dropped
+                    pool.terminate()
+                    break
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+    def sprt_update(self, record):
+        """
+        Add the result of one game to the SPRT.
+
+        :param record: game record, as returned by run_single_game.
+        :return: whether the test has decided and the tournament can stop.
+        """
+        if self.sprt is None:
+            return False
+        if record['winner'] == "tie":
+            score = 0.5
+        else:
+            # player1 is black in even rounds; compared by seat so that self-play counts too
+            score = 1 if (record['winner'] == "black") == (record['game'] % 2 == 0) else 0
+        decision = self.sprt.update(score)
+        print(f"LLR {self.sprt.llr():.2f} [{self.sprt.lower:.2f}, {self.sprt.upper:.2f}]")
+        return decision is not None
+
     def print_results(self):
+        if self.store is not None:
+            # Counted over the games of the store, including the ones of a resumed run
+            self.results = self.store.results(self.player1, self.player2, self.ko_rule)
         p1_total_wins = self.results['p1_as_black_wins'] + self.results['p1_as_white_wins']
         p1_total_losses = self.results['p1_as_black_losses'] + self.results['p1_as_white_losses']
         p1_total_ties = self.results['p1_as_black_ties'] + self.results['p1_as_white_ties']
@@ -246,6 +442,19 @@ class TournamentSimulator:
         print(f"\n{self.player2} plays as Black | Win: {self.results['p2_as_black_wins']} | Lose: {self.results['p2_as_black_losses']} | Tie: {self.results['p2_as_black_ties']}")
         print(f"{self.player2} plays as White | Win: {self.results['p2_as_white_wins']} | Lose: {self.results['p2_as_white_losses']} | Tie: {self.results['p2_as_white_ties']}")
         
+        if self.move_count:
+            modes = f"{self.player1}: {self.player_mode(self.player1)}, {self.player2}: {self.player_mode(self.player2)}"
+            print(f"\nAverage time per move: {self.move_time / self.move_count * 1000:.1f} ms over {self.move_count} moves ({modes})")
+            print_summary(self.move_records, limit=9)
+        
+        if self.sprt is not None:
+            print(f"\n{self.sprt.summary()}")
+            decision = self.sprt.decision()
+            if decision == "H1":
+                print(f"{self.player1} is stronger than {self.player2} (H1: {self.sprt.elo1:+g} Elo)")
+            elif decision == "H0":
+                print(f"{self.player1} is not stronger than {self.player2} (H0: {self.sprt.elo0:+g} Elo)")
+        
         print("\nOverall:")
         print(f"{self.player1}: {p1_total_wins} wins, {p1_total_losses} losses, {p1_total_ties} ties")
         print(f"{self.player2}: {p2_total_wins} wins, {p2_total_losses} losses, {p2_total_ties} ties")
@@ -260,6 +469,73 @@ class TournamentSimulator:
             print("\nTournament ends in a tie!")
 
 
+_worker = None # TournamentSimulator of a worker process of run_parallel
+
+def init_worker(player1, player2, ko_rule, persistent, in_process):
+    global _worker
+    workdir = tempfile.mkdtemp(prefix='go_tournament_')
+    _worker = TournamentSimulator(player1, player2, 0, ko_rule, persistent, workdir=workdir, in_process=in_process)
+    util.Finalize(None, _worker.close_engines, exitpriority=10)
+    util.Finalize(None, shutil.rmtree, args=(workdir, True), exitpriority=5)
+    sys.stdout = open(os.devnull, 'w') # The move logs of parallel games would interleave
+
+def play_round(i):
+    _worker.results = dict.fromkeys(_worker.results, 0)
+    _worker.move_time, _worker.move_count, _worker.move_records = 0.0, 0, []
+    _worker.game_number = i
+    record = _worker.run_single_game(i % 2 == 0) # Alternate who starts as black
+    return _worker.results, _worker.move_time, _worker.move_count, _worker.move_records, record
+
+def play_game(pairing):
+    black, white = pairing
+    _worker.player1, _worker.player2 = black, white
+    _worker.results = dict.fromkeys(_worker.results, 0)
+    _worker.run_single_game(True)
+    if _worker.results['p1_as_black_wins']:
+        winner = "black"
+    elif _worker.results['p2_as_white_wins']:
+        winner = "white"
+    else:
+        winner = "tie"
+    return {"black": black, "white": white, "winner": winner}
+
+def run_league(players, games, path=DEFAULT_LEAGUE_FILE, jobs=1, ko_rule="simple", persistent=True, in_process=True):
+    """
+    Play a round-robin league and print the Elo ratings of the players.
+
+    Every finished game is appended to path at once, so an interrupted league
+    resumes where it stopped and a finished one is extended by raising games.
+
+    :param players: player filenames in players/.
+    :param games: games per pair of players, colours alternating.
+    :param path: league file (league.py).
+    :param jobs: games played at the same time, each in its own worker process.
+    """
+    played = read_games(path)
+    pairings = schedule(players, games, played)
+    print(f"League: {len(players)} players, {games} games per pair, {len(played)} games in {path}, {len(pairings)} to play")
+    if pairings:
+        pool = Pool(jobs, initializer=init_worker, initargs=(None, None, ko_rule, persistent, in_process))
+        try:
+            for i, game in enumerate(pool.imap_unordered(play_game, pairings)):
+                append_game(path, game)
+                played.append(game)
+                print(f"Game {i+1}/{len(pairings)}: {game['black']} (Black) vs {game['white']} (White): {game['winner']}")
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+    print_ratings([game for game in played if game['black'] in players and game['white'] in players])
+
+def round_summary(results, player1, player2):
+    if results['p1_as_black_wins'] or results['p1_as_white_wins']:
+        return f"{player1} wins"
+    if results['p2_as_black_wins'] or results['p2_as_white_wins']:
+        return f"{player2} wins"
+    return "tie"
+
 def list_players():
     players = [f for f in os.listdir(PLAYER_DIR) if f.endswith('.py')]
     return players
@@ -268,8 +544,37 @@ def main():
     parser = argparse.ArgumentParser(description='Run a tournament between two Go AI players')
     parser.add_argument('-p1', '--player1', help='First player filename (must be in players/ directory)')
     parser.add_argument('-p2', '--player2', help='Second player filename (must be in players/ directory)')
-    parser.add_argument('-n', '--rounds', type=int, default=20, help='Number of rounds to play (default: 20)')
+    parser.add_argument('-n', '--rounds', type=int, default=20, help='Number of rounds to play, or games per pair in a league (default: 20)')
+    parser.add_argument('--ko', choices=['simple', 'superko'], default='simple',
+                        help='KO rule: simple (assignment rules) or positional superko (default: simple)')
+    parser.add_argument('--per-move', action='store_true',
+                        help='Start a new Python process for every move instead of one persistent engine per player (implies --isolate)')
+    parser.add_argument('--isolate', action='store_true',
+                        help='Run every player as a separate process, even players that can be called in process')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Number of games played in parallel, each in its own worker process (default: 1)')
+    parser.add_argument('--league', nargs='*', metavar='PLAYER',
+                        help='Round-robin league between the given players (default: every player in players/) with Elo ratings')
+    parser.add_argument('--league-file', default=DEFAULT_LEAGUE_FILE,
+                        help=f'File the league games are appended to and resumed from (default: {DEFAULT_LEAGUE_FILE})')
+    parser.add_argument('--move-stats', metavar='PATH',
+                        help='Write the time, CPU and memory of every move to PATH, JSON if it ends in .json, CSV otherwise')
+    parser.add_argument('--store', metavar='PATH',
+                        help=f'SQLite database every finished game is stored in, e.g. {DEFAULT_STORE} (default: none)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip the rounds of this tournament already in --store and count their results')
+    parser.add_argument('--overwrite', action='store_true',
+                        help='Delete the games of this tournament already in --store and play every round again')
+    parser.add_argument('--sprt', action='store_true',
+                        help='Stop as soon as a sequential probability ratio test decides between --elo0 and --elo1 for player 1; -n is then the maximum')
+    parser.add_argument('--elo0', type=float, default=0, help='SPRT: Elo difference of H0 (default: 0)')
+    parser.add_argument('--elo1', type=float, default=50, help='SPRT: Elo difference of H1 (default: 50)')
+    parser.add_argument('--alpha', type=float, default=0.05, help='SPRT: false positive rate (default: 0.05)')
+    parser.add_argument('--beta', type=float, default=0.05, help='SPRT: false negative rate (default: 0.05)')
     args = parser.parse_args()
+    if args.resume and args.overwrite:
+        print("Error: --resume keeps the stored games and --overwrite deletes them, pass only one")
+        sys.exit(1)
     
     players = list_players()
     
@@ -277,6 +582,16 @@ def main():
         print("Error: No player files found in 'players/' directory")
         sys.exit(1)
     
+    if args.league is not None:
+        league_players = args.league or players
+        unknown = [player for player in league_players if player not in players]
+        if unknown or len(set(league_players)) < 2:
+            print(f"Error: a league needs at least two players from 'players/' (unknown: {', '.join(unknown) or 'none'})")
+            sys.exit(1)
+        run_league(league_players, args.rounds, args.league_file, args.jobs, args.ko, not args.per_move,
+                   not (args.isolate or args.per_move))
+        return
+    
     # Use the default players if available and not specified otherwise
     player1 = args.player1
     player2 = args.player2
@@ -336,8 +651,22 @@ def main():
                 pass
             print("Invalid choice. Try again.")
     
-    tournament = TournamentSimulator(player1, player2, args.rounds)
-    tournament.run_tournament()
+    sprt = SPRT(args.elo0, args.elo1, args.alpha, args.beta) if args.sprt else None
+    tournament = TournamentSimulator(player1, player2, args.rounds, args.ko, not args.per_move, args.jobs,
+                                     in_process=not (args.isolate or args.per_move), sprt=sprt,
+                                     store=ResultStore(args.store) if args.store else None, resume=args.resume,
+                                     overwrite=args.overwrite)
+    try:
+        tournament.run_tournament()
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        if tournament.store is not None:
+            tournament.store.close()
+    if args.move_stats:
+        export(args.move_stats, tournament.move_records)
+        print(f"Move statistics written to {args.move_stats}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,108 @@
+import os
+import mmap
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Where read.readInput/readOutput and write.writeOutput/writeNextInput go when no
+# transport is passed. Context variables, so threads and asyncio tasks can redirect
+# their own games without affecting each other.
+_input = ContextVar('input', default="input.txt")
+_output = ContextVar('output', default="output.txt")
+
+def default_input():
+    return _input.get()
+
+def default_output():
+    return _output.get()
+
+@contextmanager
+def redirect(input=None, output=None):
+    '''
+    Change the default transports of read.py and write.py for the current thread,
+    e.g. to run an unchanged player script on in-memory input and output:
+
+        with redirect(lambda: text, moves.append):
+            runpy.run_path("players/random_player.py")
+
+    :param input: transport of input.txt, None keeps the current one.
+    :param output: transport of output.txt, None keeps the current one.
+    '''
+    tokens = [(var, var.set(value)) for var, value in ((_input, input), (_output, output)) if value is not None]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+def _buffer(transport):
+    if hasattr(transport, 'buf'): # multiprocessing.shared_memory.SharedMemory
+        return transport.buf
+    if isinstance(transport, (bytearray, memoryview, mmap.mmap)):
+        return transport
+    return None
+
+def read_text(transport, lines=None):
+    '''
+    Read the text of input.txt or output.txt from a transport.
+
+    A transport is one of:
+      - a file path (str or os.PathLike): the whole file is read;
+      - a pipe or any text stream with readline (e.g. sys.stdin): only the given
+        number of lines is read, so several messages can share one stream;
+      - a callable taking no argument and returning the text (in-process);
+      - a shared-memory buffer (SharedMemory, mmap, bytearray or memoryview): UTF-8
+        text ended by a NUL byte or by the end of the buffer.
+
+    :param transport: where to read from.
+    :param lines: number of lines of the message, used by streams only.
+    :return: text without trailing newline.
+    '''
+    if isinstance(transport, (str, os.PathLike)):
+        with open(transport, 'r') as f:
+            return f.read()
+    buf = _buffer(transport)
+    if buf is not None:
+        data = bytes(buf)
+        end = data.find(b'\0')
+        return data[:end if end >= 0 else len(data)].decode()
+    if hasattr(transport, 'readline'):
+        text = "".join(transport.readline() for _ in range(lines or 1))
+        if not text:
+            raise EOFError("end of stream")
+        return text.rstrip('\n')
+    if callable(transport):
+        return transport()
+    raise TypeError(f"unsupported transport {transport!r}")
+
+def write_text(transport, text):
+    '''
+    Write the text of input.txt or output.txt to a transport, see read_text.
+
+    Streams get the text followed by a newline and are flushed; buffers get the
+    text followed by a NUL byte when it fits.
+
+    :param transport: where to write to.
+    :param text: text without trailing newline.
+    :return: None.
+    '''
+    if isinstance(transport, (str, os.PathLike)):
+        with open(transport, 'w') as f:
+            f.write(text)
+        return
+    buf = _buffer(transport)
+    if buf is not None:
+        data = text.encode()
+        if len(data) > len(buf):
+            raise ValueError(f"{len(data)} bytes do not fit in a buffer of {len(buf)}")
+        buf[:len(data)] = data
+        if len(data) < len(buf):
+            buf[len(data)] = 0
+        return
+    if hasattr(transport, 'write'):
+        transport.write(text + "\n")
+        transport.flush()
+        return
+    if callable(transport):
+        transport(text)
+        return
+    raise TypeError(f"unsupported transport {transport!r}")
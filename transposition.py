@@ -0,0 +1,70 @@
+EXACT = 0 # Score is the exact minimax value
+LOWER = 1 # Score is a lower bound (the search failed high)
+UPPER = 2 # Score is an upper bound (the search failed low)
+
+ENTRY_BYTES = 160 # Rough size of one stored entry in CPython, used for the memory cap
+
+class TranspositionTable:
+    def __init__(self, max_mb=16):
+        """
+        Fixed-size transposition table for alpha-beta search.
+
+        Entries live in a preallocated list of slots indexed by key modulo the number of
+        slots, so memory never grows past the cap. A slot is overwritten when it is
+        empty, holds the same position, comes from an older search, or the new entry
+        was searched at least as deep (depth-preferred replacement).
+
+        :param max_mb: memory cap in megabytes, 0 disables the table.
+        """
+        self.size = int(max_mb * 1024 * 1024) // ENTRY_BYTES
+        self.slots = [None] * self.size
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self):
+        '''
+        Age the entries of previous searches so that they are replaced first.
+
+        :return: None.
+        '''
+        self.generation += 1
+
+    def probe(self, key):
+        '''
+        Look up a position.
+
+        :param key: 64-bit position hash.
+        :return: (depth, flag, score, move) or None.
+        '''
+        if not self.size:
+            return None
+        self.probes += 1
+        entry = self.slots[key % self.size]
+        if entry is None or entry[0] != key:
+            return None
+        self.hits += 1
+        return entry[2:]
+
+    def store(self, key, depth, flag, score, move):
+        '''
+        Store the result of searching a position.
+
+        :param key: 64-bit position hash.
+        :param depth: remaining depth the position was searched to.
+        :param flag: EXACT, LOWER or UPPER.
+        :param score: score found by the search.
+        :param move: best move found, or None.
+        :return: None.
+        '''
+        if not self.size:
+            return
+        index = key % self.size
+        entry = self.slots[index]
+        if entry is None or entry[0] == key or entry[1] != self.generation or depth >= entry[2]:
+            self.slots[index] = (key, self.generation, depth, flag, score, move)
+            self.stores += 1
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
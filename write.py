@@ -5,21 +5,27 @@
 # Description:
 # TodoList:
 
-def writeOutput(result, path="output.txt"):
+from transport import write_text, default_input, default_output
+
+def writeOutput(result, path=None):
+    '''
+    :param path: transport to write to (transport.write_text), default output.txt.
+    '''
     res = ""
     if result == "PASS":
     	res = "PASS"
     else:
 	    res += str(result[0]) + ',' + str(result[1])
 
-    with open(path, 'w') as f:
-        f.write(res)
+    write_text(path if path is not None else default_output(), res)
 
-def writePass(path="output.txt"):
-	with open(path, 'w') as f:
-		f.write("PASS")
+def writePass(path=None):
+	write_text(path if path is not None else default_output(), "PASS")
 
-def writeNextInput(piece_type, previous_board, board, path="input.txt"):
+def writeNextInput(piece_type, previous_board, board, path=None):
+	'''
+	:param path: transport to write to (transport.write_text), default input.txt.
+	'''
 	res = ""
 	res += str(piece_type) + "\n"
 	for item in previous_board:
@@ -30,5 +36,4 @@ def writeNextInput(piece_type, previous_board, board, path="input.txt"):
 		res += "".join([str(x) for x in item])
 		res += "\n"
 
-	with open(path, 'w') as f:
-		f.write(res[:-1]);
\ No newline at end of file
+	write_text(path if path is not None else default_input(), res[:-1])